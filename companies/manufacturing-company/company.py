@@ -0,0 +1,355 @@
+"""
+Manufacturing Company profile
+FMCG manufacturer (Delhi) - data used by tally_testdata.engine and tally_testdata.manufacturing
+"""
+
+from datetime import datetime
+
+# Company Details
+COMPANY_NAME = "Test Manufacturing Company"
+GSTIN = "07AAACM5678D1Z3"
+STATE = "Delhi"
+
+# Date Range
+START_DATE = datetime(2023, 4, 1)
+END_DATE = datetime(2025, 12, 31)
+
+# Distributors (Sundry Debtors), with address and opening balance for masters.xml
+DISTRIBUTORS = [
+    {"name": "Capital Foods Distributors", "state": "Delhi", "gstin": "07AAACC2345L1Z6",
+     "address": ("B-14, Naraina Industrial Area", "Phase II"), "city": "New Delhi", "pincode": "110028",
+     "opening": 185000},
+    {"name": "Shree Balaji Agencies", "state": "Delhi", "gstin": "07AAACS6789M1Z2",
+     "address": ("2245, Naya Bazar",), "city": "Delhi", "pincode": "110006",
+     "opening": 92000},
+    {"name": "Gupta Trading Company", "state": "Uttar Pradesh", "gstin": "09AAACG1234N1Z8",
+     "address": ("45, Transport Nagar",), "city": "Lucknow", "pincode": "226012",
+     "opening": 134000},
+    {"name": "Haryana FMCG Distributors", "state": "Haryana", "gstin": "06AAACH5678P1Z4",
+     "address": ("Plot 22, Sector 37",), "city": "Gurgaon", "pincode": "122001",
+     "opening": 76000},
+    {"name": "Punjab Consumer Products", "state": "Punjab", "gstin": "03AAACP9012Q1Z7",
+     "address": ("Focal Point, Phase 5",), "city": "Ludhiana", "pincode": "141010",
+     "opening": 58000},
+    {"name": "Rajasthan Retail Network", "state": "Rajasthan", "gstin": "08AAACR3456R1Z1",
+     "address": ("12, Sansar Chandra Road",), "city": "Jaipur", "pincode": "302001",
+     "opening": 112000},
+    {"name": "Doon Valley Traders", "state": "Uttarakhand", "gstin": "05AAACD7890S1Z5",
+     "address": ("88, Paltan Bazaar",), "city": "Dehradun", "pincode": "248001",
+     "opening": 0},
+    {"name": "Metro Cash & Carry Outlets", "state": "Delhi", "gstin": "07AAACM2468T1Z9",
+     "address": ("Rohtak Road", "Industrial Area"), "city": "New Delhi", "pincode": "110041",
+     "opening": 245000},
+]
+
+# Raw material and packing material suppliers (Sundry Creditors)
+SUPPLIERS = [
+    {"name": "Punjab Roller Flour Mills", "state": "Punjab", "gstin": "03AAACP1357U1Z3",
+     "address": ("GT Road",), "city": "Khanna", "pincode": "141401",
+     "opening": -165000},
+    {"name": "Triveni Sugar Mills", "state": "Uttar Pradesh", "gstin": "09AAACT2468V1Z6",
+     "address": ("Sugar Mill Road",), "city": "Muzaffarnagar", "pincode": "251001",
+     "opening": -98000},
+    {"name": "Rajasthan Edible Oils Ltd", "state": "Rajasthan", "gstin": "08AAACR1122W1Z4",
+     "address": ("RIICO Industrial Area",), "city": "Alwar", "pincode": "301001",
+     "opening": -143000},
+    {"name": "Delhi Packaging Industries", "state": "Delhi", "gstin": "07AAACD3344X1Z8",
+     "address": ("C-56, Okhla Industrial Area", "Phase I"), "city": "New Delhi", "pincode": "110020",
+     "opening": -67000},
+    {"name": "Haryana Dairy Products", "state": "Haryana", "gstin": "06AAACH5566Y1Z2",
+     "address": ("HSIIDC Industrial Estate",), "city": "Sonipat", "pincode": "131001",
+     "opening": -54000},
+    {"name": "Khari Baoli Spice Traders", "state": "Delhi", "gstin": "07AAACK7788Z1Z6",
+     "address": ("6411, Khari Baoli",), "city": "Delhi", "pincode": "110006",
+     "opening": -38000},
+    {"name": "Ratnagiri Fruit Processors", "state": "Maharashtra", "gstin": "27AAACR9900A1Z1",
+     "address": ("MIDC Mirjole",), "city": "Ratnagiri", "pincode": "415639",
+     "opening": -72000},
+    {"name": "Noida Chemicals & Additives", "state": "Uttar Pradesh", "gstin": "09AAACN2244B1Z5",
+     "address": ("Sector 63",), "city": "Noida", "pincode": "201301",
+     "opening": -21000},
+    {"name": "Agra Potato Products", "state": "Uttar Pradesh", "gstin": "09AAACA6688C1Z9",
+     "address": ("Sikandra Industrial Area",), "city": "Agra", "pincode": "282007",
+     "opening": -46000},
+    {"name": "Bawana Plastics Pvt Ltd", "state": "Delhi", "gstin": "07AAACB1357D1Z3",
+     "address": ("Sector 3, DSIIDC Bawana",), "city": "Delhi", "pincode": "110039",
+     "opening": -29000},
+]
+
+# Raw and packing materials, bought into the Raw Material Store
+RAW_MATERIALS = [
+    {"name": "Maida (Refined Wheat Flour)", "hsn": "1101", "rate": 32, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Whole Wheat Atta", "hsn": "1101", "rate": 30, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Sugar", "hsn": "1701", "rate": 42, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Palm Oil", "hsn": "1511", "rate": 110, "gst_rate": 5, "unit": "Ltr"},
+    {"name": "Refined Sunflower Oil", "hsn": "1512", "rate": 140, "gst_rate": 5, "unit": "Ltr"},
+    {"name": "Vanaspati", "hsn": "1516", "rate": 130, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Skimmed Milk Powder", "hsn": "0402", "rate": 320, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Cocoa Powder", "hsn": "1805", "rate": 450, "gst_rate": 18, "unit": "Kg"},
+    {"name": "Iodised Salt", "hsn": "2501", "rate": 12, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Baking Soda", "hsn": "2836", "rate": 60, "gst_rate": 18, "unit": "Kg"},
+    {"name": "Invert Sugar Syrup", "hsn": "1702", "rate": 55, "gst_rate": 18, "unit": "Kg"},
+    {"name": "Besan (Gram Flour)", "hsn": "1106", "rate": 85, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Rice Flour", "hsn": "1102", "rate": 40, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Potato Flakes", "hsn": "1105", "rate": 120, "gst_rate": 12, "unit": "Kg"},
+    {"name": "Peanuts", "hsn": "1202", "rate": 130, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Moong Dal", "hsn": "0713", "rate": 110, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Dry Red Chilli", "hsn": "0904", "rate": 260, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Turmeric Fingers", "hsn": "0910", "rate": 180, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Coriander Seeds", "hsn": "0909", "rate": 150, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Cumin Seeds", "hsn": "0909", "rate": 420, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Black Pepper", "hsn": "0904", "rate": 650, "gst_rate": 5, "unit": "Kg"},
+    {"name": "Mango Pulp", "hsn": "2008", "rate": 95, "gst_rate": 12, "unit": "Kg"},
+    {"name": "Orange Juice Concentrate", "hsn": "2009", "rate": 210, "gst_rate": 12, "unit": "Kg"},
+    {"name": "Citric Acid", "hsn": "2918", "rate": 140, "gst_rate": 18, "unit": "Kg"},
+    {"name": "Sodium Benzoate", "hsn": "2916", "rate": 260, "gst_rate": 18, "unit": "Kg"},
+    {"name": "Noodle Seasoning Mix", "hsn": "2103", "rate": 380, "gst_rate": 12, "unit": "Kg"},
+    {"name": "Laminated Wrapper Film", "hsn": "3920", "rate": 240, "gst_rate": 18, "unit": "Kg"},
+    {"name": "PET Bottle 200ml", "hsn": "3923", "rate": 4, "gst_rate": 18, "unit": "Nos"},
+    {"name": "Bottle Cap 28mm", "hsn": "3923", "rate": 1, "gst_rate": 18, "unit": "Nos"},
+    {"name": "Tetra Pack 200ml", "hsn": "4811", "rate": 6, "gst_rate": 18, "unit": "Nos"},
+    {"name": "Printed Pouch", "hsn": "3923", "rate": 2, "gst_rate": 18, "unit": "Nos"},
+    {"name": "Corrugated Carton", "hsn": "4819", "rate": 18, "gst_rate": 12, "unit": "Nos"},
+]
+
+# Finished goods, sold by the carton from the Finished Goods godown. Each is
+# made in batches of "batch" cartons; "bom" is the raw material one batch uses
+FINISHED_GOODS = [
+    {"name": "Glucose Biscuits 100g", "hsn": "1905", "rate": 510, "gst_rate": 18, "unit": "Carton",
+     "batch": 50, "bom": {"Maida (Refined Wheat Flour)": 200, "Sugar": 60, "Palm Oil": 40,
+                          "Invert Sugar Syrup": 15, "Skimmed Milk Powder": 5, "Baking Soda": 2,
+                          "Iodised Salt": 2, "Laminated Wrapper Film": 12, "Corrugated Carton": 50}},
+    {"name": "Butter Cookies 200g", "hsn": "1905", "rate": 470, "gst_rate": 18, "unit": "Carton",
+     "batch": 50, "bom": {"Maida (Refined Wheat Flour)": 130, "Sugar": 50, "Vanaspati": 45,
+                          "Skimmed Milk Powder": 10, "Baking Soda": 1, "Iodised Salt": 1,
+                          "Laminated Wrapper Film": 8, "Corrugated Carton": 50}},
+    {"name": "Chocolate Cream Biscuits 150g", "hsn": "1905", "rate": 540, "gst_rate": 18, "unit": "Carton",
+     "batch": 50, "bom": {"Maida (Refined Wheat Flour)": 150, "Sugar": 70, "Palm Oil": 35, "Cocoa Powder": 12,
+                          "Invert Sugar Syrup": 10, "Baking Soda": 2, "Laminated Wrapper Film": 10,
+                          "Corrugated Carton": 50}},
+    {"name": "Marie Biscuits 250g", "hsn": "1905", "rate": 460, "gst_rate": 18, "unit": "Carton",
+     "batch": 50, "bom": {"Maida (Refined Wheat Flour)": 210, "Sugar": 45, "Palm Oil": 30,
+                          "Invert Sugar Syrup": 10, "Skimmed Milk Powder": 4, "Baking Soda": 2,
+                          "Iodised Salt": 2, "Laminated Wrapper Film": 12, "Corrugated Carton": 50}},
+    {"name": "Milk Rusk 300g", "hsn": "1905", "rate": 500, "gst_rate": 18, "unit": "Carton",
+     "batch": 25, "bom": {"Maida (Refined Wheat Flour)": 90, "Sugar": 25, "Vanaspati": 15,
+                          "Skimmed Milk Powder": 6, "Iodised Salt": 1, "Laminated Wrapper Film": 6,
+                          "Corrugated Carton": 25}},
+    {"name": "Aloo Bhujia 400g", "hsn": "2106", "rate": 1180, "gst_rate": 12, "unit": "Carton",
+     "batch": 25, "bom": {"Besan (Gram Flour)": 90, "Potato Flakes": 50, "Palm Oil": 60, "Iodised Salt": 4,
+                          "Dry Red Chilli": 3, "Turmeric Fingers": 1, "Printed Pouch": 500,
+                          "Corrugated Carton": 25}},
+    {"name": "Masala Peanuts 200g", "hsn": "2106", "rate": 1460, "gst_rate": 12, "unit": "Carton",
+     "batch": 25, "bom": {"Peanuts": 150, "Besan (Gram Flour)": 30, "Palm Oil": 25, "Iodised Salt": 3,
+                          "Dry Red Chilli": 3, "Printed Pouch": 1000, "Corrugated Carton": 25}},
+    {"name": "Khatta Meetha 200g", "hsn": "2106", "rate": 1030, "gst_rate": 12, "unit": "Carton",
+     "batch": 25, "bom": {"Besan (Gram Flour)": 80, "Rice Flour": 30, "Peanuts": 30, "Sugar": 20,
+                          "Palm Oil": 40, "Iodised Salt": 3, "Citric Acid": 1, "Printed Pouch": 1000,
+                          "Corrugated Carton": 25}},
+    {"name": "Potato Chips Classic 50g", "hsn": "2005", "rate": 920, "gst_rate": 12, "unit": "Carton",
+     "batch": 50, "bom": {"Potato Flakes": 140, "Refined Sunflower Oil": 70, "Iodised Salt": 4,
+                          "Printed Pouch": 4000, "Corrugated Carton": 50}},
+    {"name": "Moong Dal Namkeen 200g", "hsn": "2106", "rate": 1360, "gst_rate": 12, "unit": "Carton",
+     "batch": 25, "bom": {"Moong Dal": 150, "Refined Sunflower Oil": 50, "Iodised Salt": 3,
+                          "Turmeric Fingers": 1, "Printed Pouch": 1000, "Corrugated Carton": 25}},
+    {"name": "Masala Noodles 70g", "hsn": "1902", "rate": 750, "gst_rate": 12, "unit": "Carton",
+     "batch": 50, "bom": {"Maida (Refined Wheat Flour)": 260, "Palm Oil": 60, "Iodised Salt": 5,
+                          "Noodle Seasoning Mix": 25, "Laminated Wrapper Film": 14, "Corrugated Carton": 50}},
+    {"name": "Atta Noodles 75g", "hsn": "1902", "rate": 740, "gst_rate": 12, "unit": "Carton",
+     "batch": 50, "bom": {"Whole Wheat Atta": 270, "Palm Oil": 60, "Iodised Salt": 5,
+                          "Noodle Seasoning Mix": 25, "Laminated Wrapper Film": 14, "Corrugated Carton": 50}},
+    {"name": "Mango Drink 200ml PET", "hsn": "2202", "rate": 410, "gst_rate": 12, "unit": "Carton",
+     "batch": 100, "bom": {"Mango Pulp": 120, "Sugar": 60, "Citric Acid": 2, "Sodium Benzoate": 1,
+                           "PET Bottle 200ml": 3000, "Bottle Cap 28mm": 3000, "Corrugated Carton": 100}},
+    {"name": "Mango Drink 200ml Tetra", "hsn": "2202", "rate": 410, "gst_rate": 12, "unit": "Carton",
+     "batch": 100, "bom": {"Mango Pulp": 110, "Sugar": 55, "Citric Acid": 2, "Sodium Benzoate": 1,
+                           "Tetra Pack 200ml": 2700, "Corrugated Carton": 100}},
+    {"name": "Orange Drink 200ml Tetra", "hsn": "2202", "rate": 440, "gst_rate": 12, "unit": "Carton",
+     "batch": 100, "bom": {"Orange Juice Concentrate": 60, "Sugar": 60, "Citric Acid": 3, "Sodium Benzoate": 1,
+                           "Tetra Pack 200ml": 2700, "Corrugated Carton": 100}},
+    {"name": "Garam Masala 100g", "hsn": "0910", "rate": 2160, "gst_rate": 5, "unit": "Carton",
+     "batch": 20, "bom": {"Coriander Seeds": 35, "Cumin Seeds": 25, "Black Pepper": 15, "Dry Red Chilli": 10,
+                          "Turmeric Fingers": 15, "Printed Pouch": 1000, "Corrugated Carton": 20}},
+    {"name": "Red Chilli Powder 200g", "hsn": "0904", "rate": 2830, "gst_rate": 5, "unit": "Carton",
+     "batch": 20, "bom": {"Dry Red Chilli": 160, "Printed Pouch": 800, "Corrugated Carton": 20}},
+    {"name": "Turmeric Powder 200g", "hsn": "0910", "rate": 2000, "gst_rate": 5, "unit": "Carton",
+     "batch": 20, "bom": {"Turmeric Fingers": 160, "Printed Pouch": 800, "Corrugated Carton": 20}},
+    {"name": "Coriander Powder 200g", "hsn": "0909", "rate": 1690, "gst_rate": 5, "unit": "Carton",
+     "batch": 20, "bom": {"Coriander Seeds": 160, "Printed Pouch": 800, "Corrugated Carton": 20}},
+    {"name": "Chaat Masala 100g", "hsn": "0910", "rate": 1600, "gst_rate": 5, "unit": "Carton",
+     "batch": 20, "bom": {"Iodised Salt": 30, "Cumin Seeds": 20, "Coriander Seeds": 20, "Dry Red Chilli": 10,
+                          "Black Pepper": 10, "Citric Acid": 10, "Printed Pouch": 1000,
+                          "Corrugated Carton": 20}},
+]
+
+STOCK_ITEMS = RAW_MATERIALS + FINISHED_GOODS
+
+GODOWNS = ["Raw Material Store", "Production Floor", "Finished Goods"]
+
+# Banks
+BANKS = ["State Bank of India", "Punjab National Bank", "Kotak Mahindra Bank"]
+
+# Ledgers other than parties, for masters.xml (opening balances: debit positive, credit negative)
+LEDGERS = {
+    "Cash & Bank": [
+        {"name": "Cash", "parent": "Cash-in-hand", "opening": 150000},
+        {"name": "State Bank of India", "parent": "Bank Accounts", "opening": 1250000,
+         "bank": {"branch": "Okhla Industrial Area Branch", "account": "38761234509", "ifsc_type": "NEFT",
+                  "ifsc": "SBIN0004567"}},
+        {"name": "Punjab National Bank", "parent": "Bank Accounts", "opening": 680000,
+         "bank": {"branch": "Naraina Branch", "account": "0412002100056789", "ifsc": "PUNB0041200"}},
+        {"name": "Kotak Mahindra Bank", "parent": "Bank Accounts", "opening": 420000,
+         "bank": {"branch": "Connaught Place Branch", "account": "7411234567", "ifsc": "KKBK0000172"}},
+    ],
+    "Sales Ledgers": [
+        {"name": "Sales - Local", "parent": "Sales Accounts", "revenue": True},
+        {"name": "Sales - Interstate", "parent": "Sales Accounts", "revenue": True},
+    ],
+    "Purchase Ledgers": [
+        {"name": "Purchase - Raw Materials Local", "parent": "Purchase Accounts"},
+        {"name": "Purchase - Raw Materials Interstate", "parent": "Purchase Accounts"},
+    ],
+    "GST Ledgers": [
+        {"name": "CGST Output", "parent": "Duties & Taxes", "tax_type": "CGST", "tax_rate": 9},
+        {"name": "SGST Output", "parent": "Duties & Taxes", "tax_type": "SGST", "tax_rate": 9},
+        {"name": "IGST Output", "parent": "Duties & Taxes", "tax_type": "IGST", "tax_rate": 18},
+        {"name": "CGST Input", "parent": "Duties & Taxes", "tax_type": "CGST", "tax_rate": 9},
+        {"name": "SGST Input", "parent": "Duties & Taxes", "tax_type": "SGST", "tax_rate": 9},
+        {"name": "IGST Input", "parent": "Duties & Taxes", "tax_type": "IGST", "tax_rate": 18},
+    ],
+    "Manufacturing Expenses": [
+        {"name": "Factory Wages", "parent": "Direct Expenses"},
+        {"name": "Power & Fuel", "parent": "Direct Expenses"},
+        {"name": "Factory Rent", "parent": "Direct Expenses"},
+        {"name": "Freight Inward", "parent": "Direct Expenses"},
+        {"name": "Repairs & Maintenance - Plant", "parent": "Direct Expenses"},
+        {"name": "Consumables & Stores", "parent": "Direct Expenses"},
+        {"name": "Quality Testing Charges", "parent": "Direct Expenses"},
+        {"name": "Water Charges", "parent": "Direct Expenses"},
+    ],
+    "Expense Ledgers": [
+        {"name": "Salary Expense", "parent": "Indirect Expenses"},
+        {"name": "Office Rent", "parent": "Indirect Expenses"},
+        {"name": "Electricity - Office", "parent": "Indirect Expenses"},
+        {"name": "Telephone & Internet", "parent": "Indirect Expenses"},
+        {"name": "Printing & Stationery", "parent": "Indirect Expenses"},
+        {"name": "Advertisement & Promotion", "parent": "Indirect Expenses"},
+        {"name": "Freight Outward", "parent": "Indirect Expenses"},
+        {"name": "Distributor Incentives", "parent": "Indirect Expenses"},
+        {"name": "Insurance", "parent": "Indirect Expenses"},
+        {"name": "Professional Fees", "parent": "Indirect Expenses"},
+        {"name": "Bank Charges", "parent": "Indirect Expenses"},
+        {"name": "Depreciation", "parent": "Indirect Expenses"},
+    ],
+    "Income Ledgers": [
+        {"name": "Interest Income", "parent": "Indirect Incomes"},
+        {"name": "Discount Received", "parent": "Indirect Incomes"},
+        {"name": "Scrap Sales", "parent": "Indirect Incomes"},
+    ],
+    "Fixed Assets": [
+        {"name": "Plant & Machinery", "parent": "Fixed Assets", "opening": 4500000},
+        {"name": "Factory Building", "parent": "Fixed Assets", "opening": 3200000},
+        {"name": "Furniture & Fixtures", "parent": "Fixed Assets", "opening": 350000},
+        {"name": "Vehicles", "parent": "Fixed Assets", "opening": 900000},
+        {"name": "Computers", "parent": "Fixed Assets", "opening": 180000},
+    ],
+    "Capital & Others": [
+        {"name": "Capital Account", "parent": "Capital Account", "opening": -9299000},
+        {"name": "Term Loan - SBI", "parent": "Secured Loans", "opening": -2500000},
+        {"name": "Drawings", "parent": "Capital Account"},
+        {"name": "Round Off", "parent": "Indirect Expenses"},
+        {"name": "Opening Balance Adjustment", "parent": "Suspense Account"},
+    ],
+}
+
+# Daily volume: 4-8 vouchers per day, picked by these weights; a third of
+# them are production: Stock Journals move materials between godowns and
+# Manufacturing Journals turn them into finished goods
+VOUCHERS_PER_DAY = (4, 8)
+VOUCHER_WEIGHTS = {
+    "Sales": 25,
+    "Purchase": 15,
+    "Payment": 12,
+    "Receipt": 10,
+    "Contra": 5,
+    "Journal": 3,
+    "Stock Journal": 14,
+    "Manufacturing Journal": 16,
+}
+
+# Voucher types masters.xml creates: {name: parent voucher type}
+VOUCHER_TYPES = {"Manufacturing Journal": "Stock Journal"}
+
+# Sales: 1-4 finished goods per invoice, 5-30 cartons each, from the
+# Finished Goods godown; distributors get 21 days' credit
+SALES = {
+    "parties": DISTRIBUTORS,
+    "items": FINISHED_GOODS,
+    "lines": (1, 4),
+    "quantity": (5, 30),
+    "unit": "Ctn",
+    "inventory": True,
+    "godown": "Finished Goods",
+    # Cartons each product starts the month with; production makes the
+    # products that fall below the reorder level
+    "stock_levels": {"opening": 150, "reorder_level": 60, "reorder_quantity": 100},
+    "credit_days": 21,
+    "ledgers": {"local": "Sales - Local", "interstate": "Sales - Interstate"},
+    "narration": "Sale to {party}",
+}
+
+# Purchases: 2-5 raw materials per bill into the Raw Material Store;
+# suppliers give 30 days
+PURCHASES = {
+    "parties": SUPPLIERS,
+    "items": RAW_MATERIALS,
+    "lines": (2, 5),
+    "quantity": (20, 200),
+    "inventory": True,
+    "godown": "Raw Material Store",
+    "credit_days": 30,
+    "ledgers": {"local": "Purchase - Raw Materials Local",
+                "interstate": "Purchase - Raw Materials Interstate"},
+    "narration": "Purchase from {party}",
+}
+
+# Production: finished goods are made on the Production Floor, 1-3 batches
+# at a time. Raw materials are stocked in batches' worth: each starts the
+# month with enough for 6 batches of every product that uses it
+PRODUCTION = {
+    "items": FINISHED_GOODS,
+    "godown": "Production Floor",
+    "batches": (1, 3),
+    "raw_stock": {"opening": 6, "reorder_level": 2, "reorder_quantity": 4},
+}
+
+# Payments: (expense ledger, amount range, narration)
+PAYMENTS = [
+    ("Factory Wages", (150000, 400000), "Factory wages paid"),
+    ("Power & Fuel", (60000, 180000), "Electricity and diesel for plant"),
+    ("Factory Rent", (120000, 150000), "Monthly factory rent"),
+    ("Freight Inward", (10000, 60000), "Freight on raw materials"),
+    ("Repairs & Maintenance - Plant", (5000, 75000), "Machine maintenance"),
+    ("Salary Expense", (100000, 250000), "Office staff salary"),
+    ("Advertisement & Promotion", (25000, 150000), "Trade promotion and hoardings"),
+    ("Freight Outward", (15000, 80000), "Delivery to distributors"),
+    ("Telephone & Internet", (5000, 15000), "Internet and phone charges"),
+    ("Professional Fees", (15000, 50000), "CA and legal fees"),
+]
+
+# Receipts: (income ledger, amount range, narration)
+RECEIPTS = [
+    ("Interest Income", (5000, 40000), "Interest received from bank"),
+    ("Scrap Sales", (5000, 30000), "Sale of packing scrap"),
+    ("Discount Received", (2000, 20000), "Discount from supplier"),
+]
+
+# Contra: cash deposits and withdrawals
+CONTRA_AMOUNT = (20000, 100000)
+
+# Journals: (debit ledger, credit ledger, amount range, narration)
+JOURNALS = [
+    ("Depreciation", "Plant & Machinery", (30000, 60000), "Depreciation on plant & machinery"),
+    ("Depreciation", "Vehicles", (8000, 15000), "Depreciation on vehicles"),
+    ("Distributor Incentives", "Freight Outward", (5000, 25000), "Freight reclassified as incentive"),
+]
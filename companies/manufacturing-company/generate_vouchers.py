@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Tally Prime Voucher Generator
+Generates 3 years of realistic voucher data for Manufacturing Company
+
+The company data lives in company.py next to this script; the generation
+engine is shared by all companies (tally_testdata/engine.py).
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", ".."))
+
+from tally_testdata.cli import main
+
+if __name__ == "__main__":
+    main(HERE)
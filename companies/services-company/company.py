@@ -0,0 +1,195 @@
+"""
+Services Company profile
+IT consulting firm (Bangalore) - data used by tally_testdata.engine
+"""
+
+from datetime import datetime
+
+# Company Details
+COMPANY_NAME = "Test Services Company"
+GSTIN = "29AAACS9012E1Z1"
+STATE = "Karnataka"
+
+# Date Range
+START_DATE = datetime(2023, 4, 1)
+END_DATE = datetime(2025, 12, 31)
+
+# Clients (Sundry Debtors), with address and opening balance for masters.xml
+CLIENTS = [
+    {"name": "TechCorp Solutions Pvt Ltd", "state": "Karnataka", "gstin": "29AAACT1234P1Z5",
+     "address": ("Embassy Tech Village", "Outer Ring Road"), "city": "Bangalore", "pincode": "560103",
+     "opening": 125000},
+    {"name": "GlobalInfotech Inc", "state": "Haryana", "gstin": "06AAACG5678Q1Z3",
+     "address": ("DLF Cyber City",), "city": "Gurgaon", "pincode": "122002",
+     "opening": 230000},
+    {"name": "DataSoft Systems", "state": "Telangana", "gstin": "36AAACD9012R1Z1",
+     "address": ("HITEC City",), "city": "Hyderabad", "pincode": "500081",
+     "opening": 89000},
+    {"name": "CloudNine Technologies", "state": "Maharashtra", "gstin": "27AAACC3456S1Z8",
+     "address": ("Bandra Kurla Complex",), "city": "Mumbai", "pincode": "400051",
+     "opening": 167000},
+    {"name": "StartupHub Innovations", "state": "Delhi", "gstin": "07AAACS7890T1Z2",
+     "address": ("Connaught Place",), "city": "New Delhi", "pincode": "110001",
+     "opening": 45000},
+]
+
+# Vendors (Sundry Creditors), each billing one kind of expense
+VENDORS = [
+    {"name": "AWS India Pvt Ltd", "state": "Karnataka", "gstin": "29AAACA1234U1Z6",
+     "address": ("Salarpuria Softzone",), "city": "Bangalore", "pincode": "560103",
+     "opening": -95000,
+     "expense": "Cloud Infrastructure Charges", "amount": (30000, 150000), "gst_rate": 18,
+     "narration": "AWS cloud services - monthly bill"},
+    {"name": "Microsoft India", "state": "Telangana", "gstin": "36AAACM5678V1Z4",
+     "address": ("Microsoft Campus", "Hyderabad"), "city": "Hyderabad", "pincode": "500081",
+     "opening": -145000,
+     "expense": "Software License Fees", "amount": (50000, 200000), "gst_rate": 18,
+     "narration": "Microsoft licenses (Office 365, Azure)"},
+    {"name": "Google Cloud India", "state": "Haryana", "gstin": "06AAACG9012W1Z9",
+     "address": ("DLF Building 10",), "city": "Gurgaon", "pincode": "122002",
+     "opening": -78000,
+     "expense": "Cloud Infrastructure Charges", "amount": (25000, 100000), "gst_rate": 18,
+     "narration": "Google Cloud Platform services"},
+    {"name": "Office Supplies Co", "state": "Karnataka", "gstin": "29AAACO3456X1Z7",
+     "address": ("Commercial Street",), "city": "Bangalore", "pincode": "560001",
+     "opening": -12000,
+     "expense": "Office Expenses", "amount": (5000, 20000), "gst_rate": 18,
+     "narration": "Office supplies purchase"},
+]
+
+# Service Types with rates and the income ledger they are booked to
+SERVICES = [
+    {"name": "IT Consulting", "sac": "998311", "rate": 5000, "gst_rate": 18,
+     "ledger": "IT Consulting Income"},
+    {"name": "Software Development", "sac": "998313", "rate": 8000, "gst_rate": 18,
+     "ledger": "Software Development Income"},
+    {"name": "Cloud Migration Services", "sac": "998314", "rate": 6000, "gst_rate": 18,
+     "ledger": "Cloud Services Income"},
+    {"name": "Data Analytics", "sac": "998312", "rate": 7000, "gst_rate": 18,
+     "ledger": "Software Development Income"},
+    {"name": "Mobile App Development", "sac": "998313", "rate": 9000, "gst_rate": 18,
+     "ledger": "Software Development Income"},
+    {"name": "Web Development", "sac": "998313", "rate": 4000, "gst_rate": 18,
+     "ledger": "Software Development Income"},
+    {"name": "DevOps Consulting", "sac": "998311", "rate": 6500, "gst_rate": 18,
+     "ledger": "IT Consulting Income"},
+    {"name": "Cybersecurity Audit", "sac": "998311", "rate": 10000, "gst_rate": 18,
+     "ledger": "Software Development Income"},
+    {"name": "AI/ML Implementation", "sac": "998312", "rate": 12000, "gst_rate": 18,
+     "ledger": "Software Development Income"},
+    {"name": "Technical Support", "sac": "998315", "rate": 3000, "gst_rate": 18,
+     "ledger": "Maintenance & Support Income"},
+]
+
+# Banks
+BANKS = ["HDFC Bank", "ICICI Bank"]
+
+# Ledgers other than parties, for masters.xml (opening balances: debit positive, credit negative)
+LEDGERS = {
+    "Cash & Bank": [
+        {"name": "Cash", "parent": "Cash-in-hand", "opening": 50000},
+        {"name": "HDFC Bank", "parent": "Bank Accounts", "opening": 800000,
+         "bank": {"branch": "Koramangala Branch", "account": "50200098765432", "ifsc": "HDFC0001234"}},
+        {"name": "ICICI Bank", "parent": "Bank Accounts", "opening": 450000,
+         "bank": {"branch": "Indiranagar Branch", "account": "023405009876", "ifsc": "ICIC0000234"}},
+    ],
+    "Service Income Ledgers": [
+        {"name": "IT Consulting Income", "parent": "Sales Accounts", "revenue": True},
+        {"name": "Software Development Income", "parent": "Sales Accounts", "revenue": True},
+        {"name": "Maintenance & Support Income", "parent": "Sales Accounts", "revenue": True},
+        {"name": "Cloud Services Income", "parent": "Sales Accounts", "revenue": True},
+    ],
+    "Expense Ledgers": [
+        {"name": "Salary - Technical Staff", "parent": "Indirect Expenses"},
+        {"name": "Salary - Admin Staff", "parent": "Indirect Expenses"},
+        {"name": "Professional Fees", "parent": "Indirect Expenses"},
+        {"name": "Cloud Infrastructure Charges", "parent": "Indirect Expenses"},
+        {"name": "Software License Fees", "parent": "Indirect Expenses"},
+        {"name": "Office Rent", "parent": "Indirect Expenses"},
+        {"name": "Electricity & Water", "parent": "Indirect Expenses"},
+        {"name": "Internet & Telecom", "parent": "Indirect Expenses"},
+        {"name": "Travel Expenses", "parent": "Indirect Expenses"},
+        {"name": "Client Entertainment", "parent": "Indirect Expenses"},
+        {"name": "Training & Development", "parent": "Indirect Expenses"},
+        {"name": "Marketing & Advertising", "parent": "Indirect Expenses"},
+        {"name": "Office Expenses", "parent": "Indirect Expenses"},
+        {"name": "Bank Charges", "parent": "Indirect Expenses"},
+        {"name": "Depreciation", "parent": "Indirect Expenses"},
+    ],
+    "GST Ledgers": [
+        {"name": "CGST Output", "parent": "Duties & Taxes", "tax_type": "CGST", "tax_rate": 9},
+        {"name": "SGST Output", "parent": "Duties & Taxes", "tax_type": "SGST", "tax_rate": 9},
+        {"name": "IGST Output", "parent": "Duties & Taxes", "tax_type": "IGST", "tax_rate": 18},
+        {"name": "CGST Input", "parent": "Duties & Taxes", "tax_type": "CGST", "tax_rate": 9},
+        {"name": "SGST Input", "parent": "Duties & Taxes", "tax_type": "SGST", "tax_rate": 9},
+        {"name": "IGST Input", "parent": "Duties & Taxes", "tax_type": "IGST", "tax_rate": 18},
+    ],
+    "Fixed Assets": [
+        {"name": "Office Equipment", "parent": "Fixed Assets"},
+    ],
+    "Capital & Others": [
+        {"name": "Capital Account", "parent": "Capital Account", "opening": -1500000},
+        {"name": "Drawings", "parent": "Capital Account"},
+        {"name": "Interest Income", "parent": "Indirect Incomes"},
+        {"name": "Round Off", "parent": "Indirect Expenses"},
+    ],
+}
+
+# Cost Centers, all in one cost category
+COST_CATEGORY = "Projects"
+COST_CENTERS = ["Project Alpha", "Project Beta", "Project Gamma", "Support & Maintenance", "Internal R&D"]
+
+# Services company: 3-5 vouchers per day (less than trading)
+VOUCHERS_PER_DAY = (3, 5)
+VOUCHER_WEIGHTS = {
+    "Sales": 40,
+    "Purchase": 20,
+    "Payment": 20,
+    "Receipt": 8,
+    "Contra": 7,
+    "Journal": 5,
+}
+
+# Service invoices: 1-3 services, billed either by the hour or as a project fee
+SALES = {
+    "parties": CLIENTS,
+    "items": SERVICES,
+    "lines": (1, 3),
+    "quantity": (10, 100),
+    "unit": "hrs",
+    "project_fee": (50000, 300000),
+    "credit_days": 45,
+    "narration": "Service invoice to {party}",
+}
+
+# Purchases: one vendor bill per voucher (see VENDORS), payable in 15 days
+PURCHASES = {
+    "parties": VENDORS,
+    "credit_days": 15,
+}
+
+# Payments: (expense ledger, amount range, narration)
+PAYMENTS = [
+    ("Salary - Technical Staff", (200000, 500000), "Monthly salary payment"),
+    ("Salary - Admin Staff", (80000, 150000), "Admin staff salary"),
+    ("Office Rent", (80000, 120000), "Monthly office rent"),
+    ("Electricity & Water", (15000, 30000), "Utility bills"),
+    ("Internet & Telecom", (10000, 20000), "Internet and phone charges"),
+    ("Professional Fees", (25000, 50000), "CA/Legal fees"),
+    ("Travel Expenses", (15000, 40000), "Client visit expenses"),
+    ("Training & Development", (20000, 60000), "Employee training"),
+]
+
+# Receipts: (income ledger, amount range, narration)
+RECEIPTS = [
+    ("Interest Income", (5000, 50000), "Interest received from bank"),
+]
+
+# Contra: cash deposits and withdrawals
+CONTRA_AMOUNT = (20000, 100000)
+
+# Journals: (debit ledger, credit ledger, amount range, narration)
+JOURNALS = [
+    ("Depreciation", "Office Equipment", (5000, 25000), "Depreciation on assets"),
+    ("Round Off", "Office Expenses", (5000, 25000), "Round off adjustment"),
+]
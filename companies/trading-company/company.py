@@ -0,0 +1,186 @@
+"""
+Trading Company profile
+Wholesale electronics trader (Mumbai) - data used by tally_testdata.engine
+"""
+
+from datetime import datetime
+
+# Company Details
+COMPANY_NAME = "Test Trading Company"
+GSTIN = "27AAACT1234C1Z5"
+STATE = "Maharashtra"
+
+# Date Range
+START_DATE = datetime(2023, 4, 1)
+END_DATE = datetime(2025, 12, 31)
+
+# Customers (Sundry Debtors), with address and opening balance for masters.xml
+CUSTOMERS = [
+    {"name": "Acme Electronics Pvt Ltd", "state": "Maharashtra", "gstin": "27AAACA1234B1Z5",
+     "address": ("Shop No 12, Lamington Road", "Mumbai Central"), "city": "Mumbai", "pincode": "400008",
+     "opening": 0},
+    {"name": "TechWorld Solutions", "state": "Delhi", "gstin": "07AAACT5678C1Z3",
+     "address": ("23, Nehru Place",), "city": "New Delhi", "pincode": "110019",
+     "opening": 45000},
+    {"name": "Digital Systems Inc", "state": "Karnataka", "gstin": "29AAACD9012D1Z1",
+     "address": ("45, Residency Road",), "city": "Bangalore", "pincode": "560025",
+     "opening": 78000},
+    {"name": "Sharma Electronics", "state": "Maharashtra", "gstin": "27AAACS3456E1Z8",
+     "address": ("78, FC Road",), "city": "Pune", "pincode": "411004",
+     "opening": 32000},
+    {"name": "Patel Trading Co", "state": "Gujarat", "gstin": "24AAACP7890F1Z2",
+     "address": ("12, CG Road",), "city": "Ahmedabad", "pincode": "380009",
+     "opening": 56000},
+]
+
+# Suppliers (Sundry Creditors)
+SUPPLIERS = [
+    {"name": "Samsung India Electronics Ltd", "state": "Uttar Pradesh", "gstin": "09AAACS1234G1Z6",
+     "address": ("Plot 1, Sector 126",), "city": "Noida", "pincode": "201303",
+     "opening": 0},
+    {"name": "LG Electronics India", "state": "Haryana", "gstin": "06AAACL5678H1Z4",
+     "address": ("A-1, Industrial Area",), "city": "Gurgaon", "pincode": "122015",
+     "opening": -125000},
+    {"name": "Sony India Pvt Ltd", "state": "Haryana", "gstin": "06AAACS9012I1Z9",
+     "address": ("5th Floor, Tower A", "Cyber City"), "city": "Gurgaon", "pincode": "122002",
+     "opening": -89000},
+    {"name": "Wholesale Electronics Hub", "state": "Maharashtra", "gstin": "27AAACW3456J1Z7",
+     "address": ("45, Lamington Road",), "city": "Mumbai", "pincode": "400007",
+     "opening": -67000},
+    {"name": "Mumbai Tech Distributors", "state": "Maharashtra", "gstin": "27AAACM7890K1Z5",
+     "address": ("78, Grant Road",), "city": "Mumbai", "pincode": "400007",
+     "opening": -43000},
+]
+
+# Stock Items with HSN codes and rates
+STOCK_ITEMS = [
+    {"name": "Samsung 43\" Smart TV", "hsn": "8528", "rate": 25000, "gst_rate": 18},
+    {"name": "LG 50\" 4K TV", "hsn": "8528", "rate": 35000, "gst_rate": 18},
+    {"name": "Sony Headphones WH-1000XM4", "hsn": "8518", "rate": 12000, "gst_rate": 18},
+    {"name": "Samsung Galaxy Tab", "hsn": "8471", "rate": 28000, "gst_rate": 18},
+    {"name": "LG Washing Machine 7kg", "hsn": "8450", "rate": 18000, "gst_rate": 18},
+    {"name": "Sony Bluetooth Speaker", "hsn": "8518", "rate": 5000, "gst_rate": 18},
+    {"name": "HDMI Cable 2m", "hsn": "8544", "rate": 500, "gst_rate": 18},
+    {"name": "USB Cable Type-C", "hsn": "8544", "rate": 300, "gst_rate": 18},
+    {"name": "Power Bank 10000mAh", "hsn": "8507", "rate": 1500, "gst_rate": 18},
+    {"name": "Wireless Mouse", "hsn": "8471", "rate": 800, "gst_rate": 18},
+    {"name": "Keyboard Wireless", "hsn": "8471", "rate": 1200, "gst_rate": 18},
+    {"name": "Webcam HD 1080p", "hsn": "8525", "rate": 2500, "gst_rate": 18},
+    {"name": "External HDD 1TB", "hsn": "8471", "rate": 4000, "gst_rate": 18},
+    {"name": "Pen Drive 64GB", "hsn": "8471", "rate": 600, "gst_rate": 18},
+    {"name": "Mobile Charger Fast", "hsn": "8504", "rate": 1000, "gst_rate": 18},
+]
+
+# Stock every item starts each month with (booked as opening stock in masters.xml);
+# purchases reorder items that fall below the reorder level
+STOCK_LEVELS = {"opening": 50, "reorder_level": 15, "reorder_quantity": 40}
+
+# Banks
+BANKS = ["HDFC Bank", "ICICI Bank"]
+
+# Ledgers other than parties, for masters.xml (opening balances: debit positive, credit negative)
+LEDGERS = {
+    "Cash & Bank": [
+        {"name": "Cash", "parent": "Cash-in-hand", "opening": 100000},
+        {"name": "HDFC Bank", "parent": "Bank Accounts", "opening": 500000,
+         "bank": {"branch": "Mumbai Main Branch", "account": "50200012345678", "ifsc_type": "NEFT",
+                  "ifsc": "HDFC0001234"}},
+        {"name": "ICICI Bank", "parent": "Bank Accounts", "opening": 350000,
+         "bank": {"branch": "Andheri Branch", "account": "023405001234", "ifsc": "ICIC0000234"}},
+    ],
+    "Sales Ledgers": [
+        {"name": "Sales - Local", "parent": "Sales Accounts", "revenue": True},
+        {"name": "Sales - Interstate", "parent": "Sales Accounts", "revenue": True},
+    ],
+    "Purchase Ledgers": [
+        {"name": "Purchase - Local", "parent": "Purchase Accounts"},
+        {"name": "Purchase - Interstate", "parent": "Purchase Accounts"},
+    ],
+    "GST Ledgers": [
+        {"name": "CGST Output", "parent": "Duties & Taxes", "tax_type": "CGST", "tax_rate": 9},
+        {"name": "SGST Output", "parent": "Duties & Taxes", "tax_type": "SGST", "tax_rate": 9},
+        {"name": "IGST Output", "parent": "Duties & Taxes", "tax_type": "IGST", "tax_rate": 18},
+        {"name": "CGST Input", "parent": "Duties & Taxes", "tax_type": "CGST", "tax_rate": 9},
+        {"name": "SGST Input", "parent": "Duties & Taxes", "tax_type": "SGST", "tax_rate": 9},
+        {"name": "IGST Input", "parent": "Duties & Taxes", "tax_type": "IGST", "tax_rate": 18},
+    ],
+    "Expense Ledgers": [
+        {"name": "Electricity Charges", "parent": "Indirect Expenses"},
+        {"name": "Rent Expense", "parent": "Indirect Expenses"},
+        {"name": "Salary Expense", "parent": "Indirect Expenses"},
+        {"name": "Transport Charges", "parent": "Indirect Expenses"},
+        {"name": "Office Expenses", "parent": "Indirect Expenses"},
+        {"name": "Internet & Phone", "parent": "Indirect Expenses"},
+        {"name": "Bank Charges", "parent": "Indirect Expenses"},
+    ],
+    "Income Ledgers": [
+        {"name": "Interest Income", "parent": "Indirect Incomes"},
+        {"name": "Discount Received", "parent": "Indirect Incomes"},
+    ],
+    "Capital & Others": [
+        {"name": "Capital Account", "parent": "Capital Account", "opening": -1000000},
+        {"name": "Drawings", "parent": "Capital Account"},
+        {"name": "Round Off", "parent": "Indirect Expenses"},
+        {"name": "Opening Balance Adjustment", "parent": "Suspense Account"},
+    ],
+}
+
+# Daily volume: 5-8 vouchers per day, picked by these weights
+VOUCHERS_PER_DAY = (5, 8)
+VOUCHER_WEIGHTS = {
+    "Sales": 30,
+    "Purchase": 30,
+    "Payment": 15,
+    "Receipt": 10,
+    "Contra": 10,
+    "Journal": 5,
+}
+
+# Sales: 2-4 stock items per invoice, 1-10 units each, with inventory entries;
+# customers get 30 days' credit
+SALES = {
+    "parties": CUSTOMERS,
+    "items": STOCK_ITEMS,
+    "lines": (2, 4),
+    "quantity": (1, 10),
+    "inventory": True,
+    "credit_days": 30,
+    "ledgers": {"local": "Sales - Local", "interstate": "Sales - Interstate"},
+    "narration": "Sale to {party}",
+}
+
+# Purchases: 2-5 stock items per bill, 2-20 units each; suppliers give 45 days
+PURCHASES = {
+    "parties": SUPPLIERS,
+    "items": STOCK_ITEMS,
+    "lines": (2, 5),
+    "quantity": (2, 20),
+    "inventory": True,
+    "credit_days": 45,
+    "ledgers": {"local": "Purchase - Local", "interstate": "Purchase - Interstate"},
+    "narration": "Purchase from {party}",
+}
+
+# Payments: (expense ledger, amount range, narration)
+PAYMENTS = [
+    ("Rent Expense", (5000, 50000), "Monthly office rent"),
+    ("Salary Expense", (5000, 50000), "Staff salary payment"),
+    ("Electricity Charges", (5000, 50000), "Electricity bill payment"),
+    ("Internet & Phone", (5000, 50000), "Internet and phone charges"),
+    ("Transport Charges", (5000, 50000), "Transport expenses"),
+]
+
+# Receipts: (income ledger, amount range, narration)
+RECEIPTS = [
+    ("Interest Income", (10000, 100000), "Interest received from bank"),
+    ("Discount Received", (10000, 100000), "Discount from supplier"),
+]
+
+# Contra: cash deposits and withdrawals
+CONTRA_AMOUNT = (10000, 50000)
+
+# Journals: (debit ledger, credit ledger, amount range, narration)
+JOURNALS = [
+    ("Office Expenses", "Drawings", (1000, 10000), "Depreciation on assets"),
+    ("Round Off", "Office Expenses", (1000, 10000), "Round off adjustment"),
+]
@@ -0,0 +1 @@
+"""Lets pytest import tally_testdata from the repository root"""
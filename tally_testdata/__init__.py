@@ -0,0 +1,6 @@
+"""
+Tally Prime test data generator
+
+The engine generates vouchers for any company profile; each company
+folder under companies/ holds its profile in company.py.
+"""
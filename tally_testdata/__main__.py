@@ -0,0 +1,10 @@
+"""
+Run the generator for a company folder:
+
+    python -m tally_testdata companies/trading-company [options]
+"""
+
+from tally_testdata.cli import main
+
+if __name__ == "__main__":
+    main()
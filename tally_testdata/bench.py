@@ -0,0 +1,183 @@
+"""
+Benchmark suite for the generation pipeline
+
+Runs each serializer path for each company at several scale factors and
+records vouchers/sec, MB/sec, peak RSS and bytes written (MB/sec compares
+companies whose vouchers differ in size, such as manufacturing journals
+against invoices). Every case runs in a fresh
+process so peak RSS belongs to that case alone. Results are written as JSON;
+pass an earlier results file with --compare to see the change per case.
+
+    python -m tally_testdata.bench                      # every company, 1x/10x/100x
+    python -m tally_testdata.bench --scales 1,10 --days 90 -o before.json
+    python -m tally_testdata.bench --scales 1,10 --days 90 --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+
+from tally_testdata import engine, profiling, synthetic
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPANIES = ("trading-company", "services-company", "manufacturing-company")
+
+# Serializer paths and what each one measures
+PATHS = {
+    "prettify": "generate_all_vouchers() + prettify() (--no-stream)",
+    "stream-etree": "create_voucher_element() streamed (--renderer etree)",
+    "stream-template": "render_voucher() streamed (default)",
+}
+
+# The in-memory path holds the whole DOM; beyond this scale it needs many GB
+PRETTIFY_MAX_SCALE = 10
+
+def scale_profile(profile, factor, axis="vouchers", days=None):
+    """Return a copy of profile with factor times the vouchers
+
+    axis="vouchers" multiplies vouchers/day, axis="days" multiplies the
+    date range. days limits the base date range before scaling.
+    """
+    start = profile.START_DATE
+    base_days = (profile.END_DATE - start).days + 1
+    if days is not None:
+        base_days = min(base_days, days)
+
+    low, high = profile.VOUCHERS_PER_DAY
+    if axis == "vouchers":
+        low, high = low * factor, high * factor
+    else:
+        base_days *= factor
+    return synthetic.configure_profile(profile, end_date=start + timedelta(days=base_days - 1),
+                                       vouchers_per_day=(low, high))
+
+def run_case(company, path, scale, axis, days, seed, workers):
+    """Run one benchmark case (in its own process) and return its result"""
+    profile = scale_profile(engine.load_profile(os.path.join(REPO_ROOT, "companies", company)),
+                            scale, axis, days)
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = os.path.join(tmp, "vouchers.xml")
+        start = time.perf_counter()
+        if path == "prettify":
+            envelope, total = engine.generate_all_vouchers(profile, seed=seed)
+            with open(output_file, "wb") as f:
+                f.write(engine.prettify(envelope).encode("utf-8"))
+        else:
+            renderer = path.split("-")[1]
+            total, _, _ = engine.write_vouchers(profile, output_file, workers=workers, seed=seed,
+                                                renderer=renderer)
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(output_file)
+
+    return {
+        "company": company,
+        "path": path,
+        "scale": scale,
+        "vouchers": total,
+        "seconds": round(seconds, 3),
+        "vouchers_per_sec": round(total / seconds, 1),
+        "mb_per_sec": round(size / (1024 * 1024) / seconds, 1),
+        "peak_rss_mb": profiling.peak_rss_mb(),
+        "bytes": size,
+    }
+
+def run_isolated(*args):
+    """Run run_case() in a fresh process so its peak RSS is its own"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_case, *args).result()
+
+def git_commit():
+    """Return the current commit hash, or None outside a git checkout"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def compare(results, baseline_file):
+    """Print the vouchers/sec and peak RSS change of each case against a baseline file"""
+    with open(baseline_file, encoding="utf-8") as f:
+        baseline = json.load(f)
+    before = {(r["company"], r["path"], r["scale"]): r for r in baseline["results"]}
+
+    print(f"\nCompared with {baseline_file} (commit {baseline.get('commit')}):")
+    for r in results:
+        old = before.get((r["company"], r["path"], r["scale"]))
+        if old is None:
+            continue
+        speedup = r["vouchers_per_sec"] / old["vouchers_per_sec"]
+        if r["peak_rss_mb"] is None or old["peak_rss_mb"] is None:
+            rss = "     n/a"
+        else:
+            rss = f"{r['peak_rss_mb'] - old['peak_rss_mb']:+8.1f}"
+        print(f"  {r['company']:<18} {r['path']:<16} {r['scale']:>4}x  "
+              f"{speedup:5.2f}x speed  {rss} MB RSS")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the voucher generation pipeline")
+    parser.add_argument("-o", "--output", default="bench-results.json",
+                        help="JSON results file (default: bench-results.json)")
+    parser.add_argument("--companies", default=",".join(COMPANIES),
+                        help="comma-separated company folders (default: all)")
+    parser.add_argument("--paths", default=",".join(PATHS),
+                        help=f"comma-separated serializer paths (default: {','.join(PATHS)})")
+    parser.add_argument("--scales", default="1,10,100",
+                        help="comma-separated scale factors (default: 1,10,100)")
+    parser.add_argument("--axis", choices=("vouchers", "days"), default="vouchers",
+                        help="scale vouchers/day or the number of days (default: vouchers)")
+    parser.add_argument("--days", type=int,
+                        help="limit the base date range to N days before scaling")
+    parser.add_argument("--seed", type=int, default=1, help="seed for every case (default: 1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for the streamed paths (default: 1)")
+    parser.add_argument("--compare", metavar="FILE", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    companies = args.companies.split(",")
+    paths = args.paths.split(",")
+    unknown = set(paths) - set(PATHS)
+    if unknown:
+        parser.error(f"unknown path(s): {', '.join(sorted(unknown))}")
+    scales = [int(s) for s in args.scales.split(",")]
+
+    results = []
+    for company in companies:
+        for scale in scales:
+            for path in paths:
+                if path == "prettify" and scale > PRETTIFY_MAX_SCALE:
+                    print(f"  {company:<18} {path:<16} {scale:>4}x  skipped (in-memory path)")
+                    continue
+                result = run_isolated(company, path, scale, args.axis, args.days, args.seed, args.workers)
+                results.append(result)
+                print(f"  {company:<18} {path:<16} {scale:>4}x  {result['vouchers']:>9} vouchers  "
+                      f"{result['vouchers_per_sec']:>9.0f}/s  {result['mb_per_sec']:>6.1f} MB/s  "
+                      f"{profiling.format_mb(result['peak_rss_mb']):>10}  "
+                      f"{result['bytes'] / (1024 * 1024):>8.1f} MB written")
+
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"axis": args.axis, "days": args.days, "seed": args.seed, "workers": args.workers},
+        "paths": {path: PATHS[path] for path in paths},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"✓ Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
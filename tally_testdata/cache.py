@@ -0,0 +1,84 @@
+"""
+Build cache for month shards
+
+A month's vouchers depend only on the profile's data, the seed, the
+generator code and that month's business dates: every month draws from its
+own RNG streams (engine.shard_rng), and voucher numbers are only assigned
+when the shards are stitched together. So each generated month is stored
+under a key made of exactly those inputs, and a later run with the same
+inputs reuses it from disk instead of generating it again. Changing the
+profile, the seed or the code regenerates every month; moving START_DATE or
+END_DATE only generates the months that are new or whose dates changed.
+
+Entries are pickled fragment lists (see engine.generate_shard), one file
+per month under the cache directory. Stale entries are never read again
+and the directory can be deleted at any time.
+"""
+
+import hashlib
+import os
+import pickle
+
+# Source files whose code decides what a shard contains
+GENERATOR_MODULES = ("engine.py", "stock.py", "manufacturing.py", "tables.py")
+
+# Profile settings that don't change any single month's vouchers: the date
+# range is part of each shard's key through its dates instead
+UNKEYED_SETTINGS = ("DIRECTORY", "START_DATE", "END_DATE")
+
+def generator_version():
+    """Return a digest of the generator code"""
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in GENERATOR_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def profile_digest(profile):
+    """Return a digest of the profile data that shapes every month"""
+    settings = sorted((k, v) for k, v in vars(profile).items() if k not in UNKEYED_SETTINGS)
+    return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()
+
+class ShardCache:
+    """Month shards stored on disk, keyed on everything that shapes them"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def run_key(self, profile, seed, rows=False):
+        """Return the part of the key shared by every month of one run
+
+        rows=True is for shards that also carry table rows (see tables.py).
+        """
+        return f"{profile_digest(profile)}:{seed}:{int(rows)}:{generator_version()}"
+
+    def path(self, run_key, dates):
+        """Return the cache file for the month holding dates"""
+        key = run_key + ":" + ",".join(date.strftime("%Y%m%d") for date in dates)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        month = dates[0].strftime("%Y-%m")
+        return os.path.join(self.directory, f"{month}-{digest}.pkl")
+
+    def load(self, run_key, dates):
+        """Return the cached fragments for one month, or None"""
+        try:
+            with open(self.path(run_key, dates), "rb") as f:
+                fragments = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return fragments
+
+    def store(self, run_key, dates, fragments):
+        """Save one month's fragments"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(run_key, dates)
+        # Write then rename, so an interrupted run never leaves a partial entry
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            pickle.dump(fragments, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
@@ -0,0 +1,253 @@
+"""
+Command-line interface shared by every company's generate_vouchers.py
+"""
+
+import argparse
+import os
+import random
+import sys
+
+from tally_testdata import cache, engine, index, masters, output, profiling, synthetic, tables
+
+def build_parser(profile_dir=None):
+    """Return the argument parser; the company folder is positional unless given"""
+    parser = argparse.ArgumentParser(description="Tally Prime Voucher Generator")
+    if profile_dir is None:
+        parser.add_argument("company", help="company folder containing company.py")
+    parser.add_argument("-o", "--output", default="vouchers.xml", help="output file (default: vouchers.xml)")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="build the whole document in memory and prettify it (legacy path)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="generate month shards in N worker processes (default: 1)")
+    parser.add_argument("--seed", type=int,
+                        help="seed for reproducible output (default: random, printed at start)")
+    parser.add_argument("--renderer", choices=sorted(engine.RENDERERS), default="template",
+                        help="voucher serializer for streamed output (default: template)")
+    parser.add_argument("--check-renderer", action="store_true",
+                        help="compare the template renderer with ElementTree for this seed and exit")
+    parser.add_argument("--compress", choices=("gzip", "zstd"),
+                        help="compress output while writing (.xml.gz / .xml.zst; zstd requires zstandard)")
+    parser.add_argument("--compress-level", type=int, metavar="N",
+                        help="compression level (default: 6 for gzip, 3 for zstd)")
+    parser.add_argument("--append", action="store_true",
+                        help="extend the existing output file in place from the day after its last "
+                             "voucher up to the end date, continuing the voucher numbers")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="reuse months generated by earlier runs with the same profile and seed "
+                             "from DIR, and store new ones there")
+    parser.add_argument("--index", action="store_true",
+                        help="also write a sidecar index (vouchers.xml.idx) for random access "
+                             "by voucher number, date and ledger")
+    parser.add_argument("--tables", metavar="DIR",
+                        help="also write vouchers and ledger_entries tables to DIR for analytics "
+                             "(Parquet with pyarrow installed, else CSV)")
+    parser.add_argument("--tables-format", choices=tables.FORMATS,
+                        help="format of the --tables files (default: parquet if pyarrow is installed, else csv)")
+    parser.add_argument("--masters", metavar="FILE",
+                        help="also write the masters for this profile (ledgers, stock items, ...) to FILE")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="time every pipeline stage and write the stats as JSON (or CSV for a .csv name)")
+    parser.add_argument("--cprofile", metavar="FILE",
+                        help="run under cProfile and dump pstats to FILE (main process only)")
+    scale = parser.add_argument_group("scale", "override the company profile for stress datasets")
+    scale.add_argument("--config", metavar="FILE",
+                       help="JSON file with any of the settings below (options given here win)")
+    scale.add_argument("--start-date", type=synthetic.parse_date, metavar="YYYY-MM-DD")
+    scale.add_argument("--end-date", type=synthetic.parse_date, metavar="YYYY-MM-DD")
+    scale.add_argument("--vouchers-per-day", type=synthetic.parse_range, metavar="N[-M]",
+                       help="vouchers per business day, fixed or a range")
+    scale.add_argument("--customers", type=int, metavar="N",
+                       help="number of sales parties (synthetic ones are added as needed)")
+    scale.add_argument("--suppliers", type=int, metavar="N",
+                       help="number of purchase parties (synthetic ones are added as needed)")
+    scale.add_argument("--items", type=int, metavar="N",
+                       help="number of stock items/services (synthetic variants are added as needed)")
+    split = parser.add_mutually_exclusive_group()
+    split.add_argument("--split-month", action="store_true",
+                       help="write one complete import file per month, plus a manifest")
+    split.add_argument("--split-vouchers", type=int, metavar="N",
+                       help="write import files of at most N vouchers each, plus a manifest")
+    split.add_argument("--split-mb", type=float, metavar="N",
+                       help="write import files of at most N MB each, plus a manifest")
+    return parser
+
+def finish_profiling(args, profiler):
+    """Stop profiling and write the --stats and --cprofile files asked for"""
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+        print(f"✓ cProfile: {args.cprofile} (python -m pstats {args.cprofile})")
+    stats = profiling.disable()
+    if stats is not None:
+        report = stats.report()
+        profiling.write_stats(report, args.stats)
+        for line in profiling.format_stats(report):
+            print(line)
+        print(f"✓ Stats written to {args.stats}")
+
+def main(profile_dir=None, argv=None):
+    """Generate vouchers.xml for the company in profile_dir"""
+    parser = build_parser(profile_dir)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.no_stream and args.workers > 1:
+        parser.error("--workers requires streaming output")
+    if args.split_vouchers is not None and args.split_vouchers < 1:
+        parser.error("--split-vouchers must be at least 1")
+    if args.split_mb is not None and args.split_mb <= 0:
+        parser.error("--split-mb must be positive")
+    split, split_limit = None, None
+    if args.split_month:
+        split = "month"
+    elif args.split_vouchers:
+        split, split_limit = "vouchers", args.split_vouchers
+    elif args.split_mb:
+        split, split_limit = "size", int(args.split_mb * 1024 * 1024)
+    if args.no_stream and split:
+        parser.error("splitting requires streaming output")
+    if args.no_stream and args.cache:
+        parser.error("--cache requires streaming output")
+    if args.append:
+        if args.no_stream or split or args.compress or output.compression_for(args.output):
+            parser.error("--append works on a single uncompressed streamed file")
+        if not os.path.exists(args.output):
+            parser.error(f"--append: {args.output} does not exist")
+    if args.tables and (args.no_stream or args.append):
+        parser.error("--tables requires a fresh streamed run (not --no-stream or --append)")
+    if args.tables_format and not args.tables:
+        parser.error("--tables-format requires --tables")
+    if args.tables_format in ("parquet", "arrow") and not tables.pyarrow_available():
+        parser.error(f"{args.tables_format} tables require pyarrow (pip install pyarrow)")
+    output_file = args.output
+    if args.compress:
+        suffix = {"gzip": ".gz", "zstd": ".zst"}[args.compress]
+        if output.compression_for(output_file) != args.compress:
+            output_file += suffix
+    compression = output.compression_for(output_file)
+    if args.index and compression:
+        parser.error("--index needs uncompressed output")
+    if args.compress_level is not None:
+        if compression is None:
+            parser.error("--compress-level requires --compress or a .gz/.zst output file")
+        low, high = (0, 9) if compression == "gzip" else (1, 22)
+        if not low <= args.compress_level <= high:
+            parser.error(f"--compress-level for {compression} must be between {low} and {high}")
+    if compression == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            parser.error("zstd output requires zstandard (pip install zstandard)")
+
+    knobs = {}
+    if args.config:
+        try:
+            knobs = synthetic.load_config(args.config)
+        except (OSError, ValueError) as e:
+            parser.error(f"--config: {e}")
+    for key in synthetic.SCALE_SETTINGS:
+        if getattr(args, key) is not None:
+            knobs[key] = getattr(args, key)
+    for key in ("customers", "suppliers", "items"):
+        if knobs.get(key) is not None and knobs[key] < 1:
+            parser.error(f"--{key} must be at least 1")
+    if knobs.get("vouchers_per_day") is not None:
+        low, high = knobs["vouchers_per_day"]
+        if not 0 <= low <= high:
+            parser.error("--vouchers-per-day must be N or LOW-HIGH with 0 <= LOW <= HIGH")
+
+    profile = engine.load_profile(profile_dir or args.company)
+    if knobs:
+        try:
+            profile = synthetic.configure_profile(profile, **knobs)
+        except ValueError as e:
+            parser.error(f"--{e}")
+        if profile.END_DATE < profile.START_DATE:
+            parser.error("the end date is before the start date")
+
+    print(f"Generating Tally Prime vouchers for {profile.COMPANY_NAME}...")
+    print(f"Date range: {profile.START_DATE.date()} to {profile.END_DATE.date()}")
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    print(f"Seed: {seed}")
+
+    if args.check_renderer:
+        try:
+            checked = engine.check_renderers(engine.iter_vouchers(profile, seed=seed))
+        except ValueError as e:
+            sys.exit(f"✗ {e}")
+        print(f"✓ Template renderer matches ElementTree for {checked} vouchers")
+        return
+
+    stats = profiling.enable() if args.stats else None
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    shard_cache = cache.ShardCache(args.cache) if args.cache else None
+    if args.append:
+        try:
+            total, size, first_date = engine.append_vouchers(profile, output_file, workers=args.workers,
+                                                             seed=seed, renderer=args.renderer,
+                                                             cache=shard_cache)
+        except ValueError as e:
+            sys.exit(f"✗ {e}")
+        if first_date is None:
+            print(f"✓ {output_file} has no business days left up to {profile.END_DATE.date()}: "
+                  f"nothing to append")
+        else:
+            print(f"✓ Appended {total} vouchers ({first_date.date()} to {profile.END_DATE.date()}) "
+                  f"to {output_file}")
+            print(f"✓ Added {size / 1024:.2f} KB, file size now {os.path.getsize(output_file) / 1024:.2f} KB")
+            if args.index or os.path.exists(index.index_path(output_file)):
+                # The old index no longer matches the file
+                print(f"✓ Index: {index.build_index(output_file)}")
+        finish_profiling(args, profiler)
+        return
+
+    if args.no_stream:
+        envelope, total = engine.generate_all_vouchers(profile, seed=seed)
+        xml_string = profiling.timed("prettify", engine.prettify)(envelope)
+        with output.open_output(output_file, args.compress_level) as f:
+            profiling.timed("write", f.write)(xml_string.encode('utf-8'))
+        if stats:
+            stats.count(total)
+        size = len(xml_string)
+        parts = [{"path": output_file}]
+        if args.index:
+            parts[0]["index"] = index.build_index(output_file)
+    else:
+        table_writer = tables.TableWriter(args.tables, args.tables_format) if args.tables else None
+        total, size, parts = engine.write_vouchers(profile, output_file, workers=args.workers, seed=seed,
+                                                    renderer=args.renderer, split=split, split_limit=split_limit,
+                                                    level=args.compress_level, cache=shard_cache,
+                                                    index=args.index, tables=table_writer)
+        if table_writer:
+            table_files = profiling.timed("tables", table_writer.close)()
+
+    print(f"✓ Generated {total} vouchers")
+    if split:
+        print(f"✓ Saved to {len(parts)} files ({parts[0]['file']} ... {parts[-1]['file']})")
+        print(f"✓ Manifest: {output.manifest_path(output_file)}")
+    else:
+        print(f"✓ Saved to {output_file}")
+    if compression:
+        file_size = sum(os.path.getsize(part["path"]) for part in parts)
+        print(f"✓ File size: {file_size / 1024:.2f} KB "
+              f"({size / 1024:.2f} KB uncompressed, {compression} ratio {size / file_size:.1f}x)")
+    else:
+        print(f"✓ File size: {size / 1024:.2f} KB")
+    if args.index:
+        print(f"✓ Index: {parts[0]['index']}" if len(parts) == 1 else "✓ Index: one .idx per file")
+    if args.tables:
+        print(f"✓ Tables: {table_writer.rows} vouchers, {table_writer.entry_rows} ledger entries "
+              f"({table_writer.format}) in {', '.join(table_files)}")
+    if shard_cache:
+        print(f"✓ Cache: {shard_cache.hits} months reused, {shard_cache.misses} generated")
+    finish_profiling(args, profiler)
+
+    if args.masters:
+        counts, masters_size = masters.write_masters(profile, args.masters, level=args.compress_level)
+        summary = ", ".join(f"{count} {master_type}" for master_type, count in counts.items())
+        print(f"✓ Masters: {summary} saved to {args.masters} ({masters_size / 1024:.2f} KB)")
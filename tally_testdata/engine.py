@@ -0,0 +1,999 @@
+"""
+Tally Prime Voucher Engine
+Generates voucher data for any company profile (see companies/*/company.py)
+"""
+
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+import heapq
+import importlib.util
+import os
+import random
+from datetime import timedelta
+from types import SimpleNamespace
+
+from tally_testdata import profiling
+
+PROFILE_FILE = "company.py"
+
+def load_profile(directory):
+    """Load the company profile stored in directory/company.py"""
+    path = os.path.join(directory, PROFILE_FILE)
+    spec = importlib.util.spec_from_file_location("company_profile", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Keep only the upper-case data so the profile can be sent to worker processes
+    profile = SimpleNamespace(**{k: v for k, v in vars(module).items() if k.isupper()})
+    profile.DIRECTORY = os.path.abspath(directory)
+    return profile
+
+def prettify(elem):
+    """Return a pretty-printed XML string"""
+    rough_string = ET.tostring(elem, encoding='utf-8')
+    reparsed = minidom.parseString(rough_string)
+    return reparsed.toprettyxml(indent="  ", encoding='utf-8').decode('utf-8')
+
+def escape_text(text):
+    """Escape text content the same way minidom does"""
+    return (text.replace("&", "&amp;").replace("<", "&lt;")
+            .replace("\"", "&quot;").replace(">", "&gt;"))
+
+def serialize_element(elem, level=0, indent="  "):
+    """Serialize an element with the same layout prettify() produces"""
+    pad = indent * level
+    children = list(elem)
+    if children:
+        parts = [f"{pad}<{elem.tag}>\n"]
+        for child in children:
+            parts.append(serialize_element(child, level + 1, indent))
+        parts.append(f"{pad}</{elem.tag}>\n")
+        return "".join(parts)
+    if elem.text:
+        return f"{pad}<{elem.tag}>{escape_text(elem.text)}</{elem.tag}>\n"
+    return f"{pad}<{elem.tag}/>\n"
+
+def get_date_range(profile):
+    """Generate list of business dates between START_DATE and END_DATE"""
+    dates = []
+    current = profile.START_DATE
+    while current <= profile.END_DATE:
+        # Skip Sundays (business days only)
+        if current.weekday() < 6:
+            dates.append(current)
+        current += timedelta(days=1)
+    return dates
+
+def is_interstate(from_state, to_state):
+    """Check if transaction is interstate"""
+    return from_state != to_state
+
+# Amounts are carried as integer paise from the moment they are drawn (the
+# rupee figures in company.py are scaled by PAISE) and only turned into
+# "1234.50" text by format_amount() when a voucher is rendered, so every
+# voucher balances exactly.
+PAISE = 100
+
+def format_amount(paise):
+    """Format integer paise as rupees with two decimals, e.g. -123456 as -1234.56"""
+    if paise < 0:
+        rupees, rest = divmod(-paise, 100)
+        return "-%d.%02d" % (rupees, rest)
+    rupees, rest = divmod(paise, 100)
+    return "%d.%02d" % (rupees, rest)
+
+def parse_amount(text):
+    """Parse an AMOUNT back to integer paise (inverse of format_amount())"""
+    whole, _, fraction = text.strip().partition(".")
+    digits = whole.lstrip("-")
+    if digits.isdigit() and len(fraction) <= 2 and (fraction.isdigit() or not fraction):
+        paise = int(digits) * 100 + int(fraction.ljust(2, "0"))
+        return -paise if whole.startswith("-") else paise
+    # Anything else (e.g. float output from older versions): round to the nearest paisa
+    return round(float(text) * 100)
+
+def percent_of(paise, rate):
+    """Return rate percent of an amount in paise, rounded half up to the paisa"""
+    return (paise * rate + 50) // 100
+
+def calculate_gst(amount, gst_rate, is_interstate_flag):
+    """Calculate GST amounts in paise
+
+    Interstate supplies pay IGST at the full rate; local supplies pay CGST
+    and SGST at half the rate each, rounded separately so they are equal.
+    """
+    if is_interstate_flag:
+        return {"igst": percent_of(amount, gst_rate), "cgst": 0, "sgst": 0}
+    half = (amount * gst_rate + 100) // 200
+    return {"igst": 0, "cgst": half, "sgst": half}
+
+def create_voucher_element(voucher_type, date, number, entries, narration=""):
+    """Create a voucher XML element"""
+    voucher = ET.Element("VOUCHER")
+
+    # Voucher type
+    vtype = ET.SubElement(voucher, "VOUCHERTYPENAME")
+    vtype.text = voucher_type
+
+    # Date
+    vdate = ET.SubElement(voucher, "DATE")
+    vdate.text = date.strftime("%Y%m%d")
+
+    # Voucher number
+    vnumber = ET.SubElement(voucher, "VOUCHERNUMBER")
+    vnumber.text = str(number)
+
+    # Narration
+    if narration:
+        vnarration = ET.SubElement(voucher, "NARRATION")
+        vnarration.text = narration
+
+    # Ledger entries
+    for entry in entries:
+        if "name" not in entry:
+            continue
+        ledger_entry = ET.SubElement(voucher, "ALLLEDGERENTRIES.LIST")
+
+        ledger_name = ET.SubElement(ledger_entry, "LEDGERNAME")
+        ledger_name.text = entry["name"]
+
+        amount = ET.SubElement(ledger_entry, "AMOUNT")
+        amount.text = format_amount(entry["amount"])
+
+        # Add tax details if present
+        if "tax_type" in entry:
+            tax_type = ET.SubElement(ledger_entry, "TAXTYPE")
+            tax_type.text = entry["tax_type"]
+
+        if "tax_rate" in entry:
+            tax_rate = ET.SubElement(ledger_entry, "TAXRATE")
+            tax_rate.text = str(entry["tax_rate"])
+
+        if "hsn" in entry:
+            hsn = ET.SubElement(ledger_entry, "HSN")
+            hsn.text = entry["hsn"]
+
+        if "sac" in entry:
+            sac = ET.SubElement(ledger_entry, "SAC")
+            sac.text = entry["sac"]
+
+        # Bill-wise details
+        for name, bill_type, bill_amount, credit_days in entry.get("bills", ()):
+            bill = ET.SubElement(ledger_entry, "BILLALLOCATIONS.LIST")
+            ET.SubElement(bill, "NAME").text = name
+            ET.SubElement(bill, "BILLTYPE").text = bill_type
+            if credit_days is not None:
+                ET.SubElement(bill, "BILLCREDITPERIOD").text = f"{credit_days} Days"
+            ET.SubElement(bill, "AMOUNT").text = format_amount(bill_amount)
+
+    # Inventory entries for the stock item lines, and stock journal lines
+    # (no ledger): coming in when positive, going out when negative
+    for entry in entries:
+        if "stock" in entry:
+            item, qty, unit, rate = entry["stock"]
+            if "name" in entry:
+                tag = "ALLINVENTORYENTRIES.LIST"
+            elif entry["amount"] >= 0:
+                tag = "INVENTORYENTRIESIN.LIST"
+            else:
+                tag = "INVENTORYENTRIESOUT.LIST"
+            inventory = ET.SubElement(voucher, tag)
+            ET.SubElement(inventory, "STOCKITEMNAME").text = item
+            ET.SubElement(inventory, "RATE").text = f"{format_amount(rate)}/{unit}"
+            ET.SubElement(inventory, "ACTUALQTY").text = f"{qty} {unit}"
+            ET.SubElement(inventory, "BILLEDQTY").text = f"{qty} {unit}"
+            ET.SubElement(inventory, "AMOUNT").text = format_amount(entry["amount"])
+
+            # Godown of the line
+            if "godown" in entry:
+                batch = ET.SubElement(inventory, "BATCHALLOCATIONS.LIST")
+                ET.SubElement(batch, "GODOWNNAME").text = entry["godown"]
+                ET.SubElement(batch, "BATCHNAME").text = "Primary Batch"
+                ET.SubElement(batch, "ACTUALQTY").text = f"{qty} {unit}"
+                ET.SubElement(batch, "BILLEDQTY").text = f"{qty} {unit}"
+                ET.SubElement(batch, "AMOUNT").text = format_amount(entry["amount"])
+
+    return voucher
+
+# Precompiled templates for render_voucher(), laid out exactly like
+# serialize_element(create_voucher_element(...), level=4)
+VOUCHER_HEAD = (
+    "        <VOUCHER>\n"
+    "          <VOUCHERTYPENAME>%s</VOUCHERTYPENAME>\n"
+    "          <DATE>%04d%02d%02d</DATE>\n"
+    "          <VOUCHERNUMBER>%s</VOUCHERNUMBER>\n"
+)
+VOUCHER_NARRATION = "          <NARRATION>%s</NARRATION>\n"
+ENTRY_HEAD = (
+    "          <ALLLEDGERENTRIES.LIST>\n"
+    "            <LEDGERNAME>%s</LEDGERNAME>\n"
+    "            <AMOUNT>%s</AMOUNT>\n"
+)
+ENTRY_FIELDS = (
+    ("tax_type", "            <TAXTYPE>%s</TAXTYPE>\n", "            <TAXTYPE/>\n"),
+    ("tax_rate", "            <TAXRATE>%s</TAXRATE>\n", "            <TAXRATE/>\n"),
+    ("hsn", "            <HSN>%s</HSN>\n", "            <HSN/>\n"),
+    ("sac", "            <SAC>%s</SAC>\n", "            <SAC/>\n"),
+)
+BILL_HEAD = (
+    "            <BILLALLOCATIONS.LIST>\n"
+    "              <NAME>%s</NAME>\n"
+    "              <BILLTYPE>%s</BILLTYPE>\n"
+)
+BILL_CREDIT_PERIOD = "              <BILLCREDITPERIOD>%d Days</BILLCREDITPERIOD>\n"
+BILL_TAIL = (
+    "              <AMOUNT>%s</AMOUNT>\n"
+    "            </BILLALLOCATIONS.LIST>\n"
+)
+ENTRY_TAIL = "          </ALLLEDGERENTRIES.LIST>\n"
+INVENTORY_ENTRY = (
+    "          <ALLINVENTORYENTRIES.LIST>\n"
+    "            <STOCKITEMNAME>%s</STOCKITEMNAME>\n"
+    "            <RATE>%s/%s</RATE>\n"
+    "            <ACTUALQTY>%d %s</ACTUALQTY>\n"
+    "            <BILLEDQTY>%d %s</BILLEDQTY>\n"
+    "            <AMOUNT>%s</AMOUNT>\n"
+    "          </ALLINVENTORYENTRIES.LIST>\n"
+)
+# Inventory entries with a godown (tag, item, rate, unit, quantities, amount
+# and the batch allocation in the godown)
+INVENTORY_GODOWN_ENTRY = (
+    "          <%s>\n"
+    "            <STOCKITEMNAME>%s</STOCKITEMNAME>\n"
+    "            <RATE>%s/%s</RATE>\n"
+    "            <ACTUALQTY>%d %s</ACTUALQTY>\n"
+    "            <BILLEDQTY>%d %s</BILLEDQTY>\n"
+    "            <AMOUNT>%s</AMOUNT>\n"
+    "            <BATCHALLOCATIONS.LIST>\n"
+    "              <GODOWNNAME>%s</GODOWNNAME>\n"
+    "              <BATCHNAME>Primary Batch</BATCHNAME>\n"
+    "              <ACTUALQTY>%d %s</ACTUALQTY>\n"
+    "              <BILLEDQTY>%d %s</BILLEDQTY>\n"
+    "              <AMOUNT>%s</AMOUNT>\n"
+    "            </BATCHALLOCATIONS.LIST>\n"
+    "          </%s>\n"
+)
+VOUCHER_TAIL = "        </VOUCHER>\n"
+
+# Ledger names repeat constantly; escape each one only once
+_escaped_names = {}
+
+def escape_name(name):
+    """escape_text() with a cache, for ledger and voucher type names"""
+    escaped = _escaped_names.get(name)
+    if escaped is None:
+        escaped = _escaped_names[name] = escape_text(name)
+    return escaped
+
+def render_voucher(voucher_type, date, number, entries, narration=""):
+    """Render a voucher straight to XML text
+
+    Same arguments as create_voucher_element(); the result is identical to
+    serialize_element(create_voucher_element(...), level=4) but skips
+    building the element tree.
+    """
+    if not voucher_type:
+        return render_voucher_etree(voucher_type, date, number, entries, narration)
+
+    parts = [VOUCHER_HEAD % (escape_name(voucher_type), date.year, date.month, date.day, number)]
+    if narration:
+        parts.append(VOUCHER_NARRATION % escape_text(narration))
+
+    inventory = []
+    for entry in entries:
+        name = entry.get("name")
+        if name is None:
+            # Stock journal line: inventory only
+            tag = "INVENTORYENTRIESIN.LIST" if entry["amount"] >= 0 else "INVENTORYENTRIESOUT.LIST"
+            inventory.append(render_inventory(tag, entry, format_amount(entry["amount"])))
+            continue
+        if not name:
+            # Empty text serializes as <LEDGERNAME/>; rare enough to leave to the slow path
+            return render_voucher_etree(voucher_type, date, number, entries, narration)
+        amount = format_amount(entry["amount"])
+        parts.append(ENTRY_HEAD % (escape_name(name), amount))
+        if len(entry) > 2:
+            for key, template, empty in ENTRY_FIELDS:
+                if key in entry:
+                    value = str(entry[key])
+                    parts.append(template % escape_text(value) if value else empty)
+            for bill_name, bill_type, bill_amount, credit_days in entry.get("bills", ()):
+                parts.append(BILL_HEAD % (escape_text(bill_name), bill_type))
+                if credit_days is not None:
+                    parts.append(BILL_CREDIT_PERIOD % credit_days)
+                parts.append(BILL_TAIL % format_amount(bill_amount))
+            if "stock" in entry:
+                if "godown" in entry:
+                    inventory.append(render_inventory("ALLINVENTORYENTRIES.LIST", entry, amount))
+                else:
+                    item, rate, unit = stock_texts(entry["stock"])
+                    qty = entry["stock"][1]
+                    inventory.append(INVENTORY_ENTRY % (item, rate, unit, qty, unit, qty, unit, amount))
+        parts.append(ENTRY_TAIL)
+
+    parts.extend(inventory)
+    parts.append(VOUCHER_TAIL)
+    return "".join(parts)
+
+# Escaped item name, formatted rate and escaped unit per (item, unit, rate)
+_stock_texts = {}
+
+def stock_texts(stock):
+    """Return the escaped item name, formatted rate and escaped unit of a stock tuple"""
+    item, _, unit, rate = stock
+    key = (item, unit, rate)
+    texts = _stock_texts.get(key)
+    if texts is None:
+        texts = _stock_texts[key] = (escape_name(item), format_amount(rate), escape_name(unit))
+    return texts
+
+# INVENTORY_GODOWN_ENTRY with all but the quantities and amounts filled in,
+# per (tag, item, unit, rate, godown)
+_inventory_templates = {}
+
+def render_inventory(tag, entry, amount):
+    """Render the inventory entry of a line that names its godown"""
+    stock = entry["stock"]
+    item, qty, unit, rate = stock
+    key = (tag, item, unit, rate, entry["godown"])
+    template = _inventory_templates.get(key)
+    if template is None:
+        item, rate, unit = (text.replace("%", "%%") for text in stock_texts(stock))
+        godown = escape_name(entry["godown"]).replace("%", "%%")
+        template = _inventory_templates[key] = INVENTORY_GODOWN_ENTRY.replace("%d", "%s") % (
+            tag, item, rate, unit, "%d", unit, "%d", unit, "%s", godown, "%d", unit, "%d", unit, "%s", tag)
+    return template % (qty, qty, amount, qty, qty, amount)
+
+def render_voucher_etree(voucher_type, date, number, entries, narration=""):
+    """Render a voucher through ElementTree (reference path for render_voucher)"""
+    voucher = create_voucher_element(voucher_type, date, number, entries, narration)
+    return serialize_element(voucher, level=4)
+
+RENDERERS = {
+    "template": render_voucher,
+    "etree": render_voucher_etree,
+}
+
+# Unit for stock items that don't name their own
+DEFAULT_UNIT = "Nos"
+
+def invoice_lines(config, interstate, rng):
+    """Pick the lines of a sales invoice or purchase bill
+
+    Returns (entries, taxable amount per GST rate, narration parts); entry
+    amounts are positive paise and the caller applies the debit/credit sign.
+    With config["inventory"], quantity lines also carry their stock item as
+    entry["stock"] = (item, quantity, unit, rate in paise).
+    """
+    num_lines = rng.randint(*config["lines"])
+    items = rng.sample(config["items"], num_lines)
+
+    entries = []
+    taxable = {}
+    narration_parts = []
+
+    for item in items:
+        # Project fee or quantity x rate
+        if "project_fee" in config and rng.random() <= 0.5:
+            entry = item_line(config, item, 0, interstate, rng.randint(*config["project_fee"]) * PAISE)
+            narration_parts.append(f"{item['name']} (Project)")
+        else:
+            qty = rng.randint(*config["quantity"])
+            entry = item_line(config, item, qty, interstate)
+            narration_parts.append(line_narration(config, item, qty))
+
+        taxable[item["gst_rate"]] = taxable.get(item["gst_rate"], 0) + entry["amount"]
+        entries.append(entry)
+
+    return entries, taxable, narration_parts
+
+def item_line(config, item, qty, interstate, amount=None):
+    """Return the ledger entry for qty of item (amount defaults to qty x rate)
+
+    With config["inventory"], quantity lines carry their stock item (and
+    config["godown"], the godown it moves in or out of).
+    """
+    if amount is None:
+        amount = item["rate"] * qty * PAISE
+    if "ledger" in item:
+        ledger = item["ledger"]
+    else:
+        ledger = config["ledgers"]["interstate" if interstate else "local"]
+
+    entry = {"name": ledger, "amount": amount}
+    for code in ("hsn", "sac"):
+        if code in item:
+            entry[code] = item[code]
+    if config.get("inventory") and qty:
+        entry["stock"] = (item["name"], qty, item.get("unit", DEFAULT_UNIT), item["rate"] * PAISE)
+        if "godown" in config:
+            entry["godown"] = config["godown"]
+    return entry
+
+def line_narration(config, item, qty):
+    """Describe one invoice line for the narration"""
+    if "unit" in config:
+        return f"{item['name']} ({qty} {config['unit']})"
+    return f"{item['name']} x{qty}"
+
+def gst_entries(taxable, interstate, direction):
+    """Return GST ledger entries ("Output" or "Input") and the total tax"""
+    igst = cgst = sgst = 0
+    for gst_rate, amount in taxable.items():
+        gst = calculate_gst(amount, gst_rate, interstate)
+        igst += gst["igst"]
+        cgst += gst["cgst"]
+        sgst += gst["sgst"]
+
+    if igst > 0:
+        entries = [{"name": f"IGST {direction}", "amount": igst}]
+    else:
+        entries = [
+            {"name": f"CGST {direction}", "amount": cgst},
+            {"name": f"SGST {direction}", "amount": sgst},
+        ]
+    return entries, igst + cgst + sgst
+
+def generate_sales_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Sales voucher"""
+    config = profile.SALES
+    customer = rng.choice(config["parties"])
+    is_interstate_flag = is_interstate(profile.STATE, customer["state"])
+
+    lines, taxable, narration_parts = invoice_lines(config, is_interstate_flag, rng)
+    narration = f"{config['narration'].format(party=customer['name'])}: {', '.join(narration_parts)}"
+
+    return invoice_record("Sales", date, voucher_num, customer["name"], is_interstate_flag,
+                          lines, taxable, narration)
+
+def generate_purchase_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Purchase voucher"""
+    config = profile.PURCHASES
+    supplier = rng.choice(config["parties"])
+    is_interstate_flag = is_interstate(profile.STATE, supplier["state"])
+
+    if "items" in config:
+        lines, taxable, narration_parts = invoice_lines(config, is_interstate_flag, rng)
+        narration = f"{config['narration'].format(party=supplier['name'])}: {', '.join(narration_parts)}"
+    else:
+        # Expense bill: the supplier always bills the same expense ledger
+        amount = rng.randint(*supplier["amount"]) * PAISE
+        lines = [{"name": supplier["expense"], "amount": amount}]
+        taxable = {supplier["gst_rate"]: amount}
+        narration = supplier["narration"]
+
+    return invoice_record("Purchase", date, voucher_num, supplier["name"], is_interstate_flag,
+                          lines, taxable, narration)
+
+def invoice_record(voucher_type, date, voucher_num, party, interstate, lines, taxable, narration):
+    """Assemble a Sales or Purchase record from its lines (positive amounts) and GST
+
+    Sales credit the lines and GST and debit the customer; purchases debit
+    the lines and GST and credit the supplier.
+    """
+    direction = "Output" if voucher_type == "Sales" else "Input"
+    taxes, total_gst = gst_entries(taxable, interstate, direction)
+    total_with_gst = sum(taxable.values()) + total_gst
+
+    if voucher_type == "Sales":
+        entries = []
+        for entry in lines + taxes:
+            entries.append(dict(entry, amount=-entry["amount"]))
+        entries.append({"name": party, "amount": total_with_gst})
+    else:
+        entries = lines + taxes
+        entries.append({"name": party, "amount": -total_with_gst})
+
+    return (voucher_type, date, voucher_num, entries, narration)
+
+def generate_payment_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Payment voucher"""
+    bank = rng.choice(profile.BANKS)
+    expense, amount_range, narration = rng.choice(profile.PAYMENTS)
+    amount = rng.randint(*amount_range) * PAISE
+
+    entries = [
+        {"name": expense, "amount": amount},  # Debit
+        {"name": bank, "amount": -amount}  # Credit
+    ]
+
+    return ("Payment", date, voucher_num, entries, narration)
+
+def generate_receipt_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Receipt voucher"""
+    bank = rng.choice(profile.BANKS)
+    income, amount_range, narration = rng.choice(profile.RECEIPTS)
+    amount = rng.randint(*amount_range) * PAISE
+
+    entries = [
+        {"name": bank, "amount": amount},  # Debit
+        {"name": income, "amount": -amount}  # Credit
+    ]
+
+    return ("Receipt", date, voucher_num, entries, narration)
+
+def generate_contra_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Contra voucher (Cash ↔ Bank)"""
+    bank = rng.choice(profile.BANKS)
+    amount = rng.randint(*profile.CONTRA_AMOUNT) * PAISE
+
+    # Randomly decide direction
+    if rng.random() > 0.5:
+        # Cash to Bank
+        entries = [
+            {"name": bank, "amount": amount},  # Debit
+            {"name": "Cash", "amount": -amount}  # Credit
+        ]
+        narration = f"Cash deposited to {bank}"
+    else:
+        # Bank to Cash
+        entries = [
+            {"name": "Cash", "amount": amount},  # Debit
+            {"name": bank, "amount": -amount}  # Credit
+        ]
+        narration = f"Cash withdrawn from {bank}"
+
+    return ("Contra", date, voucher_num, entries, narration)
+
+def generate_journal_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Journal voucher"""
+    debit_ledger, credit_ledger, amount_range, narration = rng.choice(profile.JOURNALS)
+    amount = rng.randint(*amount_range) * PAISE
+
+    entries = [
+        {"name": debit_ledger, "amount": amount},  # Debit
+        {"name": credit_ledger, "amount": -amount}  # Credit
+    ]
+
+    return ("Journal", date, voucher_num, entries, narration)
+
+def generate_stock_journal_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Stock Journal (godown transfer; see tally_testdata.manufacturing)"""
+    from tally_testdata import manufacturing
+    return manufacturing.generate_stock_journal(profile, date, voucher_num, rng)
+
+def generate_manufacturing_voucher(profile, date, voucher_num, rng=random):
+    """Generate a Manufacturing Journal (see tally_testdata.manufacturing)"""
+    from tally_testdata import manufacturing
+    return manufacturing.generate_manufacturing_journal(profile, date, voucher_num, rng)
+
+VOUCHER_GENERATORS = {
+    "Sales": generate_sales_voucher,
+    "Purchase": generate_purchase_voucher,
+    "Payment": generate_payment_voucher,
+    "Receipt": generate_receipt_voucher,
+    "Contra": generate_contra_voucher,
+    "Journal": generate_journal_voucher,
+    "Stock Journal": generate_stock_journal_voucher,
+    "Manufacturing Journal": generate_manufacturing_voucher,
+}
+
+# Bill-wise details: Sales and Purchase raise a new bill against the party,
+# Receipts settle customers' open Sales bills and Payments suppliers' open
+# Purchase bills
+BILL_PREFIXES = {"Sales": "INV", "Purchase": "PB"}
+SETTLES = {"Receipt": "Sales", "Payment": "Purchase"}
+DEFAULT_CREDIT_DAYS = 30
+# Share of Receipts and Payments that settle bills when any are open; the
+# rest stay the income or expense vouchers they were drawn as
+SETTLEMENT_SHARE = 0.8
+MAX_BILLS_SETTLED = 3
+
+class OpenBills:
+    """Bills raised but not yet settled, in due date order
+
+    Every party has a heap of its open bills by due date, and each kind of
+    bill ("Sales" or "Purchase") has one heap across all parties, so finding
+    the bill due first and settling a party's oldest bills are O(log n)
+    however many bills are open. A bill settled through its party's heap is
+    marked rather than removed from the shared heap, and skipped when it
+    reaches the top.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.parties = {kind: {} for kind in BILL_PREFIXES}
+        self.due = {kind: [] for kind in BILL_PREFIXES}
+        self.raised = 0
+
+    def add(self, kind, party, date, credit_days, amount):
+        """Open a bill for amount and return its name"""
+        self.raised += 1
+        name = f"{BILL_PREFIXES[kind]}/{date.year:04d}{date.month:02d}/{self.raised:05d}"
+        # [due date, sequence, name, amount, party]; amount None once settled
+        bill = [date + timedelta(days=credit_days), self.raised, name, amount, party]
+        heapq.heappush(self.parties[kind].setdefault(party, []), bill)
+        heapq.heappush(self.due[kind], bill)
+        return name
+
+    def settle(self, kind, count):
+        """Settle up to count bills of the party whose bill is due first
+
+        Returns (party, [(bill name, amount), ...]), or None with no open bills.
+        """
+        due = self.due[kind]
+        while due and due[0][3] is None:
+            heapq.heappop(due)
+        if not due:
+            return None
+        party = due[0][4]
+        bills = self.parties[kind][party]
+        settled = []
+        while bills and len(settled) < count:
+            bill = heapq.heappop(bills)
+            settled.append((bill[2], bill[3]))
+            bill[3] = None
+        if not bills:
+            del self.parties[kind][party]
+        return party, settled
+
+def allocate_bills(profile, record, open_bills):
+    """Add bill-wise details to a voucher record, in date order
+
+    Sales and Purchase vouchers open a bill on the party entry; most
+    Receipts and Payments are turned into settlements of the open bills of
+    one party, through the same bank. Returns the (possibly new) record.
+    """
+    voucher_type, date, number, entries, narration = record
+    if voucher_type in BILL_PREFIXES:
+        config = profile.SALES if voucher_type == "Sales" else profile.PURCHASES
+        credit_days = config.get("credit_days", DEFAULT_CREDIT_DAYS)
+        party = entries[-1]
+        name = open_bills.add(voucher_type, party["name"], date, credit_days, party["amount"])
+        party["bills"] = [(name, "New Ref", party["amount"], credit_days)]
+        return record
+
+    kind = SETTLES.get(voucher_type)
+    if kind is None or open_bills.rng.random() >= SETTLEMENT_SHARE:
+        return record
+    settlement = open_bills.settle(kind, open_bills.rng.randint(1, MAX_BILLS_SETTLED))
+    if settlement is None:
+        return record
+
+    party, bills = settlement
+    total = sum(amount for _, amount in bills)
+    allocations = [(name, "Agst Ref", -amount, None) for name, amount in bills]
+    names = ", ".join(name for name, _ in bills)
+    if voucher_type == "Receipt":
+        # Bank debited, customer credited against their invoices
+        entries = [{"name": entries[0]["name"], "amount": total},
+                   {"name": party, "amount": -total, "bills": allocations}]
+        narration = f"Received from {party} against {names}"
+    else:
+        # Supplier debited against their bills, bank credited
+        entries = [{"name": party, "amount": -total, "bills": allocations},
+                   {"name": entries[1]["name"], "amount": total}]
+        narration = f"Paid to {party} against {names}"
+    return voucher_type, date, number, entries, narration
+
+def create_envelope(profile):
+    """Create the ENVELOPE skeleton, returning it and its REQUESTDATA node"""
+    envelope = ET.Element("ENVELOPE")
+
+    # Header
+    header = ET.SubElement(envelope, "HEADER")
+    version = ET.SubElement(header, "VERSION")
+    version.text = "1"
+    trequest = ET.SubElement(header, "TALLYREQUEST")
+    trequest.text = "Import Data"
+    type_elem = ET.SubElement(header, "TYPE")
+    type_elem.text = "Data"
+    id_elem = ET.SubElement(header, "ID")
+    id_elem.text = "Transactions"
+
+    # Body
+    body = ET.SubElement(envelope, "BODY")
+    importdata = ET.SubElement(body, "IMPORTDATA")
+    requestdesc = ET.SubElement(importdata, "REQUESTDESC")
+    reportname = ET.SubElement(requestdesc, "REPORTNAME")
+    reportname.text = "All Vouchers"
+
+    staticvars = ET.SubElement(requestdesc, "STATICVARIABLES")
+    svc = ET.SubElement(staticvars, "SVCURRENTCOMPANY")
+    svc.text = profile.COMPANY_NAME
+
+    requestdata = ET.SubElement(importdata, "REQUESTDATA")
+
+    return envelope, requestdata
+
+def envelope_parts(profile):
+    """Return the text before and after the vouchers in a streamed file"""
+    envelope, requestdata = create_envelope(profile)
+
+    # Everything before REQUESTDATA's children, and everything after them
+    skeleton = prettify(envelope).replace("<REQUESTDATA/>", "<REQUESTDATA>\n      </REQUESTDATA>")
+    prologue, epilogue = skeleton.split("      </REQUESTDATA>\n")
+    return prologue, "      </REQUESTDATA>\n" + epilogue
+
+def get_month_shards(dates):
+    """Split a date list into consecutive per-month lists"""
+    shards = {}
+    for date in dates:
+        shards.setdefault((date.year, date.month), []).append(date)
+    return list(shards.values())
+
+def shard_rng(seed, year, month, stream):
+    """Return an independent RNG for one stream of one month
+
+    Every month gets a "driver" stream (vouchers per day, voucher type) and
+    one stream per voucher type, all derived from the run seed alone, so a
+    month's vouchers don't depend on which process or in what order it was
+    generated.
+    """
+    return profiling.random_wrapper(random.Random(f"{seed}:{year:04d}-{month:02d}:{stream}"))
+
+def iter_vouchers(profile, dates=None, voucher_counters=None, seed=None):
+    """Yield voucher records one at a time in date order
+
+    A record is (voucher_type, date, number, entries, narration), the
+    arguments of create_voucher_element() and render_voucher().
+    """
+    from tally_testdata import stock
+
+    if dates is None:
+        dates = get_date_range(profile)
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if voucher_counters is None:
+        voucher_counters = dict.fromkeys(profile.VOUCHER_WEIGHTS, 1)
+
+    voucher_types = list(profile.VOUCHER_WEIGHTS)
+    weights = list(profile.VOUCHER_WEIGHTS.values())
+    generators = profiling.timed_functions(VOUCHER_GENERATORS)
+    apply_stock = profiling.timed("apply_stock", stock.apply_stock)
+    allocate = profiling.timed("allocate_bills", allocate_bills)
+
+    for month_dates in get_month_shards(dates):
+        year, month = month_dates[0].year, month_dates[0].month
+        rng = shard_rng(seed, year, month, "driver")
+        type_rngs = {vtype: shard_rng(seed, year, month, vtype) for vtype in voucher_types}
+        # Bills and stock are settled within the month, so months stay independent
+        open_bills = OpenBills(shard_rng(seed, year, month, "bills"))
+        tracker = stock.new_tracker(profile)
+        stock_rng = shard_rng(seed, year, month, "stock")
+
+        for date in month_dates:
+            num_vouchers = rng.randint(*profile.VOUCHERS_PER_DAY)
+
+            for _ in range(num_vouchers):
+                voucher_type = rng.choices(voucher_types, weights=weights)[0]
+
+                voucher_num = voucher_counters[voucher_type]
+                voucher_counters[voucher_type] += 1
+
+                generate = generators[voucher_type]
+                record = generate(profile, date, voucher_num, type_rngs[voucher_type])
+                record = apply_stock(profile, record, tracker, stock_rng)
+                yield allocate(profile, record, open_bills)
+
+        for record in stock.restock_records(profile, tracker, stock_rng, month_dates[-1], voucher_counters):
+            yield allocate(profile, record, open_bills)
+
+def generate_all_vouchers(profile, seed=None):
+    """Generate all vouchers"""
+    envelope, requestdata = create_envelope(profile)
+
+    total_vouchers = 0
+    create = profiling.timed("create_voucher_element", create_voucher_element)
+    for record in iter_vouchers(profile, seed=seed):
+        requestdata.append(create(*record))
+        total_vouchers += 1
+
+    return envelope, total_vouchers
+
+# Vouchers between write_vouchers() progress callbacks
+PROGRESS_INTERVAL = 1000
+
+# Profile of the current worker process, set once by init_worker()
+_worker_profile = None
+
+def init_worker(profile):
+    """Process pool initializer: receive the profile once per worker"""
+    global _worker_profile
+    _worker_profile = profile
+
+def generate_shard(dates, seed, renderer="template", profile=None, rows=False):
+    """Generate one month of vouchers as serialized fragments
+
+    Each fragment is (voucher_type, date, head, tail) where head and tail
+    surround the voucher number, so the caller can renumber vouchers
+    across shards. rows=True appends each voucher's table row (see
+    tables.table_row()). profile defaults to the worker's (see init_worker()).
+    """
+    from tally_testdata.tables import ledger_tax_types, table_row
+
+    profile = profile or _worker_profile
+    tax_types = ledger_tax_types(profile) if rows else None
+    render = profiling.renderer(renderer)
+    fragments = []
+    for record in iter_vouchers(profile, dates, seed=seed):
+        voucher_type, date, number = record[:3]
+        number_tag = f"<VOUCHERNUMBER>{number}</VOUCHERNUMBER>"
+        head, tail = render(*record).split(number_tag, 1)
+        if rows:
+            fragments.append((voucher_type, date, head, tail, table_row(record, tax_types)))
+        else:
+            fragments.append((voucher_type, date, head, tail))
+    return fragments
+
+def iter_shard_vouchers(profile, workers, seed, renderer="template", cache=None, rows=False):
+    """Generate month shards in a process pool, yielding fragments in date order
+
+    With a cache (see tally_testdata.cache) months it already holds are read
+    back instead of generated, and newly generated months are added to it.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    shards = get_month_shards(get_date_range(profile))
+    run_key = cache.run_key(profile, seed, rows) if cache else None
+
+    def finish(dates, shard):
+        if isinstance(shard, list):
+            return shard
+        fragments = shard.result()
+        if profiling.active:
+            fragments, stages = fragments
+            profiling.active.merge(stages)
+        if cache:
+            cache.store(run_key, dates, fragments)
+        return fragments
+
+    pending = deque()
+    pool = None
+    try:
+        # Keep a bounded window of shards in flight so finished months
+        # don't pile up in memory while earlier ones are still running
+        for dates in shards:
+            shard = cache.load(run_key, dates) if cache else None
+            if shard is None:
+                if workers == 1:
+                    shard = generate_shard(dates, seed, renderer, profile, rows)
+                    if cache:
+                        cache.store(run_key, dates, shard)
+                else:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                                   initargs=(profile,))
+                    if profiling.active:
+                        # Time the shard in the worker and bring its counters back
+                        shard = pool.submit(profiling.run_profiled, generate_shard, dates, seed,
+                                            renderer, None, rows)
+                    else:
+                        shard = pool.submit(generate_shard, dates, seed, renderer, None, rows)
+            pending.append((dates, shard))
+            if len(pending) >= workers * 2:
+                yield from finish(*pending.popleft())
+        while pending:
+            yield from finish(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def iter_rendered_vouchers(profile, workers=1, seed=None, renderer="template", cache=None,
+                           voucher_counters=None, sink=None):
+    """Yield (voucher_type, date, number, text) for every voucher in date order
+
+    voucher_counters gives the first number of each voucher type (default 1).
+    sink (a tables.TableWriter) gets each voucher's table row, numbered
+    like the text.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    counters = dict.fromkeys(profile.VOUCHER_WEIGHTS, 1)
+    counters.update(voucher_counters or {})
+
+    if workers > 1 or cache is not None:
+        # Shards number their vouchers from 1; renumber so each type stays contiguous
+        for fragment in iter_shard_vouchers(profile, workers, seed, renderer, cache,
+                                            rows=sink is not None):
+            voucher_type, date, head, tail = fragment[:4]
+            voucher_num = counters[voucher_type]
+            counters[voucher_type] = voucher_num + 1
+            if sink is not None:
+                sink.add(voucher_type, date, voucher_num, fragment[4])
+            yield voucher_type, date, voucher_num, f"{head}<VOUCHERNUMBER>{voucher_num}</VOUCHERNUMBER>{tail}"
+    else:
+        from tally_testdata.tables import ledger_tax_types, table_row
+
+        tax_types = ledger_tax_types(profile) if sink is not None else None
+        render = profiling.renderer(renderer)
+        for record in iter_vouchers(profile, voucher_counters=counters, seed=seed):
+            if sink is not None:
+                sink.add(record[0], record[1], record[2], table_row(record, tax_types))
+            yield record[0], record[1], record[2], render(*record)
+
+def write_vouchers(profile, output_file, workers=1, seed=None, renderer="template",
+                   split=None, split_limit=None, level=None, cache=None, index=False, tables=None,
+                   progress=None):
+    """Stream vouchers to output_file without building the whole document
+
+    With the same seed the output is byte-identical for any worker count
+    and either renderer. split ("month", "vouchers" or "size", with
+    split_limit vouchers or bytes per file) writes a complete ENVELOPE per
+    part plus a manifest (see tally_testdata.output). A .gz or .zst
+    output_file is compressed while it is written, at the given level.
+    cache (a tally_testdata.cache.ShardCache) reuses months generated by
+    earlier runs with the same inputs. index=True writes a sidecar index
+    next to each file (see tally_testdata.index). tables (a
+    tables.TableWriter) receives the vouchers and ledger entries tables
+    from the same records; the caller closes it. progress(n) is called
+    after every PROGRESS_INTERVAL vouchers written, with that count.
+
+    Returns (total vouchers, total bytes, list of parts written).
+    """
+    from tally_testdata.output import VoucherWriter, write_manifest
+
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    prologue, epilogue = envelope_parts(profile)
+
+    writer = VoucherWriter(output_file, prologue, epilogue, split=split, limit=split_limit, level=level,
+                           index=index)
+    write = profiling.counted(writer.write)
+    total_vouchers = 0
+    for voucher_type, date, number, text in iter_rendered_vouchers(profile, workers, seed, renderer,
+                                                                   cache, sink=tables):
+        write(voucher_type, date, number, text)
+        total_vouchers += 1
+        if progress is not None and total_vouchers % PROGRESS_INTERVAL == 0:
+            progress(PROGRESS_INTERVAL)
+    parts = writer.close()
+    if progress is not None:
+        progress(total_vouchers % PROGRESS_INTERVAL)
+
+    if split is not None:
+        write_manifest(output_file, parts, company=profile.COMPANY_NAME, seed=seed,
+                       split=split, split_limit=split_limit, vouchers=total_vouchers)
+
+    return total_vouchers, sum(part["bytes"] for part in parts), parts
+
+def append_vouchers(profile, output_file, workers=1, seed=None, renderer="template", cache=None):
+    """Extend an existing vouchers file in place up to profile.END_DATE
+
+    Only the end of the file is read (see output.scan_tail()): new vouchers
+    start the day after its last voucher, continue each type's numbering
+    and are written before the closing </REQUESTDATA>, leaving everything
+    before it untouched. The new dates are generated exactly as a fresh run
+    over them would be (the same seed gives the same vouchers).
+
+    Returns (vouchers added, bytes added, first new date), or (0, 0, None)
+    with the file untouched when no business day is left up to END_DATE.
+    """
+    from tally_testdata.output import append_output, scan_tail
+
+    end, last_date, numbers = scan_tail(output_file, profile.VOUCHER_WEIGHTS)
+    start = profile.START_DATE if last_date is None else max(profile.START_DATE, last_date + timedelta(days=1))
+    new_profile = SimpleNamespace(**dict(vars(profile), START_DATE=start))
+    dates = get_date_range(new_profile)
+    if not dates:
+        return 0, 0, None
+
+    voucher_counters = {voucher_type: number + 1 for voucher_type, number in numbers.items()}
+    total_vouchers = 0
+    size = 0
+    with append_output(output_file, end) as f:
+        write = profiling.counted(f.write)
+        for _, _, _, text in iter_rendered_vouchers(new_profile, workers, seed, renderer, cache,
+                                                    voucher_counters):
+            data = text.encode("utf-8")
+            write(data)
+            total_vouchers += 1
+            size += len(data)
+    return total_vouchers, size, dates[0]
+
+def check_renderers(records):
+    """Check render_voucher() against the ElementTree path
+
+    Renders every record through both renderers; raises ValueError on the
+    first difference and returns the number of vouchers compared.
+    """
+    checked = 0
+    for record in records:
+        expected = render_voucher_etree(*record)
+        actual = render_voucher(*record)
+        if actual != expected:
+            raise ValueError(f"render_voucher() differs for {record[0]} {record[2]}:\n"
+                             f"--- etree\n{expected}--- template\n{actual}")
+        checked += 1
+    return checked
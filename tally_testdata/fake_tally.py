@@ -0,0 +1,178 @@
+"""
+Local stand-in for Tally's HTTP XML interface
+
+Accepts the same Import Data ENVELOPEs Tally Prime does (POST to any path,
+default port 9000) and answers in Tally's response format, so the loader
+(tally_testdata.load) can be exercised and timed without a Tally
+installation. Like Tally it imports one request at a time. Each voucher
+can be checked with the streaming validator (give --masters); vouchers
+that fail are counted under ERRORS with a LINEERROR each, the rest under
+CREATED.
+
+    python -m tally_testdata.fake_tally --port 9000 --masters companies/trading-company/masters.xml
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tally_testdata import engine, importlog, validate
+
+VOUCHER_RE = re.compile(rb"<VOUCHER[\s>].*?</VOUCHER>", re.S)
+MASTER_RE = re.compile(rb"<(?:LEDGER|STOCKITEM|UNIT|GODOWN|COSTCENTRE|COSTCATEGORY) NAME=")
+FIELD_RE = re.compile(rb"<(VOUCHERTYPENAME|DATE|VOUCHERNUMBER)>([^<]*)<")
+
+RESPONSE_HEAD = """<ENVELOPE>
+ <HEADER>
+  <VERSION>1</VERSION>
+  <STATUS>1</STATUS>
+ </HEADER>
+ <BODY>
+  <DATA>
+   <IMPORTRESULT>
+    <CREATED>%d</CREATED>
+    <ALTERED>0</ALTERED>
+    <DELETED>0</DELETED>
+    <LASTVCHID>%d</LASTVCHID>
+    <LASTMID>%d</LASTMID>
+    <COMBINED>0</COMBINED>
+    <IGNORED>0</IGNORED>
+    <ERRORS>%d</ERRORS>
+    <CANCELLED>0</CANCELLED>
+    <EXCEPTIONS>0</EXCEPTIONS>
+"""
+LINE_ERROR = "    <LINEERROR>%s</LINEERROR>\n"
+RESPONSE_TAIL = """   </IMPORTRESULT>
+  </DATA>
+ </BODY>
+</ENVELOPE>
+"""
+
+def voucher_label(body):
+    """Describe a voucher the way Tally's import errors do"""
+    fields = {k: validate.text_value(v) for k, v in FIELD_RE.findall(body)}
+    date = fields.get(b"DATE", "")
+    if len(date) == 8:
+        date = f"{date[6:]}-{date[4:6]}-{date[:4]}"
+    return (f"Voucher Type: {fields.get(b'VOUCHERTYPENAME', '')}, "
+            f"Voucher Number: {fields.get(b'VOUCHERNUMBER', '')}, Date: {date}")
+
+class FakeTally(ThreadingHTTPServer):
+    """HTTP server answering Import Data requests like Tally
+
+    latency is seconds of "import" time per voucher, plus entry_latency per
+    ledger entry and inventory line (so bigger vouchers import slower);
+    fail_rate is the share of requests answered with 503 instead, to
+    exercise retries.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, validator=None, latency=0.0, fail_rate=0.0, verbose=False,
+                 entry_latency=0.0):
+        super().__init__(address, TallyHandler)
+        self.validator = validator
+        self.latency = latency
+        self.entry_latency = entry_latency
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        self.rng = random.Random(0)
+        self.lock = threading.Lock()
+        self.last_voucher_id = 0
+        self.last_master_id = 0
+        self.requests = 0
+
+    def import_envelope(self, data):
+        """Import one request body; returns the response XML text"""
+        with self.lock:
+            self.requests += 1
+            masters = len(MASTER_RE.findall(data))
+            created = masters
+            errors = []
+            for match in VOUCHER_RE.finditer(data):
+                body = match.group()
+                if self.validator is not None:
+                    count = self.validator.error_count
+                    self.validator.check_voucher("request", match.start(), body)
+                    if self.validator.error_count > count:
+                        # The checks' messages for this voucher, in Tally's wording
+                        messages = [error[4] for error in self.validator.errors]
+                        self.validator.errors.clear()
+                        errors.append(f"{'; '.join(messages) or 'Invalid voucher'}! ({voucher_label(body)})")
+                        continue
+                created += 1
+                self.last_voucher_id += 1
+            self.last_master_id += masters
+            if self.latency or self.entry_latency:
+                entries = data.count(b"<ALLLEDGERENTRIES.LIST>") + sum(
+                    data.count(tag.encode()) for tag in importlog.INVENTORY_ENTRY_TAGS)
+                time.sleep(self.latency * (created + len(errors)) + self.entry_latency * entries)
+
+            parts = [RESPONSE_HEAD % (created, self.last_voucher_id, self.last_master_id, len(errors))]
+            parts.extend(LINE_ERROR % engine.escape_text(message) for message in errors)
+            parts.append(RESPONSE_TAIL)
+            return "".join(parts)
+
+class TallyHandler(BaseHTTPRequestHandler):
+    """Answer POSTed envelopes; keeps connections alive like Tally"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits for the client's delayed ACK, adding 40 ms to every request
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.fail_rate and self.server.rng.random() < self.server.fail_rate:
+            self.send_reply(503, "<RESPONSE>Busy</RESPONSE>\n")
+            return
+        self.send_reply(200, self.server.import_envelope(data))
+
+    def send_reply(self, status, text):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stand-in for Tally's HTTP XML import interface")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=9000, help="port to listen on (default: 9000)")
+    parser.add_argument("--masters", help="masters.xml to validate vouchers against (default: accept all)")
+    parser.add_argument("--state", help="company state for the GST interstate check")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated import time per voucher in milliseconds (default: 0)")
+    parser.add_argument("--entry-latency-ms", type=float, default=0.0,
+                        help="simulated import time per ledger entry and inventory line (default: 0)")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="share of requests answered 503, to test retries (default: 0)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    validator = None
+    if args.masters:
+        ledgers, party_states, tax_types = validate.load_masters(args.masters)
+        validator = validate.VoucherValidator(ledgers, party_states, tax_types, args.state)
+
+    server = FakeTally((args.host, args.port), validator, args.latency_ms / 1000, args.fail_rate,
+                       args.verbose, args.entry_latency_ms / 1000)
+    print(f"Stand-in Tally listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"✓ {server.requests} requests, {server.last_voucher_id} vouchers created")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Import responses and throughput report
+
+Tally answers every Import Data request with counts (CREATED, ALTERED,
+ERRORS, ...) and one LINEERROR per rejected voucher. parse_response() reads
+those, match_errors() maps each LINEERROR back to the VOUCHERTYPENAME,
+VOUCHERNUMBER and DATE of a voucher in the batch, and ImportReport adds up
+batches into a report of vouchers/sec per batch, per voucher type and per
+voucher shape (type, ledger entries, inventory lines).
+
+Tally only times whole requests, so the seconds per shape are estimated by
+non-negative least squares over the batches: each batch's time is modelled
+as a fixed cost per request plus a cost per voucher of each shape it holds.
+The more batches (and the more their mix varies) the better the estimate.
+Requests waiting for each other inflate it, so time with --concurrency 1.
+The seconds per voucher type are each batch's measured time split between
+its vouchers in proportion to those estimates, so they add up to the
+measured total.
+
+The loader writes one JSON line per batch with --log, which this module
+turns into the report:
+
+    python -m tally_testdata.load companies/trading-company --batch-size 50 --log load-log.jsonl
+    python -m tally_testdata.importlog load-log.jsonl -o import-report.json
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+
+# Counts in Tally's response (<RESPONSE> in Tally.ERP 9, <IMPORTRESULT> in Tally Prime)
+COUNT_RE = re.compile(rb"<(CREATED|ALTERED|DELETED|IGNORED|ERRORS|CANCELLED|EXCEPTIONS)>\s*(-?\d+)\s*<")
+LINE_ERROR_RE = re.compile(rb"<LINEERROR>([^<]*)</LINEERROR>")
+
+# The voucher a LINEERROR names, when it names one
+ERROR_TYPE_RE = re.compile(r"Voucher Type:\s*'?([^,']+?)'?\s*(?:,|$)")
+ERROR_NUMBER_RE = re.compile(r"Voucher (?:Number|No\.?):\s*'?([^,')\s]+)")
+
+# Voucher tags counted to tell voucher shapes apart
+LEDGER_ENTRY_TAG = "<ALLLEDGERENTRIES.LIST>"
+# Invoice lines, and stock journal lines going in and out
+INVENTORY_ENTRY_TAGS = ("<ALLINVENTORYENTRIES.LIST>", "<INVENTORYENTRIESIN.LIST>", "<INVENTORYENTRIESOUT.LIST>")
+
+def parse_response(data):
+    """Return ({count name: value}, [LINEERROR text]) from a Tally import response"""
+    counts = {name.decode().lower(): int(value) for name, value in COUNT_RE.findall(data)}
+    errors = [html.unescape(text.decode("utf-8")) for text in LINE_ERROR_RE.findall(data)]
+    return counts, errors
+
+def voucher_info(voucher_type, date, number, text):
+    """Return the [voucher_type, YYYYMMDD, number, ledger entries, inventory lines] a batch keeps"""
+    if not isinstance(date, str):
+        date = date.strftime("%Y%m%d")
+    items = sum(text.count(tag) for tag in INVENTORY_ENTRY_TAGS)
+    return [voucher_type, date, str(number), text.count(LEDGER_ENTRY_TAG), items]
+
+def shape_of(info):
+    """Return the shape label of a voucher, e.g. "Sales, 5 entries, 2 items" """
+    voucher_type, _, _, entries, items = info
+    label = f"{voucher_type}, {entries} entries"
+    return f"{label}, {items} items" if items else label
+
+def match_errors(vouchers, errors):
+    """Pair each LINEERROR with the voucher info it refers to (None if it can't be told)
+
+    An error naming a voucher number (and type) is matched to that voucher
+    in the batch; an error from a one-voucher batch can only be about it.
+    """
+    by_number = {}
+    for info in vouchers:
+        by_number.setdefault(info[2], []).append(info)
+    matched = []
+    for message in errors:
+        voucher = None
+        number = ERROR_NUMBER_RE.search(message)
+        if number and number.group(1) in by_number:
+            candidates = by_number[number.group(1)]
+            voucher_type = ERROR_TYPE_RE.search(message)
+            if voucher_type:
+                candidates = [info for info in candidates if info[0] == voucher_type.group(1).strip()]
+            voucher = candidates[0] if candidates else None
+        elif len(vouchers) == 1:
+            voucher = vouchers[0]
+        matched.append((voucher, message))
+    return matched
+
+def solve(matrix, vector):
+    """Solve a small dense linear system by Gaussian elimination with partial pivoting"""
+    n = len(vector)
+    rows = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        if rows[col][col] == 0:
+            continue
+        for r in range(n):
+            if r != col and rows[r][col]:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+    return [row[n] / row[i] if row[i] else 0.0 for i, row in enumerate(rows)]
+
+def nnls(normal, target, tolerance=1e-12):
+    """Minimize |Ax - b| subject to x >= 0, given normal = A'A and target = A'b
+
+    The Lawson-Hanson active set method: the unknowns held at zero are
+    freed one at a time, most promising first, and the unconstrained
+    solution over the free ones is walked back whenever it turns negative.
+    """
+    n = len(target)
+    x = [0.0] * n
+    free = []
+
+    def gradient():
+        return [target[i] - sum(normal[i][j] * x[j] for j in range(n)) for i in range(n)]
+
+    def solve_free():
+        values = solve([[normal[i][j] for j in free] for i in free], [target[i] for i in free])
+        s = [0.0] * n
+        for i, value in zip(free, values):
+            s[i] = value
+        return s
+
+    for _ in range(3 * n):
+        w = gradient()
+        held = [i for i in range(n) if i not in free]
+        if not held:
+            break
+        best = max(held, key=lambda i: w[i])
+        if w[best] <= tolerance:
+            break
+        free.append(best)
+        s = solve_free()
+        while free and min(s[i] for i in free) <= 0:
+            # Step towards s until the first free unknown reaches zero, and hold it there
+            alpha = min(x[i] / (x[i] - s[i]) if x[i] > s[i] else 0.0 for i in free if s[i] <= 0)
+            x = [a + alpha * (b - a) for a, b in zip(x, s)]
+            free = [i for i in free if x[i] > tolerance]
+            s = solve_free()
+        x = s
+    return [max(value, 0.0) for value in x]
+
+def estimate_costs(batches, shapes):
+    """Estimate seconds per voucher of each shape from (shape counts, seconds) batches
+
+    Returns ({shape: seconds per voucher}, seconds per request).
+    Non-negative least squares with a little ridge damping, so shapes that
+    always occur together still get a share.
+    """
+    index = {shape: i for i, shape in enumerate(shapes)}
+    n = len(shapes) + 1  # the last unknown is the fixed cost per request
+    normal = [[0.0] * n for _ in range(n)]
+    target = [0.0] * n
+    for counts, seconds in batches:
+        cells = [(index[shape], count) for shape, count in counts.items()] + [(n - 1, 1)]
+        for i, a in cells:
+            target[i] += a * seconds
+            for j, b in cells:
+                normal[i][j] += a * b
+    damping = 1e-6 * (sum(normal[i][i] for i in range(n)) / n if n else 0)
+    for i in range(n):
+        normal[i][i] += damping
+    costs = nnls(normal, target)
+    return dict(zip(shapes, costs)), costs[-1]
+
+def split_seconds(batches, costs):
+    """Split each batch's measured seconds between its shapes; returns {shape: seconds}
+
+    Shares follow the estimated cost of the shape's vouchers in the batch
+    (by voucher count where nothing has a cost), so the request overhead is
+    spread over the vouchers and the result adds up to the measured total.
+    """
+    seconds = {}
+    for counts, measured in batches:
+        weights = {shape: costs[shape] * count for shape, count in counts.items()}
+        total = sum(weights.values())
+        if not total:
+            weights, total = counts, sum(counts.values())
+        for shape, weight in weights.items():
+            if total:
+                seconds[shape] = seconds.get(shape, 0.0) + measured * weight / total
+    return seconds
+
+class ImportReport:
+    """Import results added up batch by batch"""
+
+    def __init__(self):
+        self.batches = []
+        self.failed = []
+        self.totals = {}
+        self.shape_types = {}
+
+    def add_batch(self, vouchers, counts, errors, seconds, attempts=1):
+        """Record one batch: voucher_info() lists, parsed response and request time"""
+        number = len(self.batches) + 1
+        for name, value in counts.items():
+            self.totals[name] = self.totals.get(name, 0) + value
+        matched = match_errors(vouchers, errors)
+        for voucher, message in matched:
+            self.failed.append({
+                "batch": number,
+                "voucher_type": voucher[0] if voucher else None,
+                "date": voucher[1] if voucher else None,
+                "number": voucher[2] if voucher else None,
+                "shape": shape_of(voucher) if voucher else None,
+                "message": message,
+            })
+        shapes = {}
+        for info in vouchers:
+            shape = shape_of(info)
+            shapes[shape] = shapes.get(shape, 0) + 1
+            self.shape_types[shape] = info[0]
+        self.batches.append({
+            "batch": number,
+            "vouchers": len(vouchers),
+            "first": vouchers[0][:3] if vouchers else None,
+            "last": vouchers[-1][:3] if vouchers else None,
+            "created": counts.get("created", 0),
+            "altered": counts.get("altered", 0),
+            "errors": counts.get("errors", 0),
+            "seconds": round(seconds, 4),
+            "attempts": attempts,
+            "vouchers_per_sec": round(len(vouchers) / seconds, 1) if seconds else None,
+            "shapes": shapes,
+        })
+        return matched
+
+    def report(self):
+        """Return the report as a JSON-ready dict"""
+        shapes = sorted({shape for batch in self.batches for shape in batch["shapes"]})
+        timed = [(batch["shapes"], batch["seconds"]) for batch in self.batches]
+        costs, request_cost = estimate_costs(timed, shapes)
+        shape_seconds = split_seconds(timed, costs)
+
+        by_shape = {shape: {"shape": shape, "vouchers": 0, "errors": 0} for shape in shapes}
+        for batch in self.batches:
+            for shape, count in batch["shapes"].items():
+                by_shape[shape]["vouchers"] += count
+        by_type = {}
+        for shape, row in by_shape.items():
+            voucher_type = self.shape_types[shape]
+            type_row = by_type.setdefault(voucher_type, {"voucher_type": voucher_type, "vouchers": 0,
+                                                         "errors": 0, "seconds": 0.0})
+            type_row["vouchers"] += row["vouchers"]
+            type_row["seconds"] += shape_seconds.get(shape, 0.0)
+            row["seconds_per_voucher"] = round(costs[shape], 6)
+            row["vouchers_per_sec"] = round(1 / costs[shape], 1) if costs[shape] else None
+        for failure in self.failed:
+            if failure["shape"] in by_shape:
+                by_shape[failure["shape"]]["errors"] += 1
+                by_type[failure["voucher_type"]]["errors"] += 1
+        for row in by_type.values():
+            row["vouchers_per_sec"] = round(row["vouchers"] / row["seconds"], 1) if row["seconds"] else None
+            row["seconds"] = round(row["seconds"], 4)
+
+        vouchers = sum(batch["vouchers"] for batch in self.batches)
+        seconds = sum(batch["seconds"] for batch in self.batches)
+        return {
+            "totals": dict(self.totals, batches=len(self.batches), vouchers=vouchers,
+                           seconds=round(seconds, 4),
+                           vouchers_per_sec=round(vouchers / seconds, 1) if seconds else None,
+                           seconds_per_request=round(request_cost, 6)),
+            "batches": [{k: v for k, v in batch.items() if k != "shapes"}
+                        for batch in self.batches],
+            "voucher_types": sorted(by_type.values(), key=lambda row: -row["seconds"]),
+            "shapes": sorted(by_shape.values(), key=lambda row: -row["seconds_per_voucher"]),
+            "failed": self.failed,
+        }
+
+def format_rate(rate, width=9):
+    """Return a vouchers/sec figure right-aligned in width, or "-" where no time was measured"""
+    return f"{rate:>{width}.0f}/s" if rate else f"{'-':>{width}}  "
+
+def format_report(report, slowest=10, max_failed=50):
+    """Return the report as printable lines"""
+    totals = report["totals"]
+    rate = f"{totals['vouchers_per_sec']:.0f}" if totals["vouchers_per_sec"] else "-"
+    lines = [f"{totals['vouchers']} vouchers in {totals['batches']} batches, {totals['seconds']:.1f}s of "
+             f"requests ({rate} vouchers/sec): "
+             f"{totals.get('created', 0)} created, {totals.get('altered', 0)} altered, "
+             f"{totals.get('errors', 0)} errors"]
+
+    lines.append("\nBy voucher type (most import time first, batch times split by the estimates):")
+    for row in report["voucher_types"]:
+        lines.append(f"  {row['voucher_type']:<16} {row['vouchers']:>8} vouchers  {row['seconds']:>8.2f}s  "
+                     f"{format_rate(row['vouchers_per_sec'])}  {row['errors']:>6} errors")
+
+    lines.append(f"\nSlowest voucher shapes (estimated, after {totals['seconds_per_request'] * 1000:.1f} ms "
+                 f"per request):")
+    for row in report["shapes"][:slowest]:
+        lines.append(f"  {row['shape']:<36} {row['vouchers']:>8} vouchers  "
+                     f"{row['seconds_per_voucher'] * 1000:>8.3f} ms each  {row['errors']:>6} errors")
+
+    batches = sorted(report["batches"], key=lambda batch: batch["vouchers_per_sec"] or float("inf"))
+    lines.append("\nSlowest batches:")
+    for batch in batches[:slowest]:
+        first = batch["first"] or ["", "", ""]
+        lines.append(f"  #{batch['batch']:<6} {batch['vouchers']:>6} vouchers  {batch['seconds']:>8.3f}s  "
+                     f"{format_rate(batch['vouchers_per_sec'])}  from {first[0]} #{first[2]} ({first[1]})"
+                     + (f"  {batch['attempts']} attempts" if batch["attempts"] > 1 else ""))
+
+    if report["failed"]:
+        lines.append("\nFailed vouchers:")
+        for failure in report["failed"][:max_failed]:
+            if failure["voucher_type"]:
+                where = f"{failure['voucher_type']} #{failure['number']} ({failure['date']})"
+            else:
+                where = f"batch {failure['batch']}"
+            lines.append(f"  {where}: {failure['message']}")
+        if len(report["failed"]) > max_failed:
+            lines.append(f"  ... {len(report['failed']) - max_failed} more")
+    return lines
+
+def log_line(vouchers, counts, errors, seconds, attempts):
+    """Return one batch as a line of the loader's --log file"""
+    return json.dumps({"vouchers": vouchers, "counts": counts, "errors": errors,
+                       "seconds": round(seconds, 6), "attempts": attempts}) + "\n"
+
+def read_log(path):
+    """Build an ImportReport from a loader --log file"""
+    report = ImportReport()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                batch = json.loads(line)
+                report.add_batch(batch["vouchers"], batch["counts"], batch["errors"], batch["seconds"],
+                                 batch.get("attempts", 1))
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import throughput and failures from a loader log")
+    parser.add_argument("log", help="JSON lines written by python -m tally_testdata.load --log")
+    parser.add_argument("-o", "--output", help="also write the full report as JSON")
+    parser.add_argument("--top", type=int, default=10, help="slowest shapes and batches to list (default: 10)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = read_log(args.log).report()
+    except (OSError, ValueError, KeyError) as e:
+        sys.exit(f"✗ Cannot read {args.log}: {e}")
+    for line in format_report(report, args.top):
+        print(line)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"✓ Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Sidecar index and random-access reader for voucher files
+
+A voucher file's index (vouchers.xml.idx next to it) records where every
+<VOUCHER> starts and ends, with its type, number and date and the ledgers
+it posts to, so a query like "all vouchers for party X in March 2024" or
+"Sales 4521" reads just those vouchers instead of parsing the whole file.
+The index is written alongside the vouchers (--index) or built later in
+one streaming pass; VoucherFile maps the file into memory and parses only
+the fragments a query asks for.
+
+The index is a JSON header line followed by flat arrays (see INDEX_ARRAYS):
+byte offset, length, type, number and date per voucher, then the vouchers
+of each ledger one ledger after another. It only indexes uncompressed files
+(a compressed one can't be mapped), and it is tied to the file's size and
+modification time: changing the file makes it stale.
+
+    python -m tally_testdata.index vouchers.xml --build
+    python -m tally_testdata.index vouchers.xml --type Sales --number 4521
+    python -m tally_testdata.index vouchers.xml --ledger "Acme Electronics" --from 2024-03-01 --to 2024-03-31
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from array import array
+
+from tally_testdata import output, synthetic, validate
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+# (name, array typecode) of each array after the header, in file order
+INDEX_ARRAYS = (
+    ("offsets", "q"),   # byte offset of "<VOUCHER"
+    ("lengths", "L"),   # bytes up to and including "</VOUCHER>"
+    ("types", "H"),     # position in header["voucher_types"]
+    ("numbers", "q"),   # VOUCHERNUMBER, or -1 when it isn't a whole number
+    ("dates", "L"),     # DATE as the integer YYYYMMDD
+    ("postings", "L"),  # voucher positions, grouped by ledger (see header["ledger_counts"])
+)
+
+LEDGER_NAME_RE = re.compile(rb"<LEDGERNAME>([^<]*)</LEDGERNAME>")
+
+def index_path(path):
+    """Return the sidecar index file for a voucher file"""
+    return path + INDEX_SUFFIX
+
+def file_stamp(path):
+    """Return the (size, mtime in ns) an index is valid for"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+class IndexBuilder:
+    """Collect voucher positions for one file, then write its index"""
+
+    def __init__(self):
+        self.offsets = array("q")
+        self.lengths = array("L")
+        self.types = array("H")
+        self.numbers = array("q")
+        self.dates = array("L")
+        self.type_ids = {}
+        self.ledger_ids = {}
+        self.ledger_vouchers = []
+        self.text_numbers = {}
+
+    def add(self, offset, data, voucher_type, date, number):
+        """Record one voucher; data is its bytes as written at offset, indentation and all"""
+        start = data.find(b"<VOUCHER")
+        end = data.rfind(validate.VOUCHER_END) + len(validate.VOUCHER_END)
+        position = len(self.offsets)
+        self.offsets.append(offset + start)
+        self.lengths.append(end - start)
+
+        type_id = self.type_ids.get(voucher_type)
+        if type_id is None:
+            type_id = self.type_ids[voucher_type] = len(self.type_ids)
+        self.types.append(type_id)
+        number = str(number)
+        if number.isdigit():
+            self.numbers.append(int(number))
+        else:
+            self.numbers.append(-1)
+            self.text_numbers[position] = number
+        self.dates.append(int(date) if isinstance(date, (str, bytes)) else
+                          date.year * 10000 + date.month * 100 + date.day)
+
+        # A voucher posts to each ledger once in the index, however many entries
+        seen = set()
+        for raw in LEDGER_NAME_RE.findall(data, start):
+            if raw in seen:
+                continue
+            seen.add(raw)
+            ledger_id = self.ledger_ids.get(raw)
+            if ledger_id is None:
+                ledger_id = self.ledger_ids[raw] = len(self.ledger_vouchers)
+                self.ledger_vouchers.append(array("L"))
+            self.ledger_vouchers[ledger_id].append(position)
+
+    def write(self, path):
+        """Write the index for the voucher file at path (after it is complete)"""
+        size, mtime_ns = file_stamp(path)
+        postings = array("L")
+        for vouchers in self.ledger_vouchers:
+            postings.extend(vouchers)
+        arrays = {"offsets": self.offsets, "lengths": self.lengths, "types": self.types,
+                  "numbers": self.numbers, "dates": self.dates, "postings": postings}
+        header = {
+            "version": INDEX_VERSION,
+            "file_size": size,
+            "file_mtime_ns": mtime_ns,
+            "vouchers": len(self.offsets),
+            "voucher_types": list(self.type_ids),
+            "ledgers": [validate.text_value(raw) for raw in self.ledger_ids],
+            "ledger_counts": [len(vouchers) for vouchers in self.ledger_vouchers],
+            "text_numbers": self.text_numbers,
+            "dates_sorted": all(a <= b for a, b in zip(self.dates, self.dates[1:])),
+            "arrays": {name: [code, arrays[name].itemsize, len(arrays[name])]
+                       for name, code in INDEX_ARRAYS},
+        }
+        temp = f"{index_path(path)}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for name, _ in INDEX_ARRAYS:
+                arrays[name].tofile(f)
+        os.replace(temp, index_path(path))
+        return index_path(path)
+
+def build_index(path):
+    """Index an existing voucher file in one streaming pass; returns the index path"""
+    if output.compression_for(path):
+        raise ValueError(f"cannot index compressed file {path}: random access needs plain XML")
+    builder = IndexBuilder()
+    pending = b""
+    offset = 0  # file offset of pending[0]
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(validate.CHUNK_SIZE)
+            if not chunk:
+                break
+            data = pending + chunk
+            end = 0
+            while True:
+                close = data.find(validate.VOUCHER_END, end)
+                if close < 0:
+                    break
+                match = validate.VOUCHER_START_RE.search(data, end, close)
+                next_end = close + len(validate.VOUCHER_END)
+                if match:
+                    body = data[match.start():next_end]
+                    fields = dict(validate.FIELD_RE.findall(body))
+                    builder.add(offset + match.start(), body,
+                                validate.text_value(fields.get(b"VOUCHERTYPENAME", b"")),
+                                fields.get(b"DATE", b"0").decode() or "0",
+                                validate.text_value(fields.get(b"VOUCHERNUMBER", b"")))
+                end = next_end
+            pending = data[end:]
+            offset += end
+    return builder.write(path)
+
+def date_key(date):
+    """Return a datetime (or None) as the integer YYYYMMDD the index stores"""
+    return None if date is None else date.year * 10000 + date.month * 100 + date.day
+
+class VoucherFile:
+    """Random access to the vouchers of a file through its index
+
+    Positions are the vouchers' order in the file. Only the vouchers asked
+    for are read (through mmap) and parsed.
+    """
+
+    def __init__(self, path, build=False):
+        self.path = path
+        idx = index_path(path)
+        if build and (not os.path.exists(idx) or not self._fresh(idx)):
+            build_index(path)
+        self._load(idx)
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._by_number = None
+
+    def _fresh(self, idx):
+        with open(idx, "rb") as f:
+            header = json.loads(f.readline())
+        return (header.get("version") == INDEX_VERSION
+                and (header["file_size"], header["file_mtime_ns"]) == file_stamp(self.path))
+
+    def _load(self, idx):
+        with open(idx, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != INDEX_VERSION:
+                raise ValueError(f"{idx}: unsupported index version {header.get('version')}")
+            if (header["file_size"], header["file_mtime_ns"]) != file_stamp(self.path):
+                raise ValueError(f"{idx} is stale: {self.path} changed since it was indexed "
+                                 f"(rebuild with python -m tally_testdata.index {self.path} --build)")
+            for name, code in INDEX_ARRAYS:
+                _, itemsize, count = header["arrays"][name]
+                values = array(code)
+                if values.itemsize != itemsize:
+                    raise ValueError(f"{idx} was written on a platform with other array sizes")
+                values.fromfile(f, count)
+                setattr(self, name, values)
+        self.header = header
+        self.voucher_types = header["voucher_types"]
+        self.ledgers = {}
+        start = 0
+        for name, count in zip(header["ledgers"], header["ledger_counts"]):
+            self.ledgers[name] = (start, start + count)
+            start += count
+        self.text_numbers = {int(k): v for k, v in header["text_numbers"].items()}
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def raw(self, position):
+        """Return the bytes of one voucher, <VOUCHER> to </VOUCHER>"""
+        offset = self.offsets[position]
+        return self._map[offset:offset + self.lengths[position]]
+
+    def element(self, position):
+        """Parse one voucher into an ElementTree element"""
+        return ET.fromstring(self.raw(position))
+
+    def fields(self, position):
+        """Return (voucher_type, date as YYYYMMDD, number) from the index alone"""
+        number = self.numbers[position]
+        return (self.voucher_types[self.types[position]], str(self.dates[position]),
+                self.text_numbers.get(position, str(number)))
+
+    def find(self, voucher_type, number):
+        """Return the position of a voucher by type and number, or None"""
+        if self._by_number is None:
+            # Built on the first lookup: one dict entry per voucher
+            self._by_number = {}
+            for position, (type_id, value) in enumerate(zip(self.types, self.numbers)):
+                key = self.voucher_types[type_id], self.text_numbers.get(position, str(value))
+                self._by_number.setdefault(key, position)
+        return self._by_number.get((voucher_type, str(number)))
+
+    def date_range(self, start=None, end=None):
+        """Return the positions of vouchers dated from start to end (datetimes, inclusive)"""
+        low, high = date_key(start), date_key(end)
+        if self.header["dates_sorted"]:
+            first = 0 if low is None else bisect.bisect_left(self.dates, low)
+            last = len(self.dates) if high is None else bisect.bisect_right(self.dates, high)
+            return range(first, last)
+        return [position for position, date in enumerate(self.dates)
+                if (low is None or date >= low) and (high is None or date <= high)]
+
+    def ledger_vouchers(self, ledger):
+        """Return the positions of vouchers posting to a ledger (or party), in file order"""
+        start, end = self.ledgers.get(ledger, (0, 0))
+        return self.postings[start:end]
+
+    def query(self, ledger=None, voucher_type=None, start=None, end=None):
+        """Return the positions matching every filter given, in file order"""
+        if ledger is not None:
+            positions = self.ledger_vouchers(ledger)
+            low, high = date_key(start), date_key(end)
+            if low is not None or high is not None:
+                dates = self.dates
+                positions = [p for p in positions
+                             if (low is None or dates[p] >= low) and (high is None or dates[p] <= high)]
+        else:
+            positions = self.date_range(start, end)
+        if voucher_type is not None:
+            if voucher_type not in self.voucher_types:
+                return []
+            type_id = self.voucher_types.index(voucher_type)
+            positions = [p for p in positions if self.types[p] == type_id]
+        return list(positions)
+
+    def vouchers(self, positions):
+        """Yield the parsed voucher at each position"""
+        for position in positions:
+            yield self.element(position)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index a voucher file and read vouchers from it")
+    parser.add_argument("file", help="uncompressed voucher file (vouchers.xml or a split part)")
+    parser.add_argument("--build", action="store_true", help="(re)build the index before reading")
+    parser.add_argument("--type", dest="voucher_type", help="voucher type, e.g. Sales")
+    parser.add_argument("--number", help="voucher number (with --type)")
+    parser.add_argument("--ledger", help="vouchers posting to this ledger or party")
+    parser.add_argument("--from", dest="start", type=synthetic.parse_date, metavar="YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", type=synthetic.parse_date, metavar="YYYY-MM-DD")
+    parser.add_argument("--count", action="store_true", help="print the number of matches only")
+    args = parser.parse_args(argv)
+    if args.number is not None and args.voucher_type is None:
+        parser.error("--number needs --type")
+
+    try:
+        if args.build:
+            build_index(args.file)
+            print(f"✓ Index written to {index_path(args.file)}", file=sys.stderr)
+        vouchers = VoucherFile(args.file)
+    except (OSError, ValueError) as e:
+        sys.exit(f"✗ {e}")
+
+    with vouchers:
+        if args.number is not None:
+            position = vouchers.find(args.voucher_type, args.number)
+            positions = [] if position is None else [position]
+        elif args.voucher_type or args.ledger or args.start or args.end:
+            positions = vouchers.query(args.ledger, args.voucher_type, args.start, args.end)
+        elif args.build:
+            return
+        else:
+            parser.error("give --type/--number, --ledger, --from or --to (or --build)")
+
+        if args.count:
+            print(len(positions))
+            return
+        out = sys.stdout.buffer
+        for position in positions:
+            out.write(vouchers.raw(position))
+            out.write(b"\n")
+        print(f"✓ {len(positions)} of {len(vouchers)} vouchers", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Push vouchers straight to Tally's HTTP XML interface
+
+Instead of writing vouchers.xml and importing it through Gateway of Tally,
+the loader posts the vouchers to Tally's XML server (Tally Prime listens
+on port 9000 when it is enabled) in batches of N vouchers, each a complete
+Import Data ENVELOPE. Vouchers are generated (or read from an existing
+file) while earlier batches are in flight: up to --concurrency requests
+run at once over a pool of keep-alive connections, failed requests are
+retried with exponential backoff, and every response is added to an
+ImportReport (see tally_testdata.importlog) of vouchers/sec per batch,
+voucher type and voucher shape, with each rejected voucher.
+
+    python -m tally_testdata.fake_tally &                   # stand-in, if Tally isn't running
+    python -m tally_testdata.load companies/trading-company --seed 1 --batch-size 500
+    python -m tally_testdata.load vouchers.xml --url http://tally-box:9000 --concurrency 2
+
+Tally answers a request only after importing it, so a retried request may
+already have been imported; Tally then reports the voucher numbers it has
+already seen as errors.
+"""
+
+import argparse
+import http.client
+import os
+import queue
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from tally_testdata import engine, importlog, output, validate
+
+DEFAULT_URL = "http://localhost:9000"
+
+# Responses worth retrying: Tally busy or a proxy in between failing
+RETRY_STATUSES = (429, 502, 503, 504)
+
+class TallyError(Exception):
+    """A request that failed after every retry"""
+
+class ConnectionPool:
+    """Keep-alive HTTP connections to one Tally server, shared between threads"""
+
+    def __init__(self, url, size, timeout=300):
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        self.connection_class = (http.client.HTTPSConnection if parts.scheme == "https"
+                                 else http.client.HTTPConnection)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 9000
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        for _ in range(size):
+            self.idle.put(None)
+
+    def post(self, data):
+        """POST data on an idle connection; returns (status, response body)"""
+        connection = self.idle.get()
+        try:
+            if connection is None:
+                connection = self.connection_class(self.host, self.port, timeout=self.timeout)
+            connection.request("POST", self.path, body=data,
+                               headers={"Content-Type": "text/xml; charset=utf-8"})
+            response = connection.getresponse()
+            body = response.read()
+            if response.will_close:
+                connection.close()
+                connection = None
+            return response.status, body
+        except (OSError, http.client.HTTPException):
+            # Drop the broken connection; the next request opens a fresh one
+            connection.close()
+            connection = None
+            raise
+        finally:
+            self.idle.put(connection)
+
+    def close(self):
+        """Close every idle connection"""
+        while not self.idle.empty():
+            connection = self.idle.get()
+            if connection is not None:
+                connection.close()
+
+class TallyLoader:
+    """Send Import Data envelopes to Tally with bounded concurrency and retries"""
+
+    def __init__(self, url=DEFAULT_URL, concurrency=1, retries=3, backoff=0.5, timeout=300):
+        self.pool = ConnectionPool(url, concurrency, timeout)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.rng = random.Random()
+
+    def send(self, data):
+        """Post one envelope, retrying failures; returns (counts, line errors, seconds, attempts)
+
+        seconds times the successful attempt only: failed attempts and the
+        backoff between them aren't import time.
+        """
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                status, body = self.pool.post(data)
+            except (OSError, http.client.HTTPException) as e:
+                problem = f"{type(e).__name__}: {e}"
+            else:
+                if status == 200:
+                    counts, errors = importlog.parse_response(body)
+                    return counts, errors, time.perf_counter() - start, attempt + 1
+                problem = f"HTTP {status}"
+                if status not in RETRY_STATUSES:
+                    break
+            if attempt < self.retries:
+                # Exponential backoff with jitter, so retrying threads don't collide
+                time.sleep(self.backoff * 2 ** attempt * self.rng.uniform(0.5, 1.5))
+        raise TallyError(f"{problem} after {attempt + 1} attempts")
+
+    def load(self, batches):
+        """Send (vouchers, envelope bytes) batches; yields (vouchers, result) in order
+
+        Only 2 x concurrency batches are held at once, so the source is
+        read no faster than Tally takes them.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                for vouchers, data in batches:
+                    pending.append((vouchers, executor.submit(self.send, data)))
+                    if len(pending) >= self.concurrency * 2:
+                        vouchers, future = pending.popleft()
+                        yield vouchers, future.result()
+                while pending:
+                    vouchers, future = pending.popleft()
+                    yield vouchers, future.result()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+                self.pool.close()
+
+def iter_batches(vouchers, prologue, epilogue, size):
+    """Group (voucher_type, date, number, text) into envelopes of size vouchers
+
+    Yields ([importlog.voucher_info() of each voucher], envelope bytes).
+    """
+    head = prologue.encode("utf-8")
+    tail = epilogue.encode("utf-8")
+    batch = []
+    parts = [head]
+    for voucher_type, date, number, text in vouchers:
+        batch.append(importlog.voucher_info(voucher_type, date, number, text))
+        parts.append(text.encode("utf-8"))
+        if len(batch) == size:
+            parts.append(tail)
+            yield batch, b"".join(parts)
+            batch = []
+            parts = [head]
+    if batch:
+        parts.append(tail)
+        yield batch, b"".join(parts)
+
+def read_envelope(path):
+    """Read a voucher file as (prologue, epilogue, iterator of vouchers)
+
+    The vouchers are (voucher_type, date, number, text) like
+    engine.iter_rendered_vouchers() yields, read in chunks so the file is
+    never held in memory whole.
+    """
+    with validate.open_input(path) as f:
+        data = f.read(validate.CHUNK_SIZE)
+        start = validate.VOUCHER_START_RE.search(data)
+        if start is None:
+            end = data.find(output.REQUESTDATA_END)
+            if end < 0:
+                raise ValueError(f"{path} is not a vouchers file")
+            start = data.rfind(b"\n", 0, end) + 1
+        else:
+            start = data.rfind(b"\n", 0, start.start()) + 1
+    prologue = data[:start].decode("utf-8")
+
+    def vouchers():
+        with validate.open_input(path) as f:
+            f.read(start)
+            pending = b""
+            while True:
+                chunk = f.read(validate.CHUNK_SIZE)
+                data = pending + chunk
+                end = 0
+                while True:
+                    close = data.find(validate.VOUCHER_END, end)
+                    if close >= 0:
+                        close = data.find(b"\n", close) + 1
+                    if close <= 0:
+                        break
+                    text = data[end:close]
+                    fields = output.VOUCHER_FIELDS_RE.search(text)
+                    if fields:
+                        voucher_type, date, number = fields.groups()
+                        yield (validate.text_value(voucher_type), date.decode(), number.decode(),
+                               text.decode("utf-8"))
+                    end = close
+                pending = data[end:]
+                if not chunk:
+                    break
+
+    return prologue, epilogue_of(path), vouchers()
+
+def epilogue_of(path):
+    """Return everything from the line holding </REQUESTDATA> to the end of a voucher file"""
+    if not path.endswith(".gz"):
+        end, _, _ = output.scan_tail(path, ())
+        with open(path, "rb") as f:
+            f.seek(end)
+            return f.read().decode("utf-8")
+    # A gzip stream can't be read from the end: take the standard closing tags
+    return "      </REQUESTDATA>\n    </IMPORTDATA>\n  </BODY>\n</ENVELOPE>\n"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Push vouchers to Tally's HTTP XML interface")
+    parser.add_argument("source", help="company folder to generate vouchers for, or a voucher file to send")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Tally XML server (default: {DEFAULT_URL})")
+    parser.add_argument("--batch-size", type=int, default=200, metavar="N",
+                        help="vouchers per request (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=1, metavar="N",
+                        help="requests in flight at once (default: 1)")
+    parser.add_argument("--retries", type=int, default=3, help="retries per request (default: 3)")
+    parser.add_argument("--backoff", type=float, default=0.5,
+                        help="first retry delay in seconds, doubled each retry (default: 0.5)")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for a response (default: 300)")
+    parser.add_argument("--masters", metavar="FILE", help="send this masters.xml first, in one request")
+    parser.add_argument("--log", metavar="FILE",
+                        help="write each batch's vouchers, response and time as JSON lines "
+                             "(for python -m tally_testdata.importlog)")
+    parser.add_argument("--seed", type=int, help="seed when generating (default: random)")
+    parser.add_argument("--workers", type=int, default=1, help="generator worker processes (default: 1)")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.concurrency < 1 or args.retries < 0:
+        parser.error("--batch-size and --concurrency must be at least 1, --retries at least 0")
+
+    if os.path.isdir(args.source):
+        profile = engine.load_profile(args.source)
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        print(f"Generating vouchers for {profile.COMPANY_NAME} (seed {seed})")
+        prologue, epilogue = engine.envelope_parts(profile)
+        vouchers = engine.iter_rendered_vouchers(profile, args.workers, seed)
+    else:
+        try:
+            prologue, epilogue, vouchers = read_envelope(args.source)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    loader = TallyLoader(args.url, args.concurrency, args.retries, args.backoff, args.timeout)
+    try:
+        if args.masters:
+            with open(args.masters, "rb") as f:
+                counts, errors, seconds, _ = loader.send(f.read())
+            print(f"✓ Masters: {counts.get('created', 0)} created, {counts.get('errors', 0)} errors "
+                  f"({seconds:.1f}s)")
+            for error in errors:
+                print(f"  {error}")
+
+        print(f"Sending to {args.url} in batches of {args.batch_size}, {args.concurrency} at a time")
+        report = importlog.ImportReport()
+        log = open(args.log, "w", encoding="utf-8") if args.log else None
+        sent = 0
+        start = time.perf_counter()
+        try:
+            for batch, (counts, errors, seconds, attempts) in loader.load(
+                    iter_batches(vouchers, prologue, epilogue, args.batch_size)):
+                sent += len(batch)
+                report.add_batch(batch, counts, errors, seconds, attempts)
+                if log:
+                    log.write(importlog.log_line(batch, counts, errors, seconds, attempts))
+                totals = report.totals
+                print(f"\r  {sent} vouchers sent, {totals.get('created', 0)} created, "
+                      f"{totals.get('errors', 0)} errors, {sent / (time.perf_counter() - start):.0f}/s",
+                      end="", flush=True)
+            print()
+        finally:
+            if log:
+                log.close()
+    except TallyError as e:
+        sys.exit(f"\n✗ Request to {args.url} failed: {e}")
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ {sent} vouchers in {elapsed:.1f}s ({sent / elapsed if elapsed else 0:.0f} vouchers/sec)")
+    for line in importlog.format_report(report.report(), slowest=5):
+        print(line)
+    if args.log:
+        print(f"\n✓ Batch log written to {args.log}")
+    if report.totals.get("errors"):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
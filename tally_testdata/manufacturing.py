@@ -0,0 +1,348 @@
+"""
+Production vouchers: Stock Journals and Manufacturing Journals
+
+Profiles with PRODUCTION make their sales items from raw materials. Raw
+materials are bought into the store (PURCHASES["godown"]), issued to the
+production floor (PRODUCTION["godown"]) by Stock Journals, turned into
+finished goods there by Manufacturing Journals, one product at a time from
+its bill of materials (the item's "bom": raw material per batch of "batch"
+units), and moved on to the finished goods godown (SALES["godown"]) by the
+next Stock Journal, ready to be sold.
+
+Everything a voucher needs is looked up by STOCK_ITEMS position in a Plant
+built once per process: each item's name, unit and cost, each product's
+BOM as (component, quantity per batch) pairs, and the stock slot offset of
+every godown. A product costs what its BOM costs, so the two sides of a
+Manufacturing Journal are equal, and stock moves are plain updates of the
+month's StockTracker arrays (see tally_testdata.stock).
+
+Their lines carry stock and no ledger: {"stock", "amount", "godown"},
+positive amounts for stock coming into the godown and negative for stock
+going out, rendered as INVENTORYENTRIESIN.LIST / INVENTORYENTRIESOUT.LIST.
+
+Like purchases, production is adjusted to the stock on hand: products that
+fall below their reorder level are made next, a batch is cut to the
+materials there are (taken from the store when the floor runs short), and
+the month's last business day buys, issues, makes and moves whatever
+brings every item back to its opening level.
+
+A production voucher carries about twice the XML of an invoice, so the
+manufacturing company makes about 20% fewer vouchers per second than the
+trading company but writes more MB per second:
+
+    python -m tally_testdata.bench --companies trading-company,manufacturing-company --paths stream-template --scales 20
+"""
+
+import random
+
+from tally_testdata import engine, stock
+
+STOCK_JOURNAL = "Stock Journal"
+MANUFACTURING_JOURNAL = "Manufacturing Journal"
+
+# Plant per (STOCK_ITEMS, PRODUCTION, SALES, PURCHASES), built once per process
+_plants = {}
+
+class Plant:
+    """Production lookup tables for a profile, indexed by STOCK_ITEMS position"""
+
+    def __init__(self, profile):
+        items = profile.STOCK_ITEMS
+        index = stock.name_index(items)
+        production = profile.PRODUCTION
+        godowns = list(profile.GODOWNS)
+        n = len(items)
+        self.size = n
+        self.godowns = godowns
+        self.store = godowns.index(profile.PURCHASES["godown"])
+        self.floor = godowns.index(production["godown"])
+        self.finished = godowns.index(profile.SALES["godown"])
+        self.products = [index[item["name"]] for item in production["items"]]
+        made = set(self.products)
+        self.materials = [item for item in range(n) if item not in made]
+        self.sellable = [index[item["name"]] for item in profile.SALES["items"]]
+        self.batch_range = production["batches"]
+
+        cost = [item["rate"] * engine.PAISE for item in items]
+        self.batch = [0] * n
+        self.bom = [()] * n
+        usage = [0] * n
+        for item in production["items"]:
+            product = index[item["name"]]
+            bom = []
+            for name, qty in item["bom"].items():
+                component = index.get(name)
+                if component is None or component in made:
+                    raise ValueError(f"{item['name']}: {name} is not a raw material in STOCK_ITEMS")
+                bom.append((component, qty))
+                usage[component] += qty
+            batch_cost = sum(qty * cost[component] for component, qty in bom)
+            if batch_cost % item["batch"]:
+                raise ValueError(f"{item['name']}: a batch of {item['batch']} doesn't cost whole paise per unit")
+            self.bom[product] = tuple(bom)
+            self.batch[product] = item["batch"]
+            cost[product] = batch_cost // item["batch"]
+        self.cost = cost
+        # (name, unit, cost in paise), as inventory lines carry them
+        self.lines = [(item["name"], item.get("unit", engine.DEFAULT_UNIT), cost[i]) for i, item in enumerate(items)]
+
+        # Products keep their SALES levels; raw materials are stocked in
+        # batches' worth of what the products using them need
+        levels = stock.config_levels(profile)
+        raw = production["raw_stock"]
+        for item in self.materials:
+            if usage[item]:
+                levels[item] = (self.store, raw["opening"] * usage[item], raw["reorder_level"] * usage[item],
+                                raw["reorder_quantity"] * usage[item])
+        self.levels = levels
+        # Batches to make when a product is queued
+        self.reorder_batches = [-(-quantity // self.batch[item]) if self.batch[item] else 0
+                                for item, (_, _, _, quantity) in enumerate(levels)]
+
+    def batches_possible(self, levels, product):
+        """Return how many batches of product the floor and store together hold materials for"""
+        floor, store = self.floor * self.size, self.store * self.size
+        return min((levels[floor + component] + levels[store + component]) // qty
+                   for component, qty in self.bom[product])
+
+def get_plant(profile):
+    """Return the Plant for profile (built once per process)"""
+    key = (id(profile.STOCK_ITEMS), id(profile.PRODUCTION), id(profile.SALES), id(profile.PURCHASES))
+    if key not in _plants:
+        # Keep the lists alive so their id() can't be reused by others
+        _plants[key] = ((profile.STOCK_ITEMS, profile.PRODUCTION, profile.SALES, profile.PURCHASES),
+                        Plant(profile))
+    return _plants[key][1]
+
+def inventory_line(plant, item, qty, godown, sign):
+    """Return a stock journal line: qty of item into (sign 1) or out of (sign -1) godown"""
+    name, unit, cost = plant.lines[item]
+    return {"stock": (name, qty, unit, cost), "amount": sign * qty * cost, "godown": plant.godowns[godown]}
+
+def transfer_lines(plant, moves):
+    """Return (entries, narration) moving (item, quantity, from godown, to godown)"""
+    entries = []
+    narration_parts = {}
+    for item, qty, source, destination in moves:
+        entries.append(inventory_line(plant, item, qty, source, -1))
+        entries.append(inventory_line(plant, item, qty, destination, 1))
+        name, unit, _ = plant.lines[item]
+        narration_parts.setdefault(destination, []).append(f"{name} ({qty} {unit})")
+    narration = "; ".join(f"To {plant.godowns[destination]}: {', '.join(parts)}"
+                          for destination, parts in narration_parts.items())
+    return entries, narration
+
+def issue_moves(plant, product, batches):
+    """Return the moves issuing materials for batches of product from the store to the floor"""
+    return [(component, qty * batches, plant.store, plant.floor) for component, qty in plant.bom[product]]
+
+def production_lines(plant, product, batches, from_store=None):
+    """Return (entries, narration) making batches of product on the floor
+
+    Materials come from the floor, except from_store {component: quantity}.
+    """
+    qty = batches * plant.batch[product]
+    entries = [inventory_line(plant, product, qty, plant.floor, 1)]
+    for component, per_batch in plant.bom[product]:
+        needed = per_batch * batches
+        store_qty = from_store.get(component, 0) if from_store else 0
+        if needed > store_qty:
+            entries.append(inventory_line(plant, component, needed - store_qty, plant.floor, -1))
+        if store_qty:
+            entries.append(inventory_line(plant, component, store_qty, plant.store, -1))
+    name, unit, _ = plant.lines[product]
+    return entries, f"Production of {name} ({qty} {unit}, {batches} batch{'es' if batches > 1 else ''})"
+
+def generate_stock_journal(profile, date, voucher_num, rng=random):
+    """Generate a Stock Journal issuing materials for a random product's batches"""
+    plant = get_plant(profile)
+    product = rng.choice(plant.products)
+    batches = rng.randint(*plant.batch_range)
+    entries, narration = transfer_lines(plant, issue_moves(plant, product, batches))
+    return (STOCK_JOURNAL, date, voucher_num, entries, narration)
+
+def generate_manufacturing_journal(profile, date, voucher_num, rng=random):
+    """Generate a Manufacturing Journal making a random product's batches"""
+    plant = get_plant(profile)
+    product = rng.choice(plant.products)
+    batches = rng.randint(*plant.batch_range)
+    entries, narration = production_lines(plant, product, batches)
+    return (MANUFACTURING_JOURNAL, date, voucher_num, entries, narration)
+
+def apply_production(record, tracker, rng):
+    """Move stock for a Stock Journal or Manufacturing Journal, adjusting it to what is on hand
+
+    Other records are returned as they are.
+    """
+    if record[0] == MANUFACTURING_JOURNAL:
+        return manufacture(record, tracker, rng)
+    if record[0] == STOCK_JOURNAL:
+        return transfer(record, tracker, rng)
+    return record
+
+def manufacture(record, tracker, rng):
+    """Make the record's product, or the next queued one, as far as materials allow"""
+    voucher_type, date, number, entries = record[:4]
+    plant = tracker.plant
+    levels = tracker.levels
+    name, qty = entries[0]["stock"][:2]
+    product = tracker.index[name]
+    batches = drawn = qty // plant.batch[product]
+    queued = tracker.next_production()
+    if queued is not None:
+        product, batches = queued, plant.reorder_batches[queued]
+    made = min(batches, plant.batches_possible(levels, product))
+    if not made:
+        # Nothing left for it: make something there are materials for
+        products = plant.products
+        start = rng.randrange(len(products))
+        for k in range(len(products)):
+            product = products[(start + k) % len(products)]
+            made = min(batches, plant.batches_possible(levels, product))
+            if made:
+                break
+        else:
+            raise ValueError("raw materials ran out for every product: raise PRODUCTION raw_stock "
+                             "or the purchase share")
+
+    floor = plant.floor * plant.size
+    from_store = {}
+    for component, per_batch in plant.bom[product]:
+        needed = per_batch * made
+        on_floor = levels[floor + component]
+        if needed > on_floor:
+            from_store[component] = needed - on_floor
+            tracker.take(component, needed - on_floor)
+            needed = on_floor
+        levels[floor + component] -= needed
+    levels[floor + product] += made * plant.batch[product]
+
+    if product == tracker.index[name] and made == drawn and not from_store:
+        return record
+    entries, narration = production_lines(plant, product, made, from_store)
+    return (voucher_type, date, number, entries, narration)
+
+def transfer(record, tracker, rng):
+    """Move finished goods off the floor and issue materials for the next batches
+
+    Materials go out for the next queued product (what is still missing on
+    the floor), or else for the record's own lines, cut to the store's stock.
+    """
+    voucher_type, date, number, entries = record[:4]
+    plant = tracker.plant
+    levels = tracker.levels
+    floor = plant.floor * plant.size
+    moves = []
+    for product in plant.products:
+        qty = levels[floor + product]
+        if qty:
+            levels[floor + product] = 0
+            tracker.put(product, qty)
+            moves.append((product, qty, plant.floor, plant.finished))
+    changed = bool(moves)
+
+    if tracker.production:
+        product = tracker.production[0]
+        batches = plant.reorder_batches[product]
+        picks = [(component, qty * batches - levels[floor + component]) for component, qty in plant.bom[product]]
+        changed = True
+    else:
+        index = tracker.index
+        picks = [(index[entry["stock"][0]], entry["stock"][1]) for entry in entries[::2]]
+    for item, qty in picks:
+        on_hand = tracker.level(item)
+        if qty > on_hand:
+            changed = True
+            qty = on_hand
+        if qty > 0:
+            tracker.take(item, qty)
+            levels[floor + item] += qty
+            moves.append((item, qty, plant.store, plant.floor))
+
+    if not moves:
+        # Nothing to move for those: issue any material still in the store
+        materials = plant.materials
+        start = rng.randrange(len(materials))
+        for k in range(len(materials)):
+            item = materials[(start + k) % len(materials)]
+            qty = min(tracker.level(item), tracker.reorder_quantity[item])
+            if qty > 0:
+                break
+        else:
+            raise ValueError("raw materials ran out in the store: raise PRODUCTION raw_stock or the purchase share")
+        tracker.take(item, qty)
+        levels[floor + item] += qty
+        moves.append((item, qty, plant.store, plant.floor))
+
+    if not changed:
+        return record
+    entries, narration = transfer_lines(plant, moves)
+    return (voucher_type, date, number, entries, narration)
+
+def transfer_records(plant, date, voucher_counters, moves):
+    """Return Stock Journal records for moves, RESTOCK_LINES moves to a voucher"""
+    records = []
+    for start in range(0, len(moves), stock.RESTOCK_LINES):
+        entries, narration = transfer_lines(plant, moves[start:start + stock.RESTOCK_LINES])
+        records.append((STOCK_JOURNAL, date, voucher_counters[STOCK_JOURNAL], entries, narration))
+        voucher_counters[STOCK_JOURNAL] += 1
+    return records
+
+def restock_records(profile, tracker, rng, date, voucher_counters):
+    """Return the records that bring every item back to its opening level on date
+
+    Purchases restock the store with what production is about to use, a
+    Stock Journal issues it, one Manufacturing Journal per product makes
+    the shortfall (in whole batches) and a last Stock Journal moves
+    everything made to the finished goods godown.
+    """
+    plant = tracker.plant
+    levels = tracker.levels
+    opening = tracker.opening
+    floor = plant.floor * plant.size
+    finished = plant.finished * plant.size
+    store = plant.store * plant.size
+
+    runs = []
+    needed = [0] * plant.size
+    for product in plant.products:
+        short = opening[product] - levels[finished + product] - levels[floor + product]
+        if short > 0:
+            batches = -(-short // plant.batch[product])
+            runs.append((product, batches))
+            for component, qty in plant.bom[product]:
+                needed[component] += qty * batches
+
+    buy = []
+    issue = []
+    for item in plant.materials:
+        issue_qty = max(needed[item] - levels[floor + item], 0)
+        buy_qty = opening[item] + issue_qty - levels[store + item]
+        if buy_qty > 0:
+            buy.append((item, buy_qty))
+        if issue_qty:
+            issue.append((item, issue_qty, plant.store, plant.floor))
+
+    records = stock.restock_purchases(profile, tracker, rng, date, voucher_counters, buy)
+    for item, qty, _, _ in issue:
+        tracker.take(item, qty)
+        levels[floor + item] += qty
+    records.extend(transfer_records(plant, date, voucher_counters, issue))
+
+    for product, batches in runs:
+        for component, qty in plant.bom[product]:
+            levels[floor + component] -= qty * batches
+        levels[floor + product] += batches * plant.batch[product]
+        entries, narration = production_lines(plant, product, batches)
+        records.append((MANUFACTURING_JOURNAL, date, voucher_counters[MANUFACTURING_JOURNAL], entries, narration))
+        voucher_counters[MANUFACTURING_JOURNAL] += 1
+
+    dispatch = []
+    for product in plant.products:
+        qty = levels[floor + product]
+        if qty:
+            levels[floor + product] = 0
+            tracker.put(product, qty)
+            dispatch.append((product, qty, plant.floor, plant.finished))
+    records.extend(transfer_records(plant, date, voucher_counters, dispatch))
+    return records
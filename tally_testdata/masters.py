@@ -0,0 +1,237 @@
+"""
+Masters generator
+
+Builds masters.xml from the same company profile the voucher generator
+uses: the profile's fixed ledgers (LEDGERS), one ledger per sales and
+purchase party with its address and GSTIN, godowns, stock items (with
+their opening stock in its godown), cost centres and extra voucher types
+(VOUCHER_TYPES). Masters are rendered from string templates and written one at a
+time, so memory stays flat however many parties and items there are.
+"""
+
+from tally_testdata.engine import DEFAULT_UNIT, escape_name, escape_text, format_amount
+from tally_testdata.stock import item_costs, item_levels, tracks_stock
+from tally_testdata.output import open_output
+
+MASTERS_HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<ENVELOPE>
+  <HEADER>
+    <VERSION>1</VERSION>
+    <TALLYREQUEST>Import Data</TALLYREQUEST>
+    <TYPE>Data</TYPE>
+    <ID>Masters</ID>
+  </HEADER>
+  <BODY>
+    <IMPORTDATA>
+      <REQUESTDESC>
+        <REPORTNAME>All Masters</REPORTNAME>
+        <STATICVARIABLES>
+          <SVCURRENTCOMPANY>%s</SVCURRENTCOMPANY>
+        </STATICVARIABLES>
+      </REQUESTDESC>
+      <REQUESTDATA>
+"""
+MASTERS_TAIL = """      </REQUESTDATA>
+    </IMPORTDATA>
+  </BODY>
+</ENVELOPE>
+"""
+
+SECTION = "        <!-- %s -->\n"
+SEPARATOR = "        \n"
+
+LEDGER_HEAD = (
+    '        <LEDGER NAME="%s" PARENT="%s">\n'
+    "          <OPENINGBALANCE>%s</OPENINGBALANCE>\n"
+    "          <OPENINGBALANCEDATE>%s</OPENINGBALANCEDATE>\n"
+)
+LEDGER_TAIL = "        </LEDGER>\n"
+REVENUE_LEDGER = "          <ISREVENUELEDGER>Yes</ISREVENUELEDGER>\n"
+TAX_LEDGER = (
+    "          <TAXTYPE>%s</TAXTYPE>\n"
+    "          <TAXRATE>%s</TAXRATE>\n"
+)
+BANK_HEAD = (
+    "          <BANKDETAILS>\n"
+    "            <BANKNAME>%s</BANKNAME>\n"
+    "            <BRANCHNAME>%s</BRANCHNAME>\n"
+    "            <ACCOUNTNUMBER>%s</ACCOUNTNUMBER>\n"
+)
+BANK_IFSC_TYPE = "            <IFSCTYPE>%s</IFSCTYPE>\n"
+BANK_TAIL = (
+    "            <IFSCCODE>%s</IFSCCODE>\n"
+    "          </BANKDETAILS>\n"
+)
+PARTY_HEAD = (
+    "          <MAILINGNAME>%s</MAILINGNAME>\n"
+    "          <ADDRESS>\n"
+)
+ADDRESS_LINE = "            <ADDRESSLINE%d>%s</ADDRESSLINE%d>\n"
+PARTY_TAIL = (
+    "            <CITY>%s</CITY>\n"
+    "            <STATE>%s</STATE>\n"
+    "            <PINCODE>%s</PINCODE>\n"
+    "          </ADDRESS>\n"
+    "          <GSTREGISTRATIONTYPE>Regular</GSTREGISTRATIONTYPE>\n"
+    "          <GSTIN>%s</GSTIN>\n"
+    "          <STATENAME>%s</STATENAME>\n"
+)
+
+UNIT = (
+    '        <UNIT NAME="%s">\n'
+    "          <ISSIMPLEUNIT>Yes</ISSIMPLEUNIT>\n"
+    "        </UNIT>\n"
+)
+STOCK_ITEM = (
+    '        <STOCKITEM NAME="%s">\n'
+    "          <BASEUNITS>%s</BASEUNITS>\n"
+    "          <GSTAPPLICABLE>Applicable</GSTAPPLICABLE>\n"
+    "          <HSNCODE>%s</HSNCODE>\n"
+    "          <TAXRATE>%s</TAXRATE>\n"
+)
+STOCK_OPENING = (
+    "          <OPENINGBALANCE>%d %s</OPENINGBALANCE>\n"
+    "          <OPENINGRATE>%s/%s</OPENINGRATE>\n"
+    "          <OPENINGVALUE>%s</OPENINGVALUE>\n"
+)
+STOCK_OPENING_GODOWN = (
+    "          <BATCHALLOCATIONS.LIST>\n"
+    "            <GODOWNNAME>%s</GODOWNNAME>\n"
+    "            <BATCHNAME>Primary Batch</BATCHNAME>\n"
+    "            <OPENINGBALANCE>%d %s</OPENINGBALANCE>\n"
+    "            <OPENINGRATE>%s/%s</OPENINGRATE>\n"
+    "            <OPENINGVALUE>%s</OPENINGVALUE>\n"
+    "          </BATCHALLOCATIONS.LIST>\n"
+)
+STOCK_ITEM_TAIL = "        </STOCKITEM>\n"
+COST_CATEGORY = (
+    '        <COSTCATEGORY NAME="%s">\n'
+    "          <ALLOCATE>Yes</ALLOCATE>\n"
+    "        </COSTCATEGORY>\n"
+)
+COST_CENTRE = (
+    '        <COSTCENTRE NAME="%s">\n'
+    "          <CATEGORY>%s</CATEGORY>\n"
+    "        </COSTCENTRE>\n"
+)
+GODOWN = (
+    '        <GODOWN NAME="%s">\n'
+    "          <HASNOSPACE>No</HASNOSPACE>\n"
+    "        </GODOWN>\n"
+)
+VOUCHER_TYPE = (
+    '        <VOUCHERTYPE NAME="%s">\n'
+    "          <PARENT>%s</PARENT>\n"
+    "          <NUMBERINGMETHOD>Automatic</NUMBERINGMETHOD>\n"
+    "        </VOUCHERTYPE>\n"
+)
+
+def render_ledger(ledger, opening_date):
+    """Render one fixed ledger: {"name", "parent"} plus opening, revenue, tax or bank details"""
+    parts = [LEDGER_HEAD % (escape_name(ledger["name"]), escape_name(ledger["parent"]),
+                            ledger.get("opening", 0), opening_date)]
+    if ledger.get("revenue"):
+        parts.append(REVENUE_LEDGER)
+    if "tax_type" in ledger:
+        parts.append(TAX_LEDGER % (ledger["tax_type"], ledger["tax_rate"]))
+    bank = ledger.get("bank")
+    if bank:
+        parts.append(BANK_HEAD % (escape_name(ledger["name"]), escape_text(bank["branch"]), bank["account"]))
+        if "ifsc_type" in bank:
+            parts.append(BANK_IFSC_TYPE % bank["ifsc_type"])
+        parts.append(BANK_TAIL % bank["ifsc"])
+    parts.append(LEDGER_TAIL)
+    return "".join(parts)
+
+def render_party(party, parent, opening_date):
+    """Render a customer or supplier ledger with its address and GSTIN"""
+    # escape_text(), not the cached escape_name(): each party name is written once
+    name = escape_text(party["name"])
+    state = escape_name(party["state"])
+    parts = [LEDGER_HEAD % (name, parent, party.get("opening", 0), opening_date),
+             PARTY_HEAD % name]
+    for i, line in enumerate(party.get("address", ()), 1):
+        parts.append(ADDRESS_LINE % (i, escape_text(line), i))
+    parts.append(PARTY_TAIL % (escape_text(party.get("city", "")), state, party.get("pincode", ""),
+                               party["gstin"], state))
+    parts.append(LEDGER_TAIL)
+    return "".join(parts)
+
+def iter_masters(profile):
+    """Yield (master type, XML text) for every master in the profile, in import order"""
+    opening_date = profile.START_DATE.strftime("%Y%m%d")
+
+    for section, ledgers in profile.LEDGERS.items():
+        yield None, SECTION % section
+        for ledger in ledgers:
+            yield "LEDGER", render_ledger(ledger, opening_date) + SEPARATOR
+
+    for parent, parties in (("Sundry Debtors", profile.SALES["parties"]),
+                            ("Sundry Creditors", profile.PURCHASES["parties"])):
+        yield None, SECTION % parent
+        for party in parties:
+            yield "LEDGER", render_party(party, parent, opening_date) + SEPARATOR
+
+    # Godowns first: opening stock is booked into them
+    godowns = getattr(profile, "GODOWNS", ())
+    if godowns:
+        yield None, SECTION % "Godowns"
+        for godown in godowns:
+            yield "GODOWN", GODOWN % escape_name(godown) + SEPARATOR
+
+    items = getattr(profile, "STOCK_ITEMS", ())
+    if items:
+        yield None, SECTION % "Units and Stock Items"
+        units = dict.fromkeys(item.get("unit", DEFAULT_UNIT) for item in items)
+        for unit in units:
+            yield "UNIT", UNIT % escape_name(unit) + SEPARATOR
+        # Opening stock for profiles that track it (see tally_testdata.stock)
+        levels = item_levels(profile) if tracks_stock(profile) else None
+        costs = item_costs(profile) if levels else None
+        for i, item in enumerate(items):
+            unit = escape_name(item.get("unit", DEFAULT_UNIT))
+            text = STOCK_ITEM % (escape_text(item["name"]), unit, item["hsn"], item["gst_rate"])
+            if levels and levels[i][1]:
+                godown, opening = levels[i][:2]
+                rate = format_amount(costs[i])
+                value = format_amount(costs[i] * opening)
+                text += STOCK_OPENING % (opening, unit, rate, unit, value)
+                if godowns:
+                    text += STOCK_OPENING_GODOWN % (escape_name(godowns[godown]), opening, unit, rate, unit, value)
+            yield "STOCKITEM", text + STOCK_ITEM_TAIL + SEPARATOR
+
+    cost_centres = getattr(profile, "COST_CENTERS", ())
+    if cost_centres:
+        category = escape_name(profile.COST_CATEGORY)
+        yield None, SECTION % "Cost Centres"
+        yield "COSTCATEGORY", COST_CATEGORY % category + SEPARATOR
+        for cost_centre in cost_centres:
+            yield "COSTCENTRE", COST_CENTRE % (escape_name(cost_centre), category) + SEPARATOR
+
+    voucher_types = getattr(profile, "VOUCHER_TYPES", {})
+    if voucher_types:
+        yield None, SECTION % "Voucher Types"
+        for name, parent in voucher_types.items():
+            yield "VOUCHERTYPE", VOUCHER_TYPE % (escape_name(name), escape_name(parent)) + SEPARATOR
+
+def write_masters(profile, output_file, level=None):
+    """Stream masters.xml for profile to output_file (.gz/.zst compressed by name)
+
+    Returns (count per master type, bytes written before compression).
+    """
+    counts = {}
+    size = 0
+    with open_output(output_file, level) as f:
+        head = (MASTERS_HEAD % escape_text(profile.COMPANY_NAME)).encode("utf-8")
+        f.write(head)
+        size += len(head)
+        for master_type, text in iter_masters(profile):
+            if master_type:
+                counts[master_type] = counts.get(master_type, 0) + 1
+            data = text.encode("utf-8")
+            f.write(data)
+            size += len(data)
+        tail = MASTERS_TAIL.encode("utf-8")
+        f.write(tail)
+        size += len(tail)
+    return counts, size
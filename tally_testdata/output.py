@@ -0,0 +1,272 @@
+"""
+Output files for streamed vouchers
+
+Vouchers go to a single vouchers.xml, or to a set of complete Tally
+ENVELOPE files split by month, voucher count or size, described by a JSON
+manifest so an import harness can feed them to Tally one by one.
+
+A .gz or .zst output name compresses each file while it is written, so the
+uncompressed document never exists on disk or in memory (.zst requires the
+zstandard package).
+
+An existing single vouchers.xml can also be extended in place: scan_tail()
+reads it backwards from the end, just far enough to find the last voucher
+date and the highest number of each voucher type, and append_output()
+reopens it at the closing </REQUESTDATA> so new vouchers go in without
+rewriting anything before them.
+"""
+
+import gzip
+import html
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+SPLIT_MODES = ("month", "vouchers", "size")
+
+# Compressed file suffixes and the compression they select
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+def compression_for(path):
+    """Return "gzip", "zstd" or None depending on the file name"""
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1])
+
+def split_name(path):
+    """Split vouchers.xml.gz into ("vouchers", ".xml.gz")"""
+    root, ext = os.path.splitext(path)
+    if ext in COMPRESSION_SUFFIXES:
+        root, inner = os.path.splitext(root)
+        ext = inner + ext
+    return root, ext
+
+def open_output(path, level=None):
+    """Open path for binary writing, compressing on the fly for .gz and .zst names"""
+    compression = compression_for(path)
+    if compression is None:
+        return open(path, "wb")
+    if level is None:
+        level = DEFAULT_LEVELS[compression]
+
+    if compression == "gzip":
+        # mtime=0 keeps seeded output byte-identical between runs
+        return gzip.GzipFile(path, "wb", compresslevel=level, mtime=0)
+    import zstandard
+    return zstandard.ZstdCompressor(level=level).stream_writer(open(path, "wb"), closefd=True)
+
+# The fields at the start of every voucher, as render_voucher() lays them out
+VOUCHER_FIELDS_RE = re.compile(
+    rb"<VOUCHER>\s*<VOUCHERTYPENAME>([^<]*)</VOUCHERTYPENAME>\s*"
+    rb"<DATE>(\d{8})</DATE>\s*<VOUCHERNUMBER>([^<]*)</VOUCHERNUMBER>")
+REQUESTDATA_END = b"</REQUESTDATA>"
+TAIL_CHUNK_SIZE = 1024 * 1024
+
+def scan_tail(path, voucher_types):
+    """Find where to append to an existing vouchers file, reading it from the end
+
+    Returns (offset of the line holding </REQUESTDATA>, date of the last
+    voucher or None, {voucher type: highest voucher number}). Reading
+    backwards stops as soon as every type in voucher_types has been seen,
+    so usually only the last few hundred KB are read.
+    """
+    if compression_for(path):
+        raise ValueError(f"cannot append to compressed file {path}")
+
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = max(0, size - TAIL_CHUNK_SIZE)
+        f.seek(pos)
+        data = f.read()
+        close = data.rfind(REQUESTDATA_END)
+        if close < 0:
+            raise ValueError(f"{path} has no </REQUESTDATA>: not a vouchers file")
+        end = pos + data.rfind(b"\n", 0, close) + 1
+        data = data[:end - pos]
+
+        last_date = None
+        numbers = {}
+        missing = set(voucher_types)
+        while True:
+            # Only whole vouchers are matched; the cut-off start of the first one
+            # is carried over to the next (earlier) chunk
+            first = data.find(b"<VOUCHER>") if pos else 0
+            if first >= 0:
+                for match in VOUCHER_FIELDS_RE.finditer(data, first):
+                    raw_type, date, number = match.groups()
+                    voucher_type = raw_type.decode("utf-8")
+                    if "&" in voucher_type:
+                        voucher_type = html.unescape(voucher_type)
+                    if last_date is None or date > last_date:
+                        last_date = date
+                    if number.isdigit():
+                        numbers[voucher_type] = max(numbers.get(voucher_type, 0), int(number))
+                    missing.discard(voucher_type)
+                data = data[:first]
+            if not missing or pos == 0:
+                break
+            start = max(0, pos - TAIL_CHUNK_SIZE)
+            f.seek(start)
+            data = f.read(pos - start) + data
+            pos = start
+
+    if last_date is not None:
+        last_date = datetime.strptime(last_date.decode(), "%Y%m%d")
+    return end, last_date, numbers
+
+@contextmanager
+def append_output(path, end):
+    """Open an existing vouchers file for writing at offset end
+
+    Everything from end onwards (the closing tags) is put back after the new
+    data, even if writing stops early, so the file stays well-formed.
+    """
+    with open(path, "r+b") as f:
+        f.seek(end)
+        epilogue = f.read()
+        f.seek(end)
+        f.truncate()
+        try:
+            yield f
+        finally:
+            f.write(epilogue)
+
+def part_path(output_file, label):
+    """Return the file name of one split part: vouchers.xml -> vouchers-<label>.xml"""
+    root, ext = split_name(output_file)
+    return f"{root}-{label}{ext}"
+
+def manifest_path(output_file):
+    """Return the manifest file name for output_file: vouchers-manifest.json"""
+    root, _ = split_name(output_file)
+    return f"{root}-manifest.json"
+
+class VoucherWriter:
+    """Write rendered vouchers to one or more complete ENVELOPE files
+
+    split is None (one file), "month", "vouchers" or "size"; limit is the
+    number of vouchers or (uncompressed) bytes per file for the last two.
+    Each part gets its own prologue and epilogue, so every file imports on
+    its own. level is the compression level for .gz/.zst output. With
+    index=True each part also gets a sidecar index (see tally_testdata.index).
+    """
+
+    def __init__(self, output_file, prologue, epilogue, split=None, limit=None, level=None, index=False):
+        if split is not None and split not in SPLIT_MODES:
+            raise ValueError(f"unknown split mode: {split}")
+        if split in ("vouchers", "size") and (limit is None or limit < 1):
+            raise ValueError(f"split by {split} needs a positive limit")
+        if index and compression_for(output_file):
+            raise ValueError("an index needs uncompressed output: compressed files can't be read at an offset")
+        self.output_file = output_file
+        self.prologue = prologue.encode("utf-8")
+        self.epilogue = epilogue.encode("utf-8")
+        self.split = split
+        self.limit = limit
+        self.level = level
+        self.index = index
+        self.parts = []
+        self._file = None
+        self._month = None
+        self._index = None
+
+    def _needs_new_part(self, date, size):
+        if self._file is None:
+            return True
+        part = self.parts[-1]
+        if self.split == "month":
+            return (date.year, date.month) != self._month
+        if self.split == "vouchers":
+            return part["vouchers"] >= self.limit
+        if self.split == "size":
+            return part["vouchers"] > 0 and part["bytes"] + size + len(self.epilogue) > self.limit
+        return False
+
+    def _open_part(self, date):
+        if self.split is None:
+            path = self.output_file
+        elif self.split == "month":
+            path = part_path(self.output_file, f"{date.year:04d}-{date.month:02d}")
+        else:
+            path = part_path(self.output_file, f"{len(self.parts) + 1:04d}")
+
+        self._file = open_output(path, self.level)
+        self._file.write(self.prologue)
+        if self.index:
+            from tally_testdata.index import IndexBuilder
+            self._index = IndexBuilder()
+        self._month = (date.year, date.month) if date else None
+        self.parts.append({
+            "file": os.path.basename(path),
+            "path": path,
+            "first_date": None,
+            "last_date": None,
+            "vouchers": 0,
+            "bytes": len(self.prologue),
+            "voucher_numbers": {},
+        })
+
+    def _close_part(self):
+        self._file.write(self.epilogue)
+        self._file.close()
+        self._file = None
+        part = self.parts[-1]
+        part["bytes"] += len(self.epilogue)
+        part["file_bytes"] = os.path.getsize(part["path"])
+        if self._index is not None:
+            part["index"] = self._index.write(part["path"])
+            self._index = None
+
+    def write(self, voucher_type, date, number, text):
+        """Append one rendered voucher, starting a new part when needed"""
+        data = text.encode("utf-8")
+        if self._needs_new_part(date, len(data)):
+            if self._file is not None:
+                self._close_part()
+            self._open_part(date)
+
+        self._file.write(data)
+
+        part = self.parts[-1]
+        if self._index is not None:
+            self._index.add(part["bytes"], data, voucher_type, date, number)
+        if part["first_date"] is None:
+            part["first_date"] = date
+        part["last_date"] = date
+        part["vouchers"] += 1
+        part["bytes"] += len(data)
+        numbers = part["voucher_numbers"].get(voucher_type)
+        if numbers is None:
+            part["voucher_numbers"][voucher_type] = [number, number]
+        else:
+            numbers[1] = number
+
+    def close(self):
+        """Finish the last part and return the list of parts written"""
+        if self._file is None and not self.parts:
+            # No vouchers at all: still write an empty envelope
+            self._open_part(None)
+        if self._file is not None:
+            self._close_part()
+        return self.parts
+
+def write_manifest(output_file, parts, **info):
+    """Write the JSON manifest describing each part; returns its path"""
+    files = []
+    for part in parts:
+        files.append({
+            "file": part["file"],
+            "first_date": part["first_date"].date().isoformat() if part["first_date"] else None,
+            "last_date": part["last_date"].date().isoformat() if part["last_date"] else None,
+            "vouchers": part["vouchers"],
+            "bytes": part["bytes"],
+            "file_bytes": part["file_bytes"],
+            "voucher_numbers": part["voucher_numbers"],
+        })
+
+    path = manifest_path(output_file)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(info, files=files), f, indent=2)
+        f.write("\n")
+    return path
@@ -0,0 +1,249 @@
+"""
+Per-stage timing counters for the generator
+
+Off by default and free when off: the pipeline passes its functions and
+random streams through this module once per run or month shard (timed(),
+renderer(), random_wrapper()) and gets them back unchanged unless enable()
+was called. When enabled the same calls return wrappers that add each
+call's time to a stage:
+
+- rng: every draw from the random.Random streams
+- generate_sales_voucher, ... (one per voucher type, including their rng
+  draws)
+- apply_stock, allocate_bills
+- render_voucher, or create_voucher_element and serialize_element for
+  --renderer etree
+- write: encoding, compression and file I/O of each voucher
+
+Stages nest (rng is inside generate_*), so shares can add up to more than
+100%. Timers cost about 0.1 µs per call, which shows most in rng. With
+--workers, each month shard is timed in its worker and the counters are
+merged back into the parent's. Every second, a sample of vouchers written
+and peak memory builds a vouchers/sec timeline. Peak memory comes from the
+Unix resource module; on Windows it is None and shown as "n/a".
+
+    python -m tally_testdata companies/trading-company --seed 1 --stats stats.json
+    python -m tally_testdata companies/trading-company --seed 1 --stats stats.csv --cprofile gen.pstats
+"""
+
+import csv
+import json
+import sys
+import time
+
+# The Stats of this process while profiling, else None
+active = None
+
+# Seconds between timeline samples
+SAMPLE_INTERVAL = 1.0
+
+def peak_rss(children=False):
+    """Return the peak resident set size of this process (or its children) in bytes
+
+    None where the resource module is missing (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def peak_rss_mb(children=False):
+    """Return peak_rss() in MB to one decimal, or None where it can't be measured"""
+    peak = peak_rss(children)
+    return None if peak is None else round(peak / (1024 * 1024), 1)
+
+def format_mb(mb):
+    """Return "12.3 MB", or "n/a" for a memory figure that couldn't be measured"""
+    return "n/a" if mb is None else f"{mb:.1f} MB"
+
+class Stats:
+    """Calls and seconds per stage, plus a vouchers/sec timeline"""
+
+    def __init__(self):
+        self.stages = {}
+        self.start = time.perf_counter()
+        self.vouchers = 0
+        self.timeline = []
+        self._next_sample = self.start + SAMPLE_INTERVAL
+        self._last = (self.start, 0)
+
+    def timed(self, stage, func):
+        """Wrap func so each call's time is added to stage"""
+        counter = self.stages.setdefault(stage, [0, 0.0])
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                counter[0] += 1
+                counter[1] += clock() - start
+        return wrapper
+
+    def count(self, vouchers=1):
+        """Record vouchers written, sampling the timeline once per interval"""
+        self.vouchers += vouchers
+        now = time.perf_counter()
+        if now >= self._next_sample:
+            self.sample(now)
+
+    def sample(self, now):
+        """Add a timeline point: vouchers/sec since the last one and peak memory"""
+        last_time, last_vouchers = self._last
+        self.timeline.append({
+            "seconds": round(now - self.start, 3),
+            "vouchers": self.vouchers,
+            "vouchers_per_sec": round((self.vouchers - last_vouchers) / (now - last_time), 1),
+            "peak_rss_mb": peak_rss_mb(),
+        })
+        self._last = (now, self.vouchers)
+        self._next_sample = now + SAMPLE_INTERVAL
+
+    def merge(self, stages):
+        """Add the stage counters of another process (see run_profiled())"""
+        for stage, (calls, seconds) in stages.items():
+            counter = self.stages.setdefault(stage, [0, 0.0])
+            counter[0] += calls
+            counter[1] += seconds
+
+    def report(self):
+        """Return the stats as a JSON-ready dict"""
+        now = time.perf_counter()
+        if self.vouchers > self._last[1]:
+            self.sample(now)
+        elapsed = now - self.start
+        stages = []
+        for stage, (calls, seconds) in sorted(self.stages.items(), key=lambda item: -item[1][1]):
+            stages.append({
+                "stage": stage,
+                "calls": calls,
+                "seconds": round(seconds, 4),
+                "share": round(seconds / elapsed, 4) if elapsed else None,
+                "us_per_call": round(seconds / calls * 1e6, 3) if calls else None,
+            })
+        return {
+            "seconds": round(elapsed, 3),
+            "vouchers": self.vouchers,
+            "vouchers_per_sec": round(self.vouchers / elapsed, 1) if elapsed else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_worker_rss_mb": peak_rss_mb(children=True),
+            "stages": stages,
+            "timeline": self.timeline,
+        }
+
+def enable():
+    """Start collecting stats in this process; returns the Stats"""
+    global active
+    active = Stats()
+    return active
+
+def disable():
+    """Stop collecting; returns the Stats collected, or None"""
+    global active
+    stats, active = active, None
+    return stats
+
+def timed(stage, func):
+    """Return func, or a timed wrapper while profiling"""
+    if active is None:
+        return func
+    return active.timed(stage, func)
+
+def timed_functions(funcs):
+    """Return {key: func} with each func timed under its own name while profiling"""
+    if active is None:
+        return funcs
+    return {key: active.timed(func.__name__, func) for key, func in funcs.items()}
+
+def counted(write):
+    """Return write, or a wrapper timing it as "write" and counting each call as a voucher"""
+    if active is None:
+        return write
+    stats = active
+    timed_write = stats.timed("write", write)
+
+    def wrapper(*args):
+        timed_write(*args)
+        stats.count()
+    return wrapper
+
+def renderer(name):
+    """Return engine.RENDERERS[name], timed while profiling"""
+    from tally_testdata import engine
+
+    render = engine.RENDERERS[name]
+    if active is None:
+        return render
+    if name != "etree":
+        return active.timed(render.__name__, render)
+    create = active.timed("create_voucher_element", engine.create_voucher_element)
+    serialize = active.timed("serialize_element", engine.serialize_element)
+
+    def render_etree(voucher_type, date, number, entries, narration=""):
+        return serialize(create(voucher_type, date, number, entries, narration), level=4)
+    return render_etree
+
+class TimedRandom:
+    """A random.Random whose methods are timed as the "rng" stage
+
+    Wraps the generator instead of subclassing it: a subclass defining
+    random() would change which numbers randrange() and friends draw.
+    """
+
+    def __init__(self, rng, stats):
+        self._rng = rng
+        self._stats = stats
+
+    def __getattr__(self, name):
+        method = self._stats.timed("rng", getattr(self._rng, name))
+        # Cache on the instance so later lookups skip __getattr__
+        setattr(self, name, method)
+        return method
+
+def random_wrapper(rng):
+    """Return rng, or a TimedRandom around it while profiling"""
+    if active is None:
+        return rng
+    return TimedRandom(rng, active)
+
+def run_profiled(func, *args):
+    """Run func(*args) with fresh stats (in a worker); returns (result, stage counters)"""
+    enable()
+    try:
+        return func(*args), active.stages
+    finally:
+        disable()
+
+def write_stats(report, path):
+    """Write a report() as JSON, or as CSV rows of stages and timeline for a .csv path"""
+    if not path.endswith(".csv"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        return
+    fields = ["section", "name", "calls", "seconds", "share", "us_per_call", "vouchers",
+              "vouchers_per_sec", "peak_rss_mb"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fields)
+        writer.writeheader()
+        writer.writerow({"section": "total", "name": "run", "seconds": report["seconds"],
+                         "vouchers": report["vouchers"], "vouchers_per_sec": report["vouchers_per_sec"],
+                         "peak_rss_mb": report["peak_rss_mb"]})
+        for row in report["stages"]:
+            writer.writerow({"section": "stage", "name": row["stage"],
+                             **{k: v for k, v in row.items() if k != "stage"}})
+        for point in report["timeline"]:
+            writer.writerow({"section": "timeline", "name": point["seconds"], **point})
+
+def format_stats(report):
+    """Return a short summary of a report() as printable lines"""
+    lines = [f"✓ Stats: {report['vouchers']} vouchers in {report['seconds']:.2f}s "
+             f"({report['vouchers_per_sec'] or 0:.0f}/s), peak RSS {format_mb(report['peak_rss_mb'])}"]
+    for row in report["stages"]:
+        lines.append(f"  {row['stage']:<24} {row['calls']:>10} calls  {row['seconds']:>8.3f}s  "
+                     f"{(row['share'] or 0) * 100:>5.1f}%  {row['us_per_call'] or 0:>9.2f} µs/call")
+    return lines
@@ -0,0 +1,287 @@
+"""
+Running stock levels, so sales never take an item below zero
+
+Profiles whose invoices carry inventory entries ("inventory": True) keep a
+StockTracker per month shard: one array slot per stock item and godown,
+indexed by the item's position in STOCK_ITEMS. Sales are cut back to the
+quantity in stock, purchases first buy the items that fell below the
+reorder level, and the month's last business day restocks every item to
+its opening level.
+
+Months are generated independently (in any order, in any process), so
+each one starts from the same assumed level: STOCK_LEVELS["opening"] of
+every item, which masters.xml books as the items' opening stock. A month
+never sells below zero from there and always ends back at that level or
+above, so the real running stock, carried across months, can only be
+higher than the tracker's and never goes negative.
+
+With GODOWNS, each item is kept in the godown its SALES or PURCHASES
+config names ("godown"), and a config's "stock_levels" override
+STOCK_LEVELS for its items. Profiles with PRODUCTION make their sales
+items instead of buying them: see tally_testdata.manufacturing.
+"""
+
+from array import array
+from collections import deque
+
+from tally_testdata import engine
+
+DEFAULT_STOCK_LEVELS = {"opening": 100, "reorder_level": 25, "reorder_quantity": 100}
+
+# Lines per month-end restock bill
+RESTOCK_LINES = 25
+
+# (items list, {item name: index}) per STOCK_ITEMS list, and
+# (parties list, {party name: state}) per party list, built once per process
+_indexes = {}
+
+def stock_levels(profile):
+    """Return the profile's STOCK_LEVELS, filled in with the defaults"""
+    return dict(DEFAULT_STOCK_LEVELS, **getattr(profile, "STOCK_LEVELS", {}))
+
+def item_levels(profile):
+    """Return (home godown index, opening, reorder level, reorder quantity) per STOCK_ITEMS entry"""
+    if hasattr(profile, "PRODUCTION"):
+        from tally_testdata import manufacturing
+        return manufacturing.get_plant(profile).levels
+    return config_levels(profile)
+
+def item_costs(profile):
+    """Return each STOCK_ITEMS entry's value per unit in paise: its rate, or what made items cost"""
+    if hasattr(profile, "PRODUCTION"):
+        from tally_testdata import manufacturing
+        return manufacturing.get_plant(profile).cost
+    return [item["rate"] * engine.PAISE for item in profile.STOCK_ITEMS]
+
+def config_levels(profile):
+    """item_levels() from the configs alone
+
+    Items listed by PURCHASES or SALES (SALES wins) take that config's
+    "godown" and "stock_levels"; the rest sit in the first godown at
+    STOCK_LEVELS.
+    """
+    defaults = stock_levels(profile)
+    godowns = list(getattr(profile, "GODOWNS", ()))
+    index = name_index(profile.STOCK_ITEMS)
+    levels = [(0, defaults["opening"], defaults["reorder_level"], defaults["reorder_quantity"])] * len(index)
+    for config in (profile.PURCHASES, profile.SALES):
+        if "godown" not in config and "stock_levels" not in config:
+            continue
+        godown = godowns.index(config["godown"]) if "godown" in config else 0
+        settings = dict(defaults, **config.get("stock_levels", {}))
+        for item in config.get("items", ()):
+            levels[index[item["name"]]] = (godown, settings["opening"], settings["reorder_level"],
+                                           settings["reorder_quantity"])
+    return levels
+
+def tracks_stock(profile):
+    """Check whether the profile's invoices move stock"""
+    return bool(getattr(profile, "STOCK_ITEMS", None) and profile.SALES.get("inventory")
+                and profile.PURCHASES.get("inventory"))
+
+def name_index(records, field=None):
+    """Return {record name: index} (or {name: record[field]}) for a list, cached by identity"""
+    key = (id(records), field)
+    if key not in _indexes:
+        if field is None:
+            index = {record["name"]: i for i, record in enumerate(records)}
+        else:
+            index = {record["name"]: record[field] for record in records}
+        # Keep records alive so its id() can't be reused by another list
+        _indexes[key] = (records, index)
+    return _indexes[key][1]
+
+class StockTracker:
+    """Running quantity of every stock item in every godown, as flat arrays
+
+    levels[godown * len(items) + item] is the quantity on hand; each item
+    has a home godown (home[item] is its slot there) where sales take it
+    from and purchases put it. Items that drop below their reorder level at
+    home are queued (once) for the next purchases, or for production when
+    the profile makes them (made[item]).
+    """
+
+    def __init__(self, items, levels, godowns=1, made=(), sellable=None):
+        n = len(items)
+        self.items = items
+        self.index = name_index(items)
+        self.home = array("q", [godown * n + item for item, (godown, *_) in enumerate(levels)])
+        self.opening = array("q", [opening for _, opening, _, _ in levels])
+        self.reorder_level = array("q", [level for _, _, level, _ in levels])
+        self.reorder_quantity = array("q", [quantity for _, _, _, quantity in levels])
+        self.levels = array("q", [0]) * (n * godowns)
+        for item, slot in enumerate(self.home):
+            self.levels[slot] = self.opening[item]
+        self.made = bytearray(n)
+        for item in made:
+            self.made[item] = 1
+        # Items sales may fall back to when nothing asked for is in stock
+        self.sellable = list(range(n)) if sellable is None else sellable
+        self.queued = bytearray(n)
+        self.reorder = deque()
+        self.production = deque()
+        # Production lookup tables (tally_testdata.manufacturing.Plant), if any
+        self.plant = None
+
+    def level(self, item, godown=None):
+        """Return the quantity of item (an index) in godown (default: its home)"""
+        if godown is None:
+            return self.levels[self.home[item]]
+        return self.levels[godown * len(self.items) + item]
+
+    def take(self, item, qty, godown=None):
+        """Remove qty of item, queueing it for reorder when it runs low at home"""
+        home = self.home[item]
+        slot = home if godown is None else godown * len(self.items) + item
+        self.levels[slot] -= qty
+        if slot == home and self.levels[slot] < self.reorder_level[item] and not self.queued[item]:
+            self.queued[item] = 1
+            (self.production if self.made[item] else self.reorder).append(item)
+
+    def put(self, item, qty, godown=None):
+        """Add qty of item"""
+        if godown is None:
+            self.levels[self.home[item]] += qty
+        else:
+            self.levels[godown * len(self.items) + item] += qty
+
+    def next_reorder(self):
+        """Return the next queued item still below the reorder level, or None"""
+        return self._next_queued(self.reorder)
+
+    def next_production(self):
+        """Return the next queued item to make that is still below the reorder level, or None"""
+        return self._next_queued(self.production)
+
+    def _next_queued(self, queue):
+        while queue:
+            item = queue.popleft()
+            self.queued[item] = 0
+            if self.level(item) < self.reorder_level[item]:
+                return item
+        return None
+
+    def shortfalls(self):
+        """Return (item, quantity) pairs that bring every bought item back to its opening level"""
+        levels, opening = self.levels, self.opening
+        return [(item, opening[item] - levels[slot]) for item, slot in enumerate(self.home)
+                if levels[slot] < opening[item] and not self.made[item]]
+
+def new_tracker(profile):
+    """Return a StockTracker for one month of profile, or None if it doesn't track stock"""
+    if not tracks_stock(profile):
+        return None
+    godowns = max(len(getattr(profile, "GODOWNS", ())), 1)
+    if hasattr(profile, "PRODUCTION"):
+        from tally_testdata import manufacturing
+        plant = manufacturing.get_plant(profile)
+        tracker = StockTracker(profile.STOCK_ITEMS, plant.levels, godowns, plant.products, plant.sellable)
+        tracker.plant = plant
+        return tracker
+    levels = config_levels(profile)
+    index = name_index(profile.STOCK_ITEMS)
+    sellable = [index[item["name"]] for item in profile.SALES["items"]]
+    return StockTracker(profile.STOCK_ITEMS, levels, godowns, sellable=sellable)
+
+def stock_record(profile, voucher_type, date, number, party, picks):
+    """Build a Sales or Purchase record for (item index, quantity) picks"""
+    config = profile.SALES if voucher_type == "Sales" else profile.PURCHASES
+    interstate = engine.is_interstate(profile.STATE, name_index(config["parties"], "state")[party])
+    lines = []
+    taxable = {}
+    narration_parts = []
+    for item_index, qty in picks:
+        item = profile.STOCK_ITEMS[item_index]
+        entry = engine.item_line(config, item, qty, interstate)
+        lines.append(entry)
+        taxable[item["gst_rate"]] = taxable.get(item["gst_rate"], 0) + entry["amount"]
+        narration_parts.append(engine.line_narration(config, item, qty))
+    narration = f"{config['narration'].format(party=party)}: {', '.join(narration_parts)}"
+    return engine.invoice_record(voucher_type, date, number, party, interstate, lines, taxable, narration)
+
+def apply_stock(profile, record, tracker, rng):
+    """Move stock for one record in date order, adjusting it to what is on hand
+
+    Sales lines are cut back to the quantity in stock (and dropped when
+    there is none); purchase lines are replaced by items waiting to be
+    reordered, bought in reorder_quantity. Returns the (possibly new) record.
+    """
+    voucher_type, date, number, entries = record[:4]
+    if tracker is None:
+        return record
+    if voucher_type not in ("Sales", "Purchase"):
+        if tracker.plant is None:
+            return record
+        from tally_testdata import manufacturing
+        return manufacturing.apply_production(record, tracker, rng)
+    index = tracker.index
+    picks = [(index[entry["stock"][0]], entry["stock"][1]) for entry in entries if "stock" in entry]
+    if not picks:
+        return record
+
+    changed = False
+    if voucher_type == "Sales":
+        levels, home = tracker.levels, tracker.home
+        filled = []
+        for item, qty in picks:
+            qty_on_hand = levels[home[item]]
+            if qty > qty_on_hand:
+                changed = True
+                qty = qty_on_hand
+            if qty:
+                tracker.take(item, qty)
+                filled.append((item, qty))
+        if not filled:
+            # Nothing asked for is in stock: sell something that is
+            sellable = tracker.sellable
+            pos = rng.randrange(len(sellable))
+            for _ in range(len(sellable)):
+                item = sellable[pos]
+                if tracker.level(item):
+                    break
+                pos = (pos + 1) % len(sellable)
+            else:
+                raise ValueError("stock ran out for every item: raise STOCK_LEVELS or the purchase share")
+            qty = min(picks[0][1], tracker.level(item))
+            tracker.take(item, qty)
+            filled.append((item, qty))
+        picks = filled
+    else:
+        bought = {}
+        for item, qty in picks:
+            reorder = tracker.next_reorder()
+            if reorder is not None:
+                changed = True
+                item, qty = reorder, tracker.reorder_quantity[reorder]
+            bought[item] = bought.get(item, 0) + qty
+        if len(bought) < len(picks):
+            changed = True
+        picks = list(bought.items())
+        for item, qty in picks:
+            tracker.put(item, qty)
+
+    if not changed:
+        return record
+    return stock_record(profile, voucher_type, date, number, entries[-1]["name"], picks)
+
+def restock_records(profile, tracker, rng, date, voucher_counters):
+    """Return the records that restock every item to its opening level on date"""
+    if tracker is None:
+        return []
+    if tracker.plant is not None:
+        from tally_testdata import manufacturing
+        return manufacturing.restock_records(profile, tracker, rng, date, voucher_counters)
+    return restock_purchases(profile, tracker, rng, date, voucher_counters, tracker.shortfalls())
+
+def restock_purchases(profile, tracker, rng, date, voucher_counters, picks):
+    """Return Purchase records buying (item, quantity) picks on date, RESTOCK_LINES to a bill"""
+    records = []
+    for start in range(0, len(picks), RESTOCK_LINES):
+        bill = picks[start:start + RESTOCK_LINES]
+        for item, qty in bill:
+            tracker.put(item, qty)
+        supplier = rng.choice(profile.PURCHASES["parties"])["name"]
+        number = voucher_counters["Purchase"]
+        voucher_counters["Purchase"] += 1
+        records.append(stock_record(profile, "Purchase", date, number, supplier, bill))
+    return records
@@ -0,0 +1,281 @@
+"""
+Scale knobs and synthetic parties/items for stress datasets
+
+A company profile fixes its date range, vouchers per day and a handful of
+parties and items. configure_profile() overrides any of these, growing the
+party and item lists with synthetic records shaped like the profile's own:
+each copies a real record's fields (ledgers, rates, HSN/SAC, expense heads)
+under a new name, and parties get a state and a GSTIN with a valid state
+code and check digit. The lists are deterministic for a given size (the
+first N records of a longer list are the same), so masters generated for
+the same knobs always match the vouchers.
+"""
+
+import json
+import random
+from datetime import datetime
+
+# GST state codes (first two digits of a GSTIN)
+STATE_CODES = {
+    "Jammu and Kashmir": "01",
+    "Himachal Pradesh": "02",
+    "Punjab": "03",
+    "Chandigarh": "04",
+    "Uttarakhand": "05",
+    "Haryana": "06",
+    "Delhi": "07",
+    "Rajasthan": "08",
+    "Uttar Pradesh": "09",
+    "Bihar": "10",
+    "Sikkim": "11",
+    "Arunachal Pradesh": "12",
+    "Nagaland": "13",
+    "Manipur": "14",
+    "Mizoram": "15",
+    "Tripura": "16",
+    "Meghalaya": "17",
+    "Assam": "18",
+    "West Bengal": "19",
+    "Jharkhand": "20",
+    "Odisha": "21",
+    "Chhattisgarh": "22",
+    "Madhya Pradesh": "23",
+    "Gujarat": "24",
+    "Dadra and Nagar Haveli and Daman and Diu": "26",
+    "Maharashtra": "27",
+    "Karnataka": "29",
+    "Goa": "30",
+    "Lakshadweep": "31",
+    "Kerala": "32",
+    "Tamil Nadu": "33",
+    "Puducherry": "34",
+    "Andaman and Nicobar Islands": "35",
+    "Telangana": "36",
+    "Andhra Pradesh": "37",
+    "Ladakh": "38",
+}
+
+# Capital city and its PIN code, for synthetic party addresses
+STATE_CAPITALS = {
+    "Jammu and Kashmir": ("Srinagar", "190001"),
+    "Himachal Pradesh": ("Shimla", "171001"),
+    "Punjab": ("Chandigarh", "160001"),
+    "Chandigarh": ("Chandigarh", "160017"),
+    "Uttarakhand": ("Dehradun", "248001"),
+    "Haryana": ("Chandigarh", "160019"),
+    "Delhi": ("New Delhi", "110001"),
+    "Rajasthan": ("Jaipur", "302001"),
+    "Uttar Pradesh": ("Lucknow", "226001"),
+    "Bihar": ("Patna", "800001"),
+    "Sikkim": ("Gangtok", "737101"),
+    "Arunachal Pradesh": ("Itanagar", "791111"),
+    "Nagaland": ("Kohima", "797001"),
+    "Manipur": ("Imphal", "795001"),
+    "Mizoram": ("Aizawl", "796001"),
+    "Tripura": ("Agartala", "799001"),
+    "Meghalaya": ("Shillong", "793001"),
+    "Assam": ("Dispur", "781005"),
+    "West Bengal": ("Kolkata", "700001"),
+    "Jharkhand": ("Ranchi", "834001"),
+    "Odisha": ("Bhubaneswar", "751001"),
+    "Chhattisgarh": ("Raipur", "492001"),
+    "Madhya Pradesh": ("Bhopal", "462001"),
+    "Gujarat": ("Gandhinagar", "382010"),
+    "Dadra and Nagar Haveli and Daman and Diu": ("Daman", "396210"),
+    "Maharashtra": ("Mumbai", "400001"),
+    "Karnataka": ("Bangalore", "560001"),
+    "Goa": ("Panaji", "403001"),
+    "Lakshadweep": ("Kavaratti", "682555"),
+    "Kerala": ("Thiruvananthapuram", "695001"),
+    "Tamil Nadu": ("Chennai", "600001"),
+    "Puducherry": ("Puducherry", "605001"),
+    "Andaman and Nicobar Islands": ("Port Blair", "744101"),
+    "Telangana": ("Hyderabad", "500001"),
+    "Andhra Pradesh": ("Amaravati", "522020"),
+    "Ladakh": ("Leh", "194101"),
+}
+
+GSTIN_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+GSTIN_VALUES = {char: value for value, char in enumerate(GSTIN_CHARS)}
+LETTERS = GSTIN_CHARS[10:]
+
+# Words for synthetic party names
+NAME_WORDS = ("Agarwal", "Bharat", "Chandra", "Deccan", "Eastern", "Ganga", "Hind", "Indus",
+              "Jain", "Kaveri", "Lakshmi", "Mehta", "Narmada", "Omkar", "Patel", "Reddy",
+              "Sharma", "Shree", "Tata", "Unity", "Vijay", "Western", "Yamuna", "Zenith")
+TRADE_WORDS = ("Electronics", "Traders", "Enterprises", "Distributors", "Systems", "Solutions",
+               "Industries", "Agencies", "Technologies", "Retail", "Supplies", "Associates")
+SUFFIXES = ("Pvt Ltd", "Ltd", "& Co", "LLP", "Corporation")
+STREETS = ("MG Road", "Station Road", "Industrial Area", "Market Yard", "Ring Road", "Civil Lines",
+           "Nehru Nagar", "Gandhi Chowk", "Sector 5", "Transport Nagar")
+
+def gstin_check_digit(body):
+    """Return the check character for the first 14 characters of a GSTIN"""
+    total = 0
+    for i, char in enumerate(body):
+        product = GSTIN_VALUES[char] * (2 if i % 2 else 1)
+        total += product // 36 + product % 36
+    return GSTIN_CHARS[(36 - total % 36) % 36]
+
+def make_gstin(state, name, rng):
+    """Return a well-formed GSTIN for a company registered in state"""
+    # PAN: 3 letters, holder type (C = company), first letter of the name, 4 digits, 1 letter
+    initial = next((c for c in name.upper() if c in LETTERS), "X")
+    letters = rng.choices(LETTERS, k=4)
+    pan = f"{letters[0]}{letters[1]}{letters[2]}C{initial}{rng.randrange(10000):04d}{letters[3]}"
+    body = f"{STATE_CODES[state]}{pan}1Z"
+    return body + gstin_check_digit(body)
+
+def synthetic_parties(templates, count, home_state, kind):
+    """Return count parties: the templates, then synthetic copies of them
+
+    Synthetic parties keep their template's other fields (e.g. a vendor's
+    expense ledger), are local to home_state about as often as the
+    templates are, and get an address in their state's capital and an
+    opening balance (a credit for suppliers).
+    """
+    parties = list(templates[:count])
+    rng = random.Random(f"synthetic:{kind}")
+    local_share = sum(t["state"] == home_state for t in templates) / len(templates)
+    other_states = [state for state in STATE_CODES if state != home_state]
+    sign = -1 if kind == "suppliers" else 1
+
+    for i in range(len(parties), count):
+        template = templates[i % len(templates)]
+        name = (f"{rng.choice(NAME_WORDS)} {rng.choice(TRADE_WORDS)} {i + 1:05d} "
+                f"{rng.choice(SUFFIXES)}")
+        state = home_state if rng.random() < local_share else rng.choice(other_states)
+        city, pincode = STATE_CAPITALS[state]
+        parties.append(dict(template, name=name, state=state, gstin=make_gstin(state, name, rng),
+                            address=(f"{rng.randint(1, 999)}, {rng.choice(STREETS)}",),
+                            city=city, pincode=pincode, opening=sign * rng.randrange(0, 200) * 1000))
+    return parties
+
+def rehome_parties(parties, old_state, new_state):
+    """Return parties with old_state and new_state swapped, for a company moving to new_state
+
+    Parties local to the company stay local and interstate ones stay
+    interstate. Each moved party gets its new state's GSTIN code (and check
+    digit), capital and PIN code.
+    """
+    swap = {old_state: new_state, new_state: old_state}
+    moved = []
+    for party in parties:
+        state = swap.get(party["state"])
+        if state is None:
+            moved.append(party)
+            continue
+        party = dict(party, state=state)
+        if party.get("gstin"):
+            body = STATE_CODES[state] + party["gstin"][2:14]
+            party["gstin"] = body + gstin_check_digit(body)
+        if "city" in party:
+            party["city"], party["pincode"] = STATE_CAPITALS[state]
+        moved.append(party)
+    return moved
+
+def synthetic_items(templates, count, kind):
+    """Return count stock items or services: the templates, then variants of them"""
+    items = list(templates[:count])
+    rng = random.Random(f"synthetic:{kind}")
+
+    for i in range(len(items), count):
+        template = templates[i % len(templates)]
+        variant = i // len(templates)
+        # Variants cost 50-150% of the original, rounded to 10
+        rate = max(10, round(template["rate"] * rng.uniform(0.5, 1.5), -1))
+        items.append(dict(template, name=f"{template['name']} - Variant {variant:04d}", rate=int(rate)))
+    return items
+
+def replace_list(settings, old, new):
+    """Point every profile setting that uses the list old (directly or in a dict) at new"""
+    for key, value in settings.items():
+        if value is old:
+            settings[key] = new
+        elif isinstance(value, dict) and any(v is old for v in value.values()):
+            settings[key] = {k: (new if v is old else v) for k, v in value.items()}
+
+def min_items(profile):
+    """Return the fewest sales items a profile can run with: the most lines an invoice draws from them"""
+    items = profile.SALES["items"]
+    configs = (profile.SALES, getattr(profile, "PURCHASES", {}))
+    return max(config["lines"][1] for config in configs if config.get("items") is items)
+
+def configure_profile(profile, start_date=None, end_date=None, vouchers_per_day=None,
+                      customers=None, suppliers=None, items=None, state=None):
+    """Return a copy of profile with the given scale knobs applied
+
+    vouchers_per_day is a (low, high) tuple; customers, suppliers and items
+    are the number of sales parties, purchase parties and sales items.
+    state moves the company to another state, taking its parties along
+    (see rehome_parties()) before any synthetic ones are added. Raises
+    ValueError when items is fewer than an invoice's lines.
+    """
+    if items is not None and items < min_items(profile):
+        raise ValueError(f"items must be at least {min_items(profile)}: "
+                         f"invoices have up to that many lines of different items")
+    settings = vars(profile).copy()
+    if state is not None and state != profile.STATE:
+        for config in (profile.SALES, profile.PURCHASES):
+            old = config["parties"]
+            replace_list(settings, old, rehome_parties(old, profile.STATE, state))
+        settings["STATE"] = state
+        profile = type(profile)(**settings)
+        settings = vars(profile).copy()
+    if start_date is not None:
+        settings["START_DATE"] = start_date
+    if end_date is not None:
+        settings["END_DATE"] = end_date
+    if vouchers_per_day is not None:
+        settings["VOUCHERS_PER_DAY"] = tuple(vouchers_per_day)
+
+    if customers is not None:
+        old = profile.SALES["parties"]
+        replace_list(settings, old, synthetic_parties(old, customers, profile.STATE, "customers"))
+    if suppliers is not None:
+        old = profile.PURCHASES["parties"]
+        replace_list(settings, old, synthetic_parties(old, suppliers, profile.STATE, "suppliers"))
+    if items is not None:
+        old = profile.SALES["items"]
+        new = synthetic_items(old, items, "items")
+        replace_list(settings, old, new)
+        stock_items = settings.get("STOCK_ITEMS")
+        if stock_items is not None and stock_items is not new:
+            # Sales items are part of the stock list (after a manufacturer's raw materials)
+            sold = {id(item) for item in old}
+            settings["STOCK_ITEMS"] = [item for item in stock_items if id(item) not in sold] + new
+
+    return type(profile)(**settings)
+
+def parse_date(text):
+    """Parse a YYYY-MM-DD date"""
+    return datetime.strptime(text, "%Y-%m-%d")
+
+def parse_range(text):
+    """Parse "N" or "LOW-HIGH" into a (low, high) tuple"""
+    low, _, high = str(text).partition("-")
+    return int(low), int(high or low)
+
+SCALE_SETTINGS = ("start_date", "end_date", "vouchers_per_day", "customers", "suppliers", "items")
+
+def load_config(path):
+    """Read scale knobs from a JSON file, in configure_profile() form
+
+    Keys: start_date, end_date (YYYY-MM-DD), vouchers_per_day ("N",
+    "LOW-HIGH" or [low, high]), customers, suppliers, items.
+    """
+    with open(path, encoding="utf-8") as f:
+        return parse_config(json.load(f), path)
+
+def parse_config(config, source):
+    """Convert JSON scale knobs (see load_config()) to configure_profile() form"""
+    config = dict(config)
+    unknown = set(config) - set(SCALE_SETTINGS)
+    if unknown:
+        raise ValueError(f"unknown scale setting(s) in {source}: {', '.join(sorted(unknown))}")
+    for key in ("start_date", "end_date"):
+        if key in config:
+            config[key] = parse_date(config[key])
+    if isinstance(config.get("vouchers_per_day"), (str, int)):
+        config["vouchers_per_day"] = parse_range(config["vouchers_per_day"])
+    return config
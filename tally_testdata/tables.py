@@ -0,0 +1,196 @@
+"""
+Columnar export of the generated vouchers
+
+Next to vouchers.xml, the same run can write two tables for analytics
+jobs, so nothing has to parse the XML again:
+
+- vouchers: voucher_key, voucher_type, number, date, party, narration
+- ledger_entries: voucher_key, line, ledger, amount, tax_type, hsn_sac
+
+voucher_key is "Sales/4521", type and number. tax_type is the GST ledger's
+tax type (CGST, SGST, IGST) from the profile's ledgers, as in masters.xml,
+and empty for other ledgers. Rows come from the same
+voucher records the XML is rendered from (table_row() runs next to the
+renderer, in the worker for --workers) and are written in row groups of
+ROW_GROUP_SIZE vouchers: Parquet or Arrow IPC when pyarrow is installed,
+CSV otherwise. Amounts are rupees with two decimals (decimal128(18, 2) in
+Parquet and Arrow, text in CSV), positive for debit like the XML.
+
+    python -m tally_testdata companies/trading-company --seed 1 --tables tables/
+    python -m tally_testdata companies/trading-company --seed 1 --tables tables/ --tables-format csv
+"""
+
+import csv
+import os
+
+from tally_testdata import engine
+
+FORMATS = ("parquet", "arrow", "csv")
+FILE_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+# Vouchers per row group (and per CSV write)
+ROW_GROUP_SIZE = 65536
+
+VOUCHER_COLUMNS = ("voucher_key", "voucher_type", "number", "date", "party", "narration")
+ENTRY_COLUMNS = ("voucher_key", "line", "ledger", "amount", "tax_type", "hsn_sac")
+
+def pyarrow_available():
+    """Check whether pyarrow can be imported"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def default_format():
+    """Return "parquet" when pyarrow is installed, else the CSV fallback"""
+    return "parquet" if pyarrow_available() else "csv"
+
+def party_of(record):
+    """Return the party of a voucher record: the entry with bills, or an invoice's last entry"""
+    voucher_type, _, _, entries = record[:4]
+    for entry in entries:
+        if "bills" in entry:
+            return entry["name"]
+    if voucher_type in ("Sales", "Purchase"):
+        return entries[-1]["name"]
+    return ""
+
+def ledger_tax_types(profile):
+    """Return {ledger name: tax type} for the profile's GST ledgers (TAXTYPE in masters.xml)"""
+    return {ledger["name"]: ledger["tax_type"]
+            for ledgers in profile.LEDGERS.values() for ledger in ledgers if "tax_type" in ledger}
+
+def table_row(record, tax_types):
+    """Return what the tables need of a record, compact enough to ship back from a worker
+
+    (party, narration, ((ledger, amount in paise, tax type, HSN/SAC), ...)),
+    with tax types from ledger_tax_types(); stock journal lines have no
+    ledger and no row.
+    """
+    entries = tuple((entry["name"], entry["amount"], tax_types.get(entry["name"], ""),
+                     entry.get("hsn") or entry.get("sac") or "")
+                    for entry in record[3] if "name" in entry)
+    return party_of(record), record[4], entries
+
+class TableWriter:
+    """Write vouchers and ledger entries tables in row groups
+
+    add() takes each voucher as the XML writer gets it (final number and
+    all); close() flushes the last row group and returns the files written.
+    """
+
+    def __init__(self, directory, fmt=None):
+        self.format = fmt or default_format()
+        if self.format not in FORMATS:
+            raise ValueError(f"unknown table format: {self.format}")
+        if self.format != "csv" and not pyarrow_available():
+            raise ValueError(f"{self.format} tables require pyarrow (pip install pyarrow)")
+        os.makedirs(directory, exist_ok=True)
+        suffix = FILE_SUFFIXES[self.format]
+        self.paths = [os.path.join(directory, "vouchers" + suffix),
+                      os.path.join(directory, "ledger_entries" + suffix)]
+        self.vouchers = {column: [] for column in VOUCHER_COLUMNS}
+        self.entries = {column: [] for column in ENTRY_COLUMNS}
+        self.rows = 0
+        self.entry_rows = 0
+        self._pending = 0
+        self._writers = None
+        self._files = []
+
+    def add(self, voucher_type, date, number, row):
+        """Buffer one voucher (row from table_row()), writing a row group when full"""
+        party, narration, entries = row
+        key = f"{voucher_type}/{number}"
+        vouchers = self.vouchers
+        vouchers["voucher_key"].append(key)
+        vouchers["voucher_type"].append(voucher_type)
+        vouchers["number"].append(number)
+        vouchers["date"].append(date)
+        vouchers["party"].append(party)
+        vouchers["narration"].append(narration)
+        columns = self.entries
+        for line, (ledger, amount, tax_type, hsn_sac) in enumerate(entries, 1):
+            columns["voucher_key"].append(key)
+            columns["line"].append(line)
+            columns["ledger"].append(ledger)
+            columns["amount"].append(amount)
+            columns["tax_type"].append(tax_type)
+            columns["hsn_sac"].append(hsn_sac)
+        self.rows += 1
+        self.entry_rows += len(entries)
+        self._pending += 1
+        if self._pending >= ROW_GROUP_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one row group of each table"""
+        if self._writers is None:
+            self._open()
+        if self._pending:
+            if self.format == "csv":
+                self._write_csv()
+            else:
+                self._write_arrow()
+        for columns in (self.vouchers, self.entries):
+            for values in columns.values():
+                values.clear()
+        self._pending = 0
+
+    def close(self):
+        """Flush the last rows, close both files and return their paths"""
+        self.flush()
+        if self.format == "csv":
+            for f in self._files:
+                f.close()
+        else:
+            for writer in self._writers:
+                writer.close()
+        return self.paths
+
+    def _open(self):
+        if self.format == "csv":
+            self._files = [open(path, "w", encoding="utf-8", newline="") for path in self.paths]
+            self._writers = [csv.writer(f) for f in self._files]
+            self._writers[0].writerow(VOUCHER_COLUMNS)
+            self._writers[1].writerow(ENTRY_COLUMNS)
+            return
+        import pyarrow as pa
+
+        self._schemas = [
+            pa.schema([("voucher_key", pa.string()), ("voucher_type", pa.string()), ("number", pa.int64()),
+                       ("date", pa.date32()), ("party", pa.string()), ("narration", pa.string())]),
+            pa.schema([("voucher_key", pa.string()), ("line", pa.int32()), ("ledger", pa.string()),
+                       ("amount", pa.decimal128(18, 2)), ("tax_type", pa.string()),
+                       ("hsn_sac", pa.string())]),
+        ]
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            self._writers = [pq.ParquetWriter(path, schema) for path, schema in zip(self.paths, self._schemas)]
+        else:
+            self._writers = [pa.ipc.new_file(path, schema) for path, schema in zip(self.paths, self._schemas)]
+
+    def _write_csv(self):
+        vouchers = self.vouchers
+        dates = [date.strftime("%Y-%m-%d") for date in vouchers["date"]]
+        self._writers[0].writerows(zip(vouchers["voucher_key"], vouchers["voucher_type"], vouchers["number"],
+                                       dates, vouchers["party"], vouchers["narration"]))
+        entries = self.entries
+        amounts = [engine.format_amount(amount) for amount in entries["amount"]]
+        self._writers[1].writerows(zip(entries["voucher_key"], entries["line"], entries["ledger"], amounts,
+                                       entries["tax_type"], entries["hsn_sac"]))
+
+    def _write_arrow(self):
+        import decimal
+
+        import pyarrow as pa
+
+        vouchers = dict(self.vouchers, date=[date.date() for date in self.vouchers["date"]])
+        entries = dict(self.entries,
+                       amount=[decimal.Decimal(amount).scaleb(-2) for amount in self.entries["amount"]])
+        for writer, schema, columns in zip(self._writers, self._schemas, (vouchers, entries)):
+            table = pa.Table.from_pydict(columns, schema=schema)
+            if self.format == "parquet":
+                writer.write_table(table)
+            else:
+                writer.write_table(table, max_chunksize=ROW_GROUP_SIZE * 8)
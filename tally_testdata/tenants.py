@@ -0,0 +1,459 @@
+"""
+Generate vouchers for many tenant companies in one run
+
+Each tenant is a company profile (a companies/ folder) under its own name,
+GSTIN and state, with its own seed and scale knobs. The tenants are
+scheduled across one process pool, so the interpreter starts and imports
+the generator once per worker rather than once per company, and each
+tenant is written to its own directory:
+
+    tenants/acme-traders-pvt-ltd/vouchers.xml (+ masters.xml, tables/)
+    tenants/tenants.json                      per-tenant results and totals
+
+--max-memory caps the workers' combined memory: a tenant only starts while
+the running tenants plus one more fit under the cap, counting each at the
+highest peak RSS any worker has reported so far (--job-memory until the
+first one finishes). While they run, an aggregate progress line shows
+vouchers written by all workers against the expected total.
+
+The tenants come from a JSON file, a list of companies or {"defaults":
+{...}, "companies": [...]} where each company takes profile (folder,
+relative to the JSON file), name, gstin, state, seed, output (directory
+name) and the scale knobs of --config (start_date, customers, ...):
+
+    python -m tally_testdata.tenants tenants.json -o tenants/ --max-memory 4096
+    python -m tally_testdata.tenants --synthetic 50 --end-date 2023-06-30 -o tenants/ --masters
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from tally_testdata import engine, masters, profiling, synthetic, tables
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROFILES = (os.path.join(REPO_ROOT, "companies", "trading-company"),
+                    os.path.join(REPO_ROOT, "companies", "services-company"))
+
+# Tenant settings besides the scale knobs
+TENANT_SETTINGS = ("profile", "name", "gstin", "state", "seed", "output")
+
+# Memory assumed per running tenant until a worker reports its peak RSS
+JOB_MEMORY_MB = 300
+
+# Seconds between aggregate progress lines
+PROGRESS_SECONDS = 5.0
+
+def slug(name):
+    """Return a directory name for a company name"""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "company"
+
+def check_gstin(gstin, state):
+    """Raise ValueError unless gstin looks like a GSTIN registered in state
+
+    The check digit isn't verified: the sample companies' GSTINs are made up.
+    """
+    if len(gstin) != 15 or any(c not in synthetic.GSTIN_VALUES for c in gstin):
+        raise ValueError(f"malformed GSTIN {gstin}")
+    if gstin[:2] != synthetic.STATE_CODES[state]:
+        raise ValueError(f"GSTIN {gstin} is not registered in {state} ({synthetic.STATE_CODES[state]})")
+
+def state_of(gstin):
+    """Return the state whose code starts gstin"""
+    for state, code in synthetic.STATE_CODES.items():
+        if gstin.startswith(code):
+            return state
+    raise ValueError(f"GSTIN {gstin} has no valid state code")
+
+def make_tenant(settings, source, base_seed, position):
+    """Return a checked tenant dict from one company's settings
+
+    A state without a GSTIN gets a generated GSTIN, a GSTIN without a
+    state its state; with neither, the profile's own are kept.
+    """
+    knobs = {k: v for k, v in settings.items() if k not in TENANT_SETTINGS}
+    knobs = synthetic.parse_config(knobs, source)
+    if "profile" not in settings:
+        raise ValueError(f"{source}: company {position + 1} has no profile")
+    profile_dir = settings["profile"]
+    if not os.path.exists(os.path.join(profile_dir, engine.PROFILE_FILE)):
+        raise ValueError(f"{source}: no {engine.PROFILE_FILE} in {profile_dir}")
+
+    name = settings.get("name")
+    state = settings.get("state")
+    gstin = settings.get("gstin")
+    if state is not None and state not in synthetic.STATE_CODES:
+        raise ValueError(f"{source}: unknown state {state!r}")
+    if gstin is not None:
+        gstin = gstin.upper()
+        state = state or state_of(gstin)
+        check_gstin(gstin, state)
+    elif state is not None:
+        gstin = synthetic.make_gstin(state, name or "", random.Random(f"tenant:{name}"))
+    return {
+        "profile": os.path.abspath(profile_dir),
+        "name": name,
+        "gstin": gstin,
+        "state": state,
+        "seed": settings.get("seed", base_seed + position),
+        "output": settings.get("output"),
+        "knobs": knobs,
+    }
+
+def load_tenants(path, base_seed):
+    """Read the tenant list from a JSON file (see the module docstring)"""
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    if isinstance(spec, list):
+        spec = {"companies": spec}
+    defaults = spec.get("defaults", {})
+    here = os.path.dirname(os.path.abspath(path))
+    tenants = []
+    for position, company in enumerate(spec.get("companies", [])):
+        settings = dict(defaults, **company)
+        if "profile" in settings:
+            settings["profile"] = os.path.join(here, settings["profile"])
+        tenants.append(make_tenant(settings, path, base_seed, position))
+    return tenants
+
+def synthetic_tenants(count, profiles, base_seed):
+    """Return count tenants cycling through profiles, each with its own name, state and GSTIN
+
+    The list is the same for the same profiles whatever the count (the
+    first N of a longer list are the same), like synthetic parties.
+    """
+    rng = random.Random("synthetic:tenants")
+    tenants = []
+    for i in range(count):
+        name = (f"{rng.choice(synthetic.NAME_WORDS)} {rng.choice(synthetic.TRADE_WORDS)} {i + 1:04d} "
+                f"{rng.choice(synthetic.SUFFIXES)}")
+        state = rng.choice(list(synthetic.STATE_CODES))
+        tenants.append(make_tenant({"profile": profiles[i % len(profiles)], "name": name, "state": state,
+                                    "gstin": synthetic.make_gstin(state, name, rng)},
+                                   "--synthetic", base_seed, i))
+    return tenants
+
+def assign_outputs(tenants, directory):
+    """Give every tenant its own output directory under directory"""
+    seen = set()
+    for tenant in tenants:
+        base = tenant["output"] or slug(tenant["name"] or os.path.basename(tenant["profile"]))
+        name, n = base, 1
+        while name in seen:
+            n += 1
+            name = f"{base}-{n}"
+        seen.add(name)
+        tenant["output"] = os.path.join(directory, name)
+
+# Profiles loaded by this worker, by folder
+_profiles = {}
+
+# Vouchers written by every worker (a shared multiprocessing.Value)
+_progress = None
+
+def init_worker(progress):
+    """Process pool initializer: receive the shared progress counter"""
+    global _progress
+    _progress = progress
+
+def add_progress(vouchers):
+    """write_vouchers() progress callback: add to the shared counter"""
+    with _progress.get_lock():
+        _progress.value += vouchers
+
+def tenant_profile(tenant):
+    """Return the tenant's company profile with its name, GSTIN, state and scale knobs"""
+    profile = _profiles.get(tenant["profile"])
+    if profile is None:
+        profile = _profiles[tenant["profile"]] = engine.load_profile(tenant["profile"])
+    settings = vars(profile).copy()
+    for key, setting in (("name", "COMPANY_NAME"), ("gstin", "GSTIN")):
+        if tenant[key] is not None:
+            settings[setting] = tenant[key]
+    profile = type(profile)(**settings)
+    if tenant["knobs"] or tenant["state"] not in (None, profile.STATE):
+        # The state moves the parties too, so local sales stay local (CGST + SGST)
+        profile = synthetic.configure_profile(profile, state=tenant["state"], **tenant["knobs"])
+    return profile
+
+def expected_vouchers(tenant):
+    """Return about how many vouchers a tenant will get (business days x mean vouchers per day)"""
+    profile = tenant_profile(tenant)
+    low, high = profile.VOUCHERS_PER_DAY
+    return round(len(engine.get_date_range(profile)) * (low + high) / 2)
+
+def run_tenant(tenant, options):
+    """Generate one tenant's files (in a worker) and return its result"""
+    start = time.perf_counter()
+    profile = tenant_profile(tenant)
+    os.makedirs(tenant["output"], exist_ok=True)
+    suffix = {None: "", "gzip": ".gz", "zstd": ".zst"}[options["compress"]]
+    output_file = os.path.join(tenant["output"], "vouchers.xml" + suffix)
+
+    table_writer = None
+    if options["tables"]:
+        table_writer = tables.TableWriter(os.path.join(tenant["output"], "tables"), options["tables"])
+    total, size, _ = engine.write_vouchers(profile, output_file, seed=tenant["seed"], level=options["level"],
+                                           tables=table_writer, progress=add_progress)
+    if table_writer:
+        table_writer.close()
+    if options["masters"]:
+        masters.write_masters(profile, os.path.join(tenant["output"], "masters.xml" + suffix),
+                              level=options["level"])
+
+    return {
+        "name": profile.COMPANY_NAME,
+        "gstin": profile.GSTIN,
+        "state": profile.STATE,
+        "profile": tenant["profile"],
+        "seed": tenant["seed"],
+        "output": tenant["output"],
+        "vouchers": total,
+        "bytes": size,
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": profiling.peak_rss_mb(),
+    }
+
+def run_tenants(tenants, options, jobs, max_memory=None, job_memory=JOB_MEMORY_MB,
+                progress_seconds=PROGRESS_SECONDS, report=print):
+    """Generate every tenant across a pool of jobs workers; returns their results in tenant order
+
+    max_memory (MB) caps the combined peak RSS of the running tenants, as
+    estimated from the workers' reports. A tenant that fails gets an
+    "error" instead of counts. When a worker dies (the OOM killer), the
+    pool goes with it: the tenants that were running on it are rerun one
+    at a time on a new pool, and only the one whose worker dies again is
+    reported as killed.
+    """
+    context = get_context()
+    counter = context.Value("q", 0)
+    expected = sum(tenant["expected"] for tenant in tenants)
+    queue = deque(range(len(tenants)))
+    results = [None] * len(tenants)
+    running = {}
+    # Tenants that were running when a pool broke: they run alone until they finish
+    suspects = set()
+    pool = None
+    peaks = []
+    start = time.perf_counter()
+    next_report = start + progress_seconds
+
+    def can_start(i):
+        if not running:
+            return True
+        if i in suspects or not suspects.isdisjoint(running.values()):
+            return False
+        if max_memory is None:
+            return True
+        estimate = max(peaks) if peaks else job_memory
+        return (len(running) + 1) * estimate <= max_memory
+
+    def finish(i, result):
+        suspects.discard(i)
+        results[i] = result
+        if "error" in result:
+            report(f"✗ {result['name']}: {result['error']}")
+        else:
+            # A worker's peak covers every tenant it ran, so this errs on the high side
+            if result["peak_rss_mb"] is not None:
+                peaks.append(result["peak_rss_mb"])
+            report(f"✓ {result['name']}: {result['vouchers']} vouchers in {result['seconds']:.1f}s "
+                   f"→ {result['output']}")
+
+    def failed(i, error):
+        return {"name": tenants[i]["name"], "output": tenants[i]["output"], "error": error}
+
+    try:
+        while queue or running:
+            while queue and len(running) < jobs and can_start(queue[0]):
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=init_worker,
+                                               initargs=(counter,))
+                i = queue.popleft()
+                running[pool.submit(run_tenant, tenants[i], options)] = i
+
+            done, _ = wait(running, timeout=max(0.0, next_report - time.perf_counter()),
+                           return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    continue
+                except Exception as e:
+                    result = failed(running[future], f"{type(e).__name__}: {e}")
+                finish(running.pop(future), result)
+
+            if broken:
+                # Settle every future of the dead pool, keeping the tenants that finished first
+                pool.shutdown(cancel_futures=True)
+                pool = None
+                lost = []
+                for future, i in running.items():
+                    error = None if future.cancelled() else future.exception()
+                    if future.cancelled() or isinstance(error, BrokenProcessPool):
+                        lost.append(i)
+                    elif error is not None:
+                        finish(i, failed(i, f"{type(error).__name__}: {error}"))
+                    else:
+                        finish(i, future.result())
+                running.clear()
+                if len(lost) == 1:
+                    finish(lost[0], failed(lost[0], "worker process died (out of memory?)"))
+                else:
+                    report(f"  A worker process died: rerunning {len(lost)} companies one at a time")
+                    suspects.update(lost)
+                    queue.extendleft(reversed(lost))
+
+            now = time.perf_counter()
+            if now >= next_report:
+                report(format_progress(counter.value, expected, now - start,
+                                       sum(r is not None for r in results), len(tenants), len(running)))
+                next_report = now + progress_seconds
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return results
+
+def format_progress(vouchers, expected, seconds, done, total, running):
+    """Return the aggregate progress line"""
+    rate = vouchers / seconds if seconds else 0
+    share = min(vouchers / expected, 1) if expected else 1
+    line = (f"  {done}/{total} companies done, {running} running: {vouchers} of ~{expected} vouchers "
+            f"({share * 100:.0f}%), {rate:.0f}/s")
+    if rate and vouchers < expected:
+        line += f", ~{(expected - vouchers) / rate:.0f}s left"
+    return line
+
+def write_summary(results, path, seconds):
+    """Write per-tenant results and totals as JSON"""
+    done = [r for r in results if "error" not in r]
+    vouchers = sum(r["vouchers"] for r in done)
+    summary = {
+        "seconds": round(seconds, 3),
+        "companies": len(results),
+        "failed": len(results) - len(done),
+        "vouchers": vouchers,
+        "bytes": sum(r["bytes"] for r in done),
+        "vouchers_per_sec": round(vouchers / seconds, 1) if seconds else None,
+        "peak_worker_rss_mb": max((r["peak_rss_mb"] for r in done if r["peak_rss_mb"] is not None),
+                                  default=None),
+        "tenants": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+        f.write("\n")
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate vouchers for many tenant companies in one run")
+    parser.add_argument("spec", nargs="?", help="JSON file listing the tenant companies")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="generate N tenants with synthetic names, states and GSTINs instead")
+    parser.add_argument("--profile", action="append", metavar="DIR",
+                        help="company folder for --synthetic tenants, repeatable "
+                             "(default: the trading and services companies)")
+    parser.add_argument("-o", "--output-dir", default="tenants",
+                        help="directory for the tenants' folders and tenants.json (default: tenants)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--max-memory", type=float, metavar="MB",
+                        help="cap on the combined memory of running tenants (default: no cap)")
+    parser.add_argument("--job-memory", type=float, default=JOB_MEMORY_MB, metavar="MB",
+                        help=f"memory assumed per tenant until the first one finishes (default: {JOB_MEMORY_MB})")
+    parser.add_argument("--seed", type=int,
+                        help="base seed: tenant i gets seed + i unless it sets its own (default: random)")
+    parser.add_argument("--compress", choices=("gzip", "zstd"), help="compress each tenant's files")
+    parser.add_argument("--compress-level", type=int, metavar="N", help="compression level")
+    parser.add_argument("--masters", action="store_true", help="also write each tenant's masters.xml")
+    parser.add_argument("--tables", action="store_true",
+                        help="also write each tenant's vouchers and ledger entries tables to tables/")
+    parser.add_argument("--tables-format", choices=tables.FORMATS,
+                        help="format of the tables (default: parquet if pyarrow is installed, else csv)")
+    parser.add_argument("--start-date", type=synthetic.parse_date, metavar="YYYY-MM-DD",
+                        help="override every tenant's start date")
+    parser.add_argument("--end-date", type=synthetic.parse_date, metavar="YYYY-MM-DD",
+                        help="override every tenant's end date")
+    parser.add_argument("--vouchers-per-day", type=synthetic.parse_range, metavar="N[-M]",
+                        help="override every tenant's vouchers per business day")
+    parser.add_argument("--progress-seconds", type=float, default=PROGRESS_SECONDS, metavar="S",
+                        help=f"seconds between progress lines (default: {PROGRESS_SECONDS:.0f})")
+    args = parser.parse_args(argv)
+
+    if (args.spec is None) == (args.synthetic is None):
+        parser.error("give a tenants JSON file or --synthetic N")
+    if args.synthetic is not None and args.synthetic < 1:
+        parser.error("--synthetic must be at least 1")
+    if args.profile and args.synthetic is None:
+        parser.error("--profile only applies to --synthetic")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.max_memory is not None and args.max_memory <= 0:
+        parser.error("--max-memory must be positive")
+    if args.tables_format and not args.tables:
+        parser.error("--tables-format requires --tables")
+    if args.tables_format in ("parquet", "arrow") and not tables.pyarrow_available():
+        parser.error(f"{args.tables_format} tables require pyarrow (pip install pyarrow)")
+    if args.compress == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            parser.error("zstd output requires zstandard (pip install zstandard)")
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    try:
+        if args.spec:
+            tenants = load_tenants(args.spec, seed)
+        else:
+            tenants = synthetic_tenants(args.synthetic, args.profile or DEFAULT_PROFILES, seed)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not tenants:
+        parser.error(f"{args.spec} lists no companies")
+    for tenant in tenants:
+        for key in ("start_date", "end_date", "vouchers_per_day"):
+            if getattr(args, key) is not None:
+                tenant["knobs"][key] = getattr(args, key)
+    assign_outputs(tenants, args.output_dir)
+    for tenant in tenants:
+        try:
+            tenant["expected"] = expected_vouchers(tenant)
+        except ValueError as e:
+            parser.error(f"{tenant['name'] or tenant['profile']}: {e}")
+
+    options = {
+        "compress": args.compress,
+        "level": args.compress_level,
+        "masters": args.masters,
+        "tables": (args.tables_format or tables.default_format()) if args.tables else None,
+    }
+    jobs = min(args.jobs, len(tenants))
+    cap = f", at most {args.max_memory:.0f} MB" if args.max_memory else ""
+    print(f"Generating {len(tenants)} companies (~{sum(t['expected'] for t in tenants)} vouchers) "
+          f"with {jobs} workers{cap}, base seed {seed}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    start = time.perf_counter()
+    results = run_tenants(tenants, options, jobs, args.max_memory, args.job_memory, args.progress_seconds)
+    seconds = time.perf_counter() - start
+    summary_file = os.path.join(args.output_dir, "tenants.json")
+    summary = write_summary(results, summary_file, seconds)
+
+    print(f"✓ {summary['vouchers']} vouchers for {summary['companies'] - summary['failed']} companies "
+          f"in {seconds:.1f}s ({summary['vouchers_per_sec'] or 0:.0f}/s), "
+          f"{summary['bytes'] / (1024 * 1024):.1f} MB, peak worker RSS {profiling.format_mb(summary['peak_worker_rss_mb'])}")
+    print(f"✓ Summary: {summary_file}")
+    if summary["failed"]:
+        sys.exit(f"✗ {summary['failed']} companies failed")
+
+if __name__ == "__main__":
+    main()
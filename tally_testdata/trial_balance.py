@@ -0,0 +1,224 @@
+"""
+Expected trial balance and monthly ledger movements for a voucher file
+
+Reads the opening balance of every ledger from masters.xml, then streams
+the voucher files once, adding each ledger entry's AMOUNT to a dict keyed
+by (ledger, month). Memory depends on ledgers x months, never on the number
+of vouchers, so 100M ledger entries stream through like 100. The result is
+what Tally's Trial Balance and each ledger's monthly summary should show
+after import, written as CSV or JSON so reconciliation is a diff.
+
+Amounts follow the voucher convention: positive is debit, negative credit.
+
+    python -m tally_testdata.trial_balance vouchers.xml --masters masters.xml -o trial-balance.csv
+    python -m tally_testdata.trial_balance vouchers-*.xml.gz -o trial-balance.json
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+from tally_testdata import engine, validate
+
+# The voucher date, or a ledger entry's name and its own amount (the first
+# AMOUNT after LEDGERNAME; bill allocations come after it)
+TOKEN_RE = re.compile(rb"<DATE>(\d{8})</DATE>|<LEDGERNAME>([^<]*)</LEDGERNAME>.*?<AMOUNT>([^<]*)</AMOUNT>",
+                      re.S)
+
+def load_openings(path):
+    """Return {ledger: (parent group, opening balance in paise)} from masters.xml, in import order"""
+    openings = {}
+    with validate.open_input(path) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == "LEDGER":
+                opening = (elem.findtext("OPENINGBALANCE") or "0").strip()
+                openings[elem.get("NAME")] = (elem.get("PARENT") or "", engine.parse_amount(opening))
+                elem.clear()
+    return openings
+
+class LedgerTotals:
+    """Debit and credit totals per (ledger, month), added up one file at a time"""
+
+    def __init__(self):
+        self.moves = {}
+        self.entries = 0
+        self.vouchers = 0
+        self.first_date = None
+        self.last_date = None
+
+    def add_file(self, path):
+        """Stream one voucher file into the totals"""
+        moves = self.moves
+        amount_paise = validate.amount_paise
+        month = b""
+        pending = b""
+        with validate.open_input(path) as f:
+            while True:
+                chunk = f.read(validate.CHUNK_SIZE)
+                data = pending + chunk
+                # Only whole vouchers: a date and its entries are never split
+                if chunk:
+                    close = data.rfind(validate.VOUCHER_END)
+                    end = close + len(validate.VOUCHER_END) if close >= 0 else 0
+                else:
+                    end = len(data)
+                for date, name, amount in TOKEN_RE.findall(data, 0, end):
+                    if date:
+                        month = date[:6]
+                        self.vouchers += 1
+                        if self.first_date is None or date < self.first_date:
+                            self.first_date = date
+                        if self.last_date is None or date > self.last_date:
+                            self.last_date = date
+                        continue
+                    paise = amount_paise(amount)
+                    totals = moves.get((name, month))
+                    if totals is None:
+                        totals = moves[(name, month)] = [0, 0]
+                    if paise >= 0:
+                        totals[0] += paise
+                    else:
+                        totals[1] -= paise
+                    self.entries += 1
+                pending = data[end:]
+                if not chunk:
+                    break
+
+    def report(self, openings):
+        """Return {"ledgers": [...], "months": [...], "totals": {...}} with amounts in paise
+
+        Ledgers come in masters order, then any ledger masters.xml lacks.
+        """
+        by_ledger = {}
+        months = []
+        for (raw_name, month), (debit, credit) in sorted(self.moves.items()):
+            name = validate.text_value(raw_name)
+            totals = by_ledger.setdefault(name, [0, 0])
+            totals[0] += debit
+            totals[1] += credit
+            months.append({"ledger": name, "month": f"{month[:4].decode()}-{month[4:].decode()}",
+                           "debit": debit, "credit": credit, "net": debit - credit})
+
+        ledgers = []
+        names = list(openings) + sorted(name for name in by_ledger if name not in openings)
+        for name in names:
+            group, opening = openings.get(name, ("", 0))
+            debit, credit = by_ledger.get(name, (0, 0))
+            ledgers.append({"ledger": name, "group": group, "in_masters": name in openings,
+                            "opening": opening, "debit": debit, "credit": credit,
+                            "closing": opening + debit - credit})
+        order = {name: i for i, name in enumerate(names)}
+        months.sort(key=lambda row: (order[row["ledger"]], row["month"]))
+
+        totals = {
+            "vouchers": self.vouchers,
+            "entries": self.entries,
+            "first_date": self.first_date.decode() if self.first_date else None,
+            "last_date": self.last_date.decode() if self.last_date else None,
+            "opening_debit": sum(row["opening"] for row in ledgers if row["opening"] > 0),
+            "opening_credit": -sum(row["opening"] for row in ledgers if row["opening"] < 0),
+            "debit": sum(row["debit"] for row in ledgers),
+            "credit": sum(row["credit"] for row in ledgers),
+            "closing_debit": sum(row["closing"] for row in ledgers if row["closing"] > 0),
+            "closing_credit": -sum(row["closing"] for row in ledgers if row["closing"] < 0),
+            "unknown_ledgers": sum(1 for row in ledgers if not row["in_masters"]),
+        }
+        # What Tally shows as "Difference in opening balances"
+        totals["opening_difference"] = totals["opening_debit"] - totals["opening_credit"]
+        return {"ledgers": ledgers, "months": months, "totals": totals}
+
+def split_dr_cr(paise):
+    """Return (debit, credit) amount strings for a signed balance, one of them empty"""
+    if paise > 0:
+        return engine.format_amount(paise), ""
+    if paise < 0:
+        return "", engine.format_amount(-paise)
+    return "", ""
+
+def write_csv(report, path):
+    """Write the trial balance to path and the monthly movements next to it (-monthly.csv)"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ledger", "group", "opening_dr", "opening_cr", "debit", "credit",
+                         "closing_dr", "closing_cr"])
+        for row in report["ledgers"]:
+            writer.writerow([row["ledger"], row["group"], *split_dr_cr(row["opening"]),
+                             engine.format_amount(row["debit"]), engine.format_amount(row["credit"]),
+                             *split_dr_cr(row["closing"])])
+        totals = report["totals"]
+        writer.writerow(["Total", "", engine.format_amount(totals["opening_debit"]),
+                         engine.format_amount(totals["opening_credit"]), engine.format_amount(totals["debit"]),
+                         engine.format_amount(totals["credit"]), engine.format_amount(totals["closing_debit"]),
+                         engine.format_amount(totals["closing_credit"])])
+
+    monthly = (path[:-4] if path.endswith(".csv") else path) + "-monthly.csv"
+    with open(monthly, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ledger", "month", "debit", "credit", "net"])
+        for row in report["months"]:
+            writer.writerow([row["ledger"], row["month"], engine.format_amount(row["debit"]),
+                             engine.format_amount(row["credit"]), engine.format_amount(row["net"])])
+    return [path, monthly]
+
+def write_json(report, path):
+    """Write the whole report as JSON, amounts formatted like vouchers.xml"""
+    def formatted(rows, fields):
+        return [dict(row, **{k: engine.format_amount(row[k]) for k in fields}) for row in rows]
+
+    amounts = ("opening_debit", "opening_credit", "debit", "credit", "closing_debit", "closing_credit",
+               "opening_difference")
+    data = {
+        "totals": dict(report["totals"], **{k: engine.format_amount(report["totals"][k]) for k in amounts}),
+        "ledgers": formatted(report["ledgers"], ("opening", "debit", "credit", "closing")),
+        "months": formatted(report["months"], ("debit", "credit", "net")),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    return [path]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute the expected trial balance of voucher files")
+    parser.add_argument("files", nargs="+", help="voucher files (.xml or .xml.gz), e.g. every split part")
+    parser.add_argument("--masters", help="masters.xml with the opening balances "
+                                          "(default: masters.xml next to the first file)")
+    parser.add_argument("-o", "--output", default="trial-balance.csv",
+                        help="trial-balance.csv (plus -monthly.csv) or a .json file (default: trial-balance.csv)")
+    args = parser.parse_args(argv)
+
+    masters_file = args.masters or validate.default_masters(args.files[0])
+    try:
+        openings = load_openings(masters_file)
+    except (OSError, ET.ParseError) as e:
+        parser.error(f"cannot read masters {masters_file}: {e}")
+
+    totals = LedgerTotals()
+    for path in args.files:
+        try:
+            totals.add_file(path)
+        except (OSError, ValueError) as e:
+            sys.exit(f"✗ {path}: {e}")
+    report = totals.report(openings)
+
+    write = write_json if args.output.endswith(".json") else write_csv
+    written = write(report, args.output)
+    summary = report["totals"]
+    print(f"✓ {summary['entries']} ledger entries in {summary['vouchers']} vouchers "
+          f"({summary['first_date']} to {summary['last_date']}), {len(report['ledgers'])} ledgers")
+    print(f"✓ Closing balances: Dr {engine.format_amount(summary['closing_debit'])}, "
+          f"Cr {engine.format_amount(summary['closing_credit'])}")
+    if summary["opening_difference"]:
+        print(f"  Difference in opening balances: {engine.format_amount(summary['opening_difference'])} "
+              f"(Tally shows the same in the Trial Balance)")
+    if summary["debit"] != summary["credit"]:
+        print(f"✗ Vouchers don't balance: debits {engine.format_amount(summary['debit'])}, "
+              f"credits {engine.format_amount(summary['credit'])}")
+    if summary["unknown_ledgers"]:
+        print(f"  {summary['unknown_ledgers']} ledgers used by vouchers are missing from {masters_file}")
+    print(f"✓ Written to {', '.join(written)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Streaming validator for generated voucher files
+
+Checks vouchers.xml (or split parts, plain or .gz) without importing it
+into Tally. The file is read in chunks, so memory stays constant apart
+from a bitmap of the voucher numbers seen so far. For each VOUCHER it
+checks:
+
+- the ALLLEDGERENTRIES.LIST amounts sum to exactly zero (in paise)
+- every LEDGERNAME exists in masters.xml
+- DATE is a valid date inside the company's date range
+- VOUCHERNUMBER is unique per VOUCHERTYPENAME (across all files given)
+- GST follows is_interstate(): IGST for parties in another state, CGST and
+  SGST for parties in the company's state
+
+Violations are reported with the byte offset of the <VOUCHER> tag (in the
+uncompressed data for .gz files).
+
+    python -m tally_testdata.validate vouchers.xml --company companies/trading-company
+"""
+
+import argparse
+import gzip
+import html
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from xml.parsers import expat
+
+from tally_testdata import engine, synthetic
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Voucher boundaries, the voucher fields, and the start of each ledger entry
+VOUCHER_START_RE = re.compile(rb"<VOUCHER[\s>]")
+VOUCHER_END = b"</VOUCHER>"
+FIELD_RE = re.compile(rb"<(VOUCHERTYPENAME|DATE|VOUCHERNUMBER)>([^<]*)<")
+ENTRY_START = b"<ALLLEDGERENTRIES.LIST>"
+ENTRY_RE = re.compile(rb"<LEDGERNAME>([^<]*)<.*?<AMOUNT>([^<]*)<", re.S)
+
+def open_input(path):
+    """Open a plain or gzip-compressed file for binary reading"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+def text_value(raw):
+    """Decode element text, resolving entities only when there are any"""
+    text = raw.decode("utf-8")
+    return html.unescape(text) if "&" in text else text
+
+def amount_paise(raw):
+    """Parse an AMOUNT to integer paise, quickly for the usual "1234.50" form"""
+    if raw[-3:-2] == b".":
+        return int(raw[:-3] + raw[-2:])
+    return engine.parse_amount(raw.decode("utf-8"))
+
+def load_masters(path):
+    """Read ledger names, party states and GST tax types from masters.xml
+
+    Returns (ledger names, {party: state}, {GST ledger: tax type}).
+    """
+    ledgers = set()
+    states = {}
+    tax_types = {}
+    with open_input(path) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == "LEDGER":
+                name = elem.get("NAME")
+                ledgers.add(name)
+                state = elem.findtext("STATENAME")
+                if state:
+                    states[name] = state
+                tax_type = elem.findtext("TAXTYPE")
+                if tax_type:
+                    tax_types[name] = tax_type
+                elem.clear()
+    return ledgers, states, tax_types
+
+class VoucherValidator:
+    """Check every VOUCHER in one or more files, collecting violations
+
+    Each chunk of a file goes through expat (with no Python callbacks, so
+    at C speed) to prove the file is well-formed, and is cut into complete
+    <VOUCHER> blocks whose checked fields are pulled out with precompiled
+    regular expressions. Only the first LEDGERNAME and AMOUNT of each
+    ledger entry are read, so lists nested inside an entry after its own
+    amount don't count towards the total.
+    """
+
+    def __init__(self, ledgers, party_states, tax_types, company_state=None,
+                 start_date=None, end_date=None, max_errors=None):
+        self.ledgers = ledgers
+        self.party_states = party_states
+        self.tax_types = tax_types
+        self.company_state = company_state
+        self.start = start_date.strftime("%Y%m%d") if start_date else None
+        self.end = end_date.strftime("%Y%m%d") if end_date else None
+        self.max_errors = max_errors
+        self.seen_numbers = {}
+        self.valid_dates = set()
+        self._names = {}
+        self.vouchers = 0
+        self.errors = []
+        self.error_count = 0
+
+    def error(self, path, offset, voucher_type, number, message):
+        """Record one violation"""
+        self.error_count += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append((path, offset, voucher_type, number, message))
+
+    def seen_before(self, voucher_type, number):
+        """Record a voucher number, returning True if the type already had it
+
+        Numeric voucher numbers are kept as bits in a bytearray per type
+        (1M vouchers take 125 KB); anything else falls back to a set.
+        """
+        bits, others = self.seen_numbers.setdefault(voucher_type, (bytearray(), set()))
+        if not number.isdigit():
+            if number in others:
+                return True
+            others.add(number)
+            return False
+
+        n = int(number)
+        byte, mask = n >> 3, 1 << (n & 7)
+        if byte >= len(bits):
+            bits.extend(bytes(max(byte + 1 - len(bits), len(bits))))
+        if bits[byte] & mask:
+            return True
+        bits[byte] |= mask
+        return False
+
+    def check_voucher(self, path, offset, body):
+        """Run every check on one voucher; body is the bytes of <VOUCHER>...</VOUCHER>"""
+        self.vouchers += 1
+        head, *entries = body.split(ENTRY_START)
+        fields = dict(FIELD_RE.findall(head))
+        voucher_type = text_value(fields.get(b"VOUCHERTYPENAME", b""))
+        number = text_value(fields.get(b"VOUCHERNUMBER", b""))
+
+        def error(message):
+            self.error(path, offset, voucher_type, number, message)
+
+        if not voucher_type:
+            error("missing VOUCHERTYPENAME")
+        if not number:
+            error("missing VOUCHERNUMBER")
+        elif self.seen_before(voucher_type, number):
+            error(f"duplicate VOUCHERNUMBER {number} for {voucher_type}")
+
+        date = fields.get(b"DATE", b"").decode("utf-8")
+        if date not in self.valid_dates:
+            try:
+                datetime.strptime(date, "%Y%m%d")
+            except ValueError:
+                error(f"invalid DATE {date!r}")
+            else:
+                # Only a few thousand distinct dates: parse each one once
+                self.valid_dates.add(date)
+        if (self.start and date < self.start) or (self.end and date > self.end):
+            error(f"DATE {date} outside {self.start}-{self.end}")
+
+        total = 0
+        party_state = None
+        tax_types = set()
+        names = self._names
+        for entry in entries:
+            match = ENTRY_RE.search(entry)
+            if match is None:
+                error("ledger entry without LEDGERNAME and AMOUNT")
+                continue
+            raw_name, amount = match.groups()
+            # Ledger names repeat constantly; decode each one once
+            name = names.get(raw_name)
+            if name is None:
+                name = names[raw_name] = text_value(raw_name)
+            if name not in self.ledgers:
+                error(f"unknown ledger {name!r}")
+            try:
+                total += amount_paise(amount)
+            except ValueError:
+                error(f"invalid AMOUNT {amount.decode()!r} for {name!r}")
+            if name in self.party_states:
+                party_state = self.party_states[name]
+            elif name in self.tax_types:
+                tax_types.add(self.tax_types[name])
+        if total:
+            error(f"entries sum to {engine.format_amount(total)}, not zero")
+
+        if tax_types and party_state and self.company_state:
+            if engine.is_interstate(self.company_state, party_state):
+                if tax_types != {"IGST"}:
+                    error(f"interstate party ({party_state}) but {'/'.join(sorted(tax_types))} charged")
+            elif tax_types != {"CGST", "SGST"}:
+                error(f"local party ({party_state}) but {'/'.join(sorted(tax_types))} charged")
+
+    def validate(self, path):
+        """Stream one voucher file through the checks"""
+        parser = expat.ParserCreate()
+        pending = b""
+        offset = 0  # file offset of pending[0]
+        with open_input(path) as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                parser.Parse(chunk, not chunk)
+                if not chunk:
+                    break
+                data = pending + chunk
+                end = 0
+                while True:
+                    close = data.find(VOUCHER_END, end)
+                    if close < 0:
+                        break
+                    match = VOUCHER_START_RE.search(data, end, close)
+                    end = close + len(VOUCHER_END)
+                    if match:
+                        self.check_voucher(path, offset + match.start(), data[match.start():end])
+                # Keep the unfinished voucher (if any) for the next chunk
+                pending = data[end:]
+                offset += end
+
+def default_masters(path):
+    """Return masters.xml next to a voucher file"""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), "masters.xml")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate generated Tally voucher files")
+    parser.add_argument("files", nargs="+", help="voucher files (.xml or .xml.gz), e.g. every split part")
+    parser.add_argument("--masters", help="masters.xml to check ledger names against "
+                                          "(default: the --company folder's masters.xml, else "
+                                          "masters.xml next to the first file)")
+    parser.add_argument("--company", help="company folder: date range and state come from its company.py")
+    parser.add_argument("--start-date", type=synthetic.parse_date, metavar="YYYY-MM-DD")
+    parser.add_argument("--end-date", type=synthetic.parse_date, metavar="YYYY-MM-DD")
+    parser.add_argument("--state", help="company state for the GST interstate check")
+    parser.add_argument("--max-errors", type=int, default=50,
+                        help="violations to list (all are counted; default: 50)")
+    args = parser.parse_args(argv)
+
+    start_date, end_date, state = args.start_date, args.end_date, args.state
+    if args.company:
+        profile = engine.load_profile(args.company)
+        start_date = start_date or profile.START_DATE
+        end_date = end_date or profile.END_DATE
+        state = state or profile.STATE
+
+    if args.masters:
+        masters_file = args.masters
+    elif args.company:
+        masters_file = os.path.join(args.company, "masters.xml")
+    else:
+        masters_file = default_masters(args.files[0])
+    try:
+        ledgers, party_states, tax_types = load_masters(masters_file)
+    except (OSError, ET.ParseError) as e:
+        parser.error(f"cannot read masters {masters_file}: {e}")
+    if state is None:
+        print("No company state given (--company or --state): skipping the GST interstate check")
+
+    validator = VoucherValidator(ledgers, party_states, tax_types, state, start_date, end_date,
+                                 max_errors=args.max_errors)
+    for path in args.files:
+        try:
+            validator.validate(path)
+        except expat.ExpatError as e:
+            sys.exit(f"✗ {path}: not well-formed XML: {e}")
+
+    for path, offset, voucher_type, number, message in validator.errors:
+        print(f"{path}:{offset}: {voucher_type} #{number}: {message}")
+    if validator.error_count > len(validator.errors):
+        print(f"... {validator.error_count - len(validator.errors)} more")
+
+    if validator.error_count:
+        sys.exit(f"✗ {validator.error_count} violations in {validator.vouchers} vouchers")
+    print(f"✓ {validator.vouchers} vouchers valid")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Golden voucher records for the renderer test (rendered in golden/vouchers.xml)"""
+
+from datetime import datetime
+
+# Hand-written records covering what generated data rarely hits: markup
+# characters in names, tax fields, bill, stock and godown details, stock
+# journal lines, empty narration and empty text
+RECORDS = [
+    ("Sales", datetime(2024, 3, 5), 4521, [
+        {"name": "Sales - Local", "amount": -5000000, "hsn": "8528",
+         "stock": ('Samsung 43" Smart TV & <Stand>', 2, "Nos", 2500000)},
+        {"name": "CGST Output", "amount": -450000, "tax_type": "GST", "tax_rate": 9},
+        {"name": "SGST Output", "amount": -450000, "tax_type": "GST", "tax_rate": 9},
+        {"name": "Acme <Electronics> & Co", "amount": 5900000,
+         "bills": [("INV/202403/00001", "New Ref", 5900000, 30)]},
+    ], 'Sale to Acme: Samsung 43" Smart TV x2 & \'extras\''),
+    ("Receipt", datetime(2024, 4, 4), 12, [
+        {"name": "HDFC Bank", "amount": 5950050},
+        {"name": "Acme <Electronics> & Co", "amount": -5950050,
+         "bills": [("INV/202403/00001", "Agst Ref", -5900000, None), ("A&B/1", "Agst Ref", -50050, None)]},
+    ], "Received from Acme against INV/202403/00001, A&B/1"),
+    ("Journal", datetime(2023, 12, 31), 7, [
+        {"name": "Round Off", "amount": 30, "sac": "998311"},
+        {"name": "Office Expenses", "amount": -30, "tax_type": ""},
+    ], ""),
+    ("Payment", datetime(2025, 1, 1), 1, [
+        {"name": "", "amount": 10000},
+        {"name": "Cash", "amount": -10000},
+    ], "Blank ledger name"),
+    ("Sales", datetime(2024, 6, 28), 311, [
+        {"name": "Sales - Local", "amount": -1020000, "hsn": "1905",
+         "stock": ("Glucose Biscuits 100g", 20, "Carton", 51000), "godown": "Finished Goods"},
+        {"name": "CGST Output", "amount": -91800},
+        {"name": "SGST Output", "amount": -91800},
+        {"name": "Capital Foods Distributors", "amount": 1203600},
+    ], "Sale to Capital Foods Distributors: Glucose Biscuits 100g (20 Ctn)"),
+    ("Manufacturing Journal", datetime(2024, 6, 28), 58, [
+        {"stock": ("Red Chilli Powder 200g", 20, "Carton", 217800), "amount": 4356000,
+         "godown": "Production Floor"},
+        {"stock": ("Dry Red Chilli", 100, "Kg", 26000), "amount": -2600000, "godown": "Production Floor"},
+        {"stock": ("Dry Red Chilli", 60, "Kg", 26000), "amount": -1560000, "godown": "Raw <Material> & Store"},
+        {"stock": ("Printed Pouch", 800, "Nos", 200), "amount": -160000, "godown": "Production Floor"},
+        {"stock": ("Corrugated Carton", 20, "Nos", 1800), "amount": -36000, "godown": "Production Floor"},
+    ], "Production of Red Chilli Powder 200g (20 Carton, 1 batch)"),
+]
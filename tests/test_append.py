@@ -0,0 +1,38 @@
+import os
+from datetime import datetime
+
+from tally_testdata import engine, synthetic
+
+PROFILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "companies", "trading-company")
+
+
+def profile_until(end_date):
+    return synthetic.configure_profile(engine.load_profile(PROFILE), end_date=end_date)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_append_matches_a_fresh_run(tmp_path):
+    fresh, appended = str(tmp_path / "fresh.xml"), str(tmp_path / "appended.xml")
+    engine.write_vouchers(profile_until(datetime(2023, 5, 31)), fresh, seed=5)
+    engine.write_vouchers(profile_until(datetime(2023, 4, 30)), appended, seed=5)
+
+    total, size, first_date = engine.append_vouchers(profile_until(datetime(2023, 5, 31)), appended, seed=5)
+
+    assert total > 0 and size > 0
+    assert first_date == datetime(2023, 5, 1)
+    assert read(appended) == read(fresh)
+
+
+def test_nothing_to_append_leaves_the_file_alone(tmp_path):
+    path = str(tmp_path / "vouchers.xml")
+    # 2023-04-29 is a Saturday: the day after it, the end date, is a Sunday
+    engine.write_vouchers(profile_until(datetime(2023, 4, 29)), path, seed=5)
+    before = read(path)
+
+    for end_date in (datetime(2023, 4, 29), datetime(2023, 4, 30)):
+        assert engine.append_vouchers(profile_until(end_date), path, seed=5) == (0, 0, None)
+        assert read(path) == before
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from tally_testdata import cli
+
+COMPANY = os.path.join(os.path.dirname(os.path.dirname(__file__)), "companies", "trading-company")
+
+
+def run(tmp_path, *args):
+    cli.main(argv=[COMPANY, "-o", str(tmp_path / "vouchers.xml"), "--seed", "1", "--end-date", "2023-04-30", *args])
+
+
+def test_items_down_to_the_most_lines_per_invoice(tmp_path, capsys):
+    # Trading purchase bills have up to 5 lines
+    run(tmp_path, "--items", "5")
+    assert "✓ Generated" in capsys.readouterr().out
+
+
+def test_fewer_items_than_lines_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        run(tmp_path, "--items", "4")
+    assert exit_info.value.code == 2
+    assert "--items must be at least 5" in capsys.readouterr().err
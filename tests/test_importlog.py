@@ -0,0 +1,78 @@
+import pytest
+
+from tally_testdata import importlog, load
+
+
+def info(voucher_type, number, entries=2, items=0):
+    return [voucher_type, "20230403", str(number), entries, items]
+
+
+def test_estimates_are_non_negative_and_types_add_up_to_the_measured_time():
+    report = importlog.ImportReport()
+    timings = [(["Sales"] * 8 + ["Journal"] * 2, 0.41), (["Sales"] * 2 + ["Purchase"] * 8, 0.95),
+               (["Journal"] * 10, 0.12), (["Purchase"] * 5 + ["Journal"] * 5, 0.35), (["Sales"] * 10, 0.52)]
+    number = 0
+    for types, seconds in timings:
+        vouchers = []
+        for voucher_type in types:
+            number += 1
+            vouchers.append(info(voucher_type, number))
+        report.add_batch(vouchers, {"created": len(vouchers)}, [], seconds)
+
+    result = report.report()
+
+    assert all(row["seconds_per_voucher"] >= 0 for row in result["shapes"])
+    assert result["totals"]["seconds_per_request"] >= 0
+    by_type = {row["voucher_type"]: row["seconds"] for row in result["voucher_types"]}
+    assert sum(by_type.values()) == pytest.approx(result["totals"]["seconds"], abs=1e-3)
+    assert by_type["Purchase"] > by_type["Sales"] > by_type["Journal"] > 0
+
+
+def test_nnls_holds_a_negative_cost_at_zero():
+    # Unconstrained, y = 2a - b fits exactly; with b >= 0 the best is b = 0
+    rows = [[1, 0], [0, 1], [1, 1]]
+    y = [2, -1, 1]
+    normal = [[sum(r[i] * r[j] for r in rows) for j in range(2)] for i in range(2)]
+    target = [sum(r[i] * v for r, v in zip(rows, y)) for i in range(2)]
+    a, b = importlog.nnls(normal, target)
+    assert b == 0
+    assert a == pytest.approx(1.5)
+
+
+class FlakyPool:
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, data):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionResetError("reset by peer")
+        return 200, b"<RESPONSE><CREATED>1</CREATED><ERRORS>0</ERRORS></RESPONSE>"
+
+    def close(self):
+        pass
+
+
+def test_send_times_only_the_successful_attempt():
+    loader = load.TallyLoader(backoff=0.3)
+    loader.pool = FlakyPool()
+    counts, errors, seconds, attempts = loader.send(b"<ENVELOPE/>")
+    assert attempts == 2
+    assert counts == {"created": 1, "errors": 0}
+    assert errors == []
+    # The backoff sleep (at least 0.15s) isn't counted
+    assert seconds < 0.1
+
+
+def test_untimed_rows_show_no_rate():
+    report = importlog.ImportReport()
+    report.add_batch([info("Sales", 1), info("Journal", 2)], {"created": 2}, [], 0.0)
+    report.add_batch([info("Sales", 3)], {"created": 1}, [], 0.02)
+
+    lines = importlog.format_report(report.report())
+
+    journal = next(line for line in lines if line.strip().startswith("Journal"))
+    assert "0/s" not in journal
+    assert journal.split("vouchers")[1].split()[1] == "-"
+    untimed = next(line for line in lines if line.strip().startswith("#1 "))
+    assert "0/s" not in untimed and " - " in untimed
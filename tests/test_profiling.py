@@ -0,0 +1,25 @@
+import sys
+
+from tally_testdata import profiling, tenants
+
+
+def test_memory_is_optional_without_the_resource_module(monkeypatch, tmp_path):
+    # Windows has no resource module; an import of a None entry raises ImportError
+    monkeypatch.setitem(sys.modules, "resource", None)
+    assert profiling.peak_rss() is None
+    assert profiling.peak_rss_mb(children=True) is None
+
+    stats = profiling.Stats()
+    stats.count(10)
+    report = stats.report()
+    assert report["peak_rss_mb"] is None and report["peak_worker_rss_mb"] is None
+    assert "peak RSS n/a" in profiling.format_stats(report)[0]
+    profiling.write_stats(report, str(tmp_path / "stats.csv"))
+
+    results = [{"name": "A", "output": "a", "vouchers": 5, "bytes": 100, "seconds": 1.0, "peak_rss_mb": None}]
+    summary = tenants.write_summary(results, str(tmp_path / "tenants.json"), 1.0)
+    assert summary["peak_worker_rss_mb"] is None
+
+
+def test_peak_rss_is_measured_where_available():
+    assert profiling.peak_rss_mb() > 0
@@ -0,0 +1,32 @@
+import os
+from datetime import datetime
+
+import golden_records
+import pytest
+
+from tally_testdata import engine, synthetic
+
+GOLDEN_FILE = os.path.join(os.path.dirname(__file__), "golden", "vouchers.xml")
+COMPANIES = os.path.join(os.path.dirname(os.path.dirname(__file__)), "companies")
+
+
+def read_golden():
+    with open(GOLDEN_FILE, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("render", [engine.render_voucher, engine.render_voucher_etree],
+                         ids=["template", "etree"])
+def test_golden_records_render_byte_for_byte(render):
+    assert "".join(render(*record) for record in golden_records.RECORDS) == read_golden()
+
+
+def test_check_renderers_counts_golden_records():
+    assert engine.check_renderers(golden_records.RECORDS) == len(golden_records.RECORDS)
+
+
+@pytest.mark.parametrize("company", ["trading-company", "services-company", "manufacturing-company"])
+def test_generated_vouchers_render_the_same(company):
+    profile = engine.load_profile(os.path.join(COMPANIES, company))
+    profile = synthetic.configure_profile(profile, end_date=datetime(2023, 5, 31))
+    assert engine.check_renderers(engine.iter_vouchers(profile, seed=11)) > 0
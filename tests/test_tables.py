@@ -0,0 +1,22 @@
+import csv
+import datetime
+import os
+
+from tally_testdata import engine, synthetic, tables
+
+COMPANY = os.path.join(os.path.dirname(os.path.dirname(__file__)), "companies", "trading-company")
+
+def test_gst_rows_carry_the_ledgers_tax_type(tmp_path):
+    profile = engine.load_profile(COMPANY)
+    profile = synthetic.configure_profile(profile, end_date=datetime.datetime(2023, 4, 30))
+    writer = tables.TableWriter(str(tmp_path), "csv")
+    engine.write_vouchers(profile, str(tmp_path / "vouchers.xml"), seed=1, tables=writer)
+    writer.close()
+
+    with open(tmp_path / "ledger_entries.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == list(tables.ENTRY_COLUMNS)
+    gst = [row for row in rows if row["ledger"] == "CGST Output"]
+    assert gst and all(row["tax_type"] == "CGST" for row in gst)
+    assert all(row["voucher_key"].startswith("Sales/") for row in gst)
+    assert all(row["tax_type"] == "" for row in rows if "GST" not in row["ledger"])
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import time
+
+from tally_testdata import tenants, validate
+
+
+def validate_tenant(result, state):
+    ledgers, party_states, tax_types = validate.load_masters(os.path.join(result["output"], "masters.xml"))
+    validator = validate.VoucherValidator(ledgers, party_states, tax_types, state)
+    validator.validate(os.path.join(result["output"], "vouchers.xml"))
+    return validator
+
+
+def test_tenants_in_different_states_share_a_worker(tmp_path):
+    # One worker runs both tenants, so the second reuses the first's cached profile
+    profile = os.path.join(tenants.REPO_ROOT, "companies", "trading-company")
+    specs = [{"profile": profile, "name": "Alpha Traders", "state": "Karnataka", "end_date": "2023-06-30"},
+             {"profile": profile, "name": "Beta Traders", "state": "Delhi", "end_date": "2023-06-30"}]
+    companies = [tenants.make_tenant(spec, "test", 7, i) for i, spec in enumerate(specs)]
+    tenants.assign_outputs(companies, str(tmp_path))
+    for tenant in companies:
+        tenant["expected"] = tenants.expected_vouchers(tenant)
+    options = {"compress": None, "level": None, "masters": True, "tables": None}
+
+    results = tenants.run_tenants(companies, options, jobs=1, report=lambda line: None)
+
+    for result, spec in zip(results, specs):
+        assert "error" not in result
+        validator = validate_tenant(result, spec["state"])
+        assert validator.vouchers == result["vouchers"] > 0
+        assert validator.errors == []
+
+
+def test_tenant_in_another_state_keeps_local_and_interstate_sales(tmp_path):
+    profile = os.path.join(tenants.REPO_ROOT, "companies", "trading-company")
+    tenant = tenants.make_tenant({"profile": profile, "name": "Gamma Traders", "state": "Kerala",
+                                  "end_date": "2023-04-30"}, "test", 3, 0)
+    tenants.assign_outputs([tenant], str(tmp_path))
+    tenant["expected"] = tenants.expected_vouchers(tenant)
+    options = {"compress": None, "level": None, "masters": True, "tables": None}
+
+    [result] = tenants.run_tenants([tenant], options, jobs=1, report=lambda line: None)
+
+    assert validate_tenant(result, "Kerala").errors == []
+    with open(os.path.join(result["output"], "vouchers.xml"), encoding="utf-8") as f:
+        xml = f.read()
+    assert "<LEDGERNAME>CGST Output</LEDGERNAME>" in xml
+    assert "<LEDGERNAME>SGST Output</LEDGERNAME>" in xml
+    assert "<LEDGERNAME>IGST Output</LEDGERNAME>" in xml
+
+
+def fake_run_tenant(tenant, options):
+    if tenant["name"] == "Doomed":
+        os._exit(1)
+    time.sleep(0.5)
+    return {"name": tenant["name"], "output": tenant["output"], "vouchers": 1, "seconds": 0.5,
+            "peak_rss_mb": 1.0}
+
+
+def test_only_the_tenant_whose_worker_dies_fails(monkeypatch):
+    # Forked workers see the patched run_tenant
+    monkeypatch.setattr(tenants, "get_context", lambda: multiprocessing.get_context("fork"))
+    monkeypatch.setattr(tenants, "run_tenant", fake_run_tenant)
+    companies = [{"name": name, "output": name, "expected": 1} for name in ("First", "Doomed", "Last")]
+    lines = []
+
+    results = tenants.run_tenants(companies, {}, jobs=3, report=lines.append)
+
+    assert [r["name"] for r in results] == ["First", "Doomed", "Last"]
+    assert "error" not in results[0] and "error" not in results[2]
+    assert results[1]["error"].startswith("worker process died")
+    assert sum(line.startswith("✗") for line in lines) == 1
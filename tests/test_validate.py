@@ -0,0 +1,17 @@
+import os
+from datetime import datetime
+
+from tally_testdata import engine, synthetic, validate
+
+COMPANY = os.path.join(os.path.dirname(os.path.dirname(__file__)), "companies", "trading-company")
+
+
+def test_company_masters_are_the_default(tmp_path, capsys):
+    # The voucher file lives elsewhere, with no masters.xml next to it
+    path = str(tmp_path / "vouchers.xml")
+    profile = synthetic.configure_profile(engine.load_profile(COMPANY), end_date=datetime(2023, 4, 30))
+    total, _, _ = engine.write_vouchers(profile, path, seed=3)
+
+    validate.main([path, "--company", COMPANY])
+
+    assert f"✓ {total} vouchers valid" in capsys.readouterr().out